@@ -1,9 +1,10 @@
 import os
 from flask import Flask, app, jsonify, request, send_from_directory
-from sqlalchemy import event
-from sqlalchemy.engine import Engine
-from sqlite3 import Connection as SQLite3Connection
+from werkzeug.middleware.proxy_fix import ProxyFix
 from .extensions import db, migrate, ma, jwt, cors
+from .search import install_jobs_fts
+from .counters import install_counters
+from . import adzuna_client, changes, conditional, dedupe, ingest, matching, passwords, principal, rate_limit, response_cache, similar, sqlite_profile, suggest, tokens
 from config import Config
 from . import models
 
@@ -12,6 +13,9 @@ def create_app():
     dist_dir = os.path.join(project_root, "frontend", "dist")
     app = Flask(__name__, static_folder=dist_dir, static_url_path="/")
     app.config.from_object(Config)
+    proxies = app.config.get("RATE_LIMIT_TRUSTED_PROXIES", 0)
+    if proxies:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxies, x_proto=proxies)
     db_uri = app.config.get("SQLALCHEMY_DATABASE_URI")
     print("DB URI =", db_uri)
     if db_uri and db_uri.startswith("sqlite:///"):
@@ -21,14 +25,17 @@ def create_app():
 
 
     db.init_app(app)
-    @event.listens_for(Engine, "connect")
-    def _set_sqlite_pragma(dbapi_connection, connection_record):
-        if isinstance(dbapi_connection, SQLite3Connection):
-            cursor = dbapi_connection.cursor()
-            cursor.execute("PRAGMA foreign_keys=ON")
-            cursor.close()
+    with app.app_context():
+        sqlite_profile.init_engine(app, db.engine)
     from . import models
     jwt.init_app(app)
+    principal.init_app(app)
+    passwords.init_app(app)
+    rate_limit.init_app(app)
+    tokens.init_app(app)
+    changes.init_app(app)
+    response_cache.init_app(app)
+    adzuna_client.init_app(app)
     migrate.init_app(app, db)
     ma.init_app(app)
 
@@ -40,8 +47,16 @@ def create_app():
     with app.app_context():
         from . import models
         db.create_all() #this creates the tables in the database based on the models defined in app/models.py.
+        app.extensions["jobs_fts"] = app.config.get("JOBS_FTS_ENABLED") and install_jobs_fts(db.engine)
+        app.extensions["counters"] = install_counters(db.engine)
+    conditional.init_app(app)
+    ingest.init_app(app)
+    dedupe.init_app(app)
+    matching.init_app(app)
+    similar.init_app(app)
+    suggest.init_app(app)
     # register blueprints
-    from .routes import auth_bp, jobs_bp, applications_bp, profiles_bp, employers_bp, users_bp, adzuna_bp, saved_jobs_bp
+    from .routes import auth_bp, jobs_bp, applications_bp, profiles_bp, employers_bp, users_bp, adzuna_bp, saved_jobs_bp, federated_bp, export_bp
 
     app.register_blueprint(auth_bp, url_prefix="/auth")
     app.register_blueprint(jobs_bp, url_prefix="/jobs")
@@ -51,6 +66,8 @@ def create_app():
     app.register_blueprint(users_bp, url_prefix="/users")
     app.register_blueprint(adzuna_bp, url_prefix="/adzuna")
     app.register_blueprint(saved_jobs_bp, url_prefix="/saved-jobs")
+    app.register_blueprint(federated_bp, url_prefix="/search")
+    app.register_blueprint(export_bp, url_prefix="/export")
 
     @app.get("/health")
     def health():
@@ -79,6 +96,8 @@ def create_app():
                 "/users",
                 "/adzuna",
                 "/saved-jobs",
+                "/search",
+                "/export",
                 "/health",
             )
             if request.path.startswith(api_prefixes) or request.path.startswith("/assets"):
@@ -0,0 +1,269 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from flask import current_app
+from requests.adapters import HTTPAdapter
+
+# Cache outcomes reported by AdzunaClient.search (surfaced as X-Cache).
+HIT = "HIT"
+MISS = "MISS"
+STALE = "STALE"
+COALESCED = "COALESCED"
+
+
+class AdzunaError(Exception):
+    """An upstream failure the route turns into an error response."""
+
+    def __init__(self, status, error, detail=None):
+        super().__init__(error)
+        self.status = status
+        self.error = error
+        self.detail = detail
+
+
+class CircuitBreaker:
+    """Opens after `threshold` consecutive failures; once `reset_timeout` has
+    passed a single probe is let through, and its outcome closes or re-opens it."""
+
+    def __init__(self, threshold=5, reset_timeout=30):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self):
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at >= self.reset_timeout:
+                # Re-arm so concurrent callers keep failing fast during the probe.
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class AdzunaClient:
+    """Adzuna job search over a pooled keep-alive session.
+
+    Responses are cached (LRU + TTL) on the normalized search parameters,
+    never the credentials. Concurrent identical misses share one upstream
+    call. An expired entry is served stale while one background refresh
+    runs, and also while the circuit breaker is open or the upstream fails.
+    """
+
+    def __init__(self, base_url, connect_timeout=3.05, read_timeout=8, pool_size=10,
+                 cache_ttl=300, stale_ttl=3600, cache_size=512,
+                 breaker_threshold=5, breaker_reset=30, fanout_workers=8, logger=None):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = (connect_timeout, read_timeout)
+        self.cache_ttl = cache_ttl
+        self.stale_ttl = max(stale_ttl, cache_ttl)
+        self.cache_size = cache_size
+        self.breaker = CircuitBreaker(breaker_threshold, breaker_reset)
+        self.logger = logger
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._cache = OrderedDict()  # key -> (payload, fetched_at)
+        self._inflight = {}  # key -> _Call
+        self._lock = threading.Lock()
+        self.upstream_calls = 0
+        # Shared by every fan-out request, so a worker never has more than
+        # `fanout_workers` upstream calls in flight for bulk searches.
+        self._executor = ThreadPoolExecutor(max_workers=fanout_workers, thread_name_prefix="adzuna")
+
+    @staticmethod
+    def make_key(country, page, params):
+        return json.dumps([country, page, sorted(params.items())], separators=(",", ":"), default=str)
+
+    def search(self, country, page, params, credentials):
+        """Return (payload, outcome) for one Adzuna search page.
+
+        `params` are the search parameters without credentials; `credentials`
+        is {"app_id": ..., "app_key": ...}. Raises AdzunaError when there is
+        neither a live nor a usable stale response.
+        """
+        key = self.make_key(country, page, params)
+        entry = self._cache_get(key)
+        if entry is not None:
+            payload, age = entry
+            if age < self.cache_ttl:
+                return payload, HIT
+            if age < self.stale_ttl:
+                self._revalidate(key, country, page, params, credentials)
+                return payload, STALE
+        try:
+            payload, leader = self._fetch_once(key, country, page, params, credentials)
+        except AdzunaError as exc:
+            # Client errors (bad parameters) are not an outage; don't mask them.
+            if entry is not None and exc.status >= 500 and entry[1] < self.stale_ttl:
+                return entry[0], STALE
+            raise
+        return payload, MISS if leader else COALESCED
+
+    def submit(self, country, page, params, credentials):
+        """Start search() on the shared pool and return its Future, so callers
+        can wait on it with their own deadline."""
+        return self._executor.submit(self.search, country, page, params, credentials)
+
+    def search_many(self, searches, credentials):
+        """Run several (country, page, params) searches concurrently and yield
+        (country, page, payload, outcome, error) in completion order; exactly
+        one of payload and error is set."""
+        futures = {
+            self.submit(country, page, params, credentials): (country, page)
+            for country, page, params in searches
+        }
+        for future in as_completed(futures):
+            country, page = futures[future]
+            try:
+                payload, outcome = future.result()
+            except AdzunaError as exc:
+                yield country, page, None, None, exc
+            else:
+                yield country, page, payload, outcome, None
+
+    def stats(self):
+        with self._lock:
+            entries = len(self._cache)
+            inflight = len(self._inflight)
+        return {
+            "entries": entries,
+            "inflight": inflight,
+            "upstream_calls": self.upstream_calls,
+            "breaker": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def _cache_get(self, key):
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            self._cache.move_to_end(key)
+            return entry[0], time.monotonic() - entry[1]
+
+    def _cache_set(self, key, payload):
+        with self._lock:
+            self._cache[key] = (payload, time.monotonic())
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _fetch_once(self, key, country, page, params, credentials):
+        """Fetch `key` upstream unless an identical fetch is already running,
+        in which case wait for and share its result. Returns (payload, leader)."""
+        with self._lock:
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _Call()
+        if not leader:
+            if not call.done.wait(sum(self.timeout)):
+                raise AdzunaError(504, "Adzuna API timed out")
+            if call.error is not None:
+                raise call.error
+            return call.result, False
+        try:
+            call.result = self._fetch(country, page, params, credentials)
+            self._cache_set(key, call.result)
+            return call.result, True
+        except AdzunaError as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            call.done.set()
+
+    def _revalidate(self, key, country, page, params, credentials):
+        with self._lock:
+            if key in self._inflight:
+                return
+
+        def refresh():
+            try:
+                self._fetch_once(key, country, page, params, credentials)
+            except AdzunaError as exc:
+                if self.logger is not None:
+                    self.logger.warning("Adzuna background refresh failed: %s", exc.error)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def _fetch(self, country, page, params, credentials):
+        if not self.breaker.allow():
+            raise AdzunaError(503, "Adzuna API temporarily unavailable")
+        url = f"{self.base_url}/jobs/{country}/search/{page}"
+        with self._lock:
+            self.upstream_calls += 1
+        try:
+            res = self.session.get(url, params={**credentials, **params}, timeout=self.timeout)
+        except requests.RequestException as exc:
+            self.breaker.record_failure()
+            raise AdzunaError(502, "Failed to reach Adzuna API", str(exc))
+        if res.status_code >= 500 or res.status_code == 429:
+            self.breaker.record_failure()
+            raise AdzunaError(res.status_code, "Adzuna API error", res.text)
+        self.breaker.record_success()
+        if not res.ok:
+            raise AdzunaError(res.status_code, "Adzuna API error", res.text)
+        try:
+            return res.json()
+        except ValueError:
+            raise AdzunaError(502, "Adzuna API error", "Invalid JSON from upstream")
+
+
+def get_client():
+    return current_app.extensions["adzuna"]
+
+
+def init_app(app):
+    app.extensions["adzuna"] = AdzunaClient(
+        app.config.get("ADZUNA_BASE_URL", "https://api.adzuna.com/v1/api"),
+        connect_timeout=app.config.get("ADZUNA_CONNECT_TIMEOUT", 3.05),
+        read_timeout=app.config.get("ADZUNA_READ_TIMEOUT", 8),
+        pool_size=app.config.get("ADZUNA_POOL_SIZE", 10),
+        cache_ttl=app.config.get("ADZUNA_CACHE_TTL", 300),
+        stale_ttl=app.config.get("ADZUNA_STALE_TTL", 3600),
+        cache_size=app.config.get("ADZUNA_CACHE_SIZE", 512),
+        breaker_threshold=app.config.get("ADZUNA_BREAKER_THRESHOLD", 5),
+        breaker_reset=app.config.get("ADZUNA_BREAKER_RESET", 30),
+        fanout_workers=app.config.get("ADZUNA_FANOUT_WORKERS", 8),
+        logger=app.logger,
+    )
@@ -0,0 +1,211 @@
+import io
+import json
+from datetime import datetime
+
+from sqlalchemy import insert, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
+
+from . import counters, dedupe, matching
+from .changes import ModelChange, record_changes
+from .conditional import bump_versions
+from .extensions import db
+from .models import ApplicationForm, Employer, Job
+
+# POST /jobs/bulk: postings arrive as a JSON array or as NDJSON (one object per
+# line, read off the request stream as it comes in) and are written
+# BULK_CHUNK_SIZE rows per transaction with executemany inserts and updates, instead of the
+# count, lookups, flush and commit POST /jobs/ spends on each one. A row with
+# a "reference" is upserted on (employer_id, reference), so re-sending a
+# catalogue only rewrites the postings that changed and a retried upload
+# never doubles them. As in ingest.upsert_batch, bulk statements bypass the
+# ORM flush hooks: the duplicate and skill indexes, the version counters and
+# the change signal are fed here.
+NDJSON_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl"}
+REFERENCE_MAX = 128
+FIELDS = ("title", "description", "location", "salary")
+
+
+def read_ndjson(stream):
+    """(object, error) per non-blank line of `stream`."""
+    # The request stream's own readline reads a byte at a time.
+    for line in io.BufferedReader(stream, 65536):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line), None
+        except ValueError:
+            yield None, "Invalid JSON"
+
+
+def parse_reference(value):
+    if value in (None, ""):
+        return None, None
+    if not isinstance(value, (str, int)) or isinstance(value, bool) or len(str(value)) > REFERENCE_MAX:
+        return None, "Invalid reference"
+    return str(value), None
+
+
+class BulkWriter:
+    """Collects validated rows and writes them a chunk at a time; `results`
+    holds one dict per row added, in order."""
+
+    def __init__(self, chunk_size=500, duplicate_policy="warn", max_jobs=None):
+        self.chunk_size = chunk_size
+        self.duplicate_policy = duplicate_policy
+        self.max_jobs = max_jobs
+        self.results = []
+        self._pending = []
+
+    def add(self, values, reference=None, error=None):
+        result = {"index": len(self.results)}
+        if reference is not None:
+            result["reference"] = reference
+        self.results.append(result)
+        if error:
+            result.update(status="error", error=error)
+            return
+        self._pending.append((result, values, reference))
+        if len(self._pending) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        pending, self._pending = self._pending, []
+        if pending:
+            self._write_chunk(pending)
+
+    def summary(self):
+        counts = {"created": 0, "updated": 0, "unchanged": 0, "error": 0}
+        for result in self.results:
+            counts[result["status"]] += 1
+        return counts
+
+    def _fail(self, result, error, **extra):
+        result.pop("id", None)
+        result.update(status="error", error=error, **extra)
+
+    def _write_chunk(self, pending, retry=True):
+        employer_ids = {values["employer_id"] for _, values, _ in pending}
+        known = set(db.session.scalars(select(Employer.id).where(Employer.id.in_(employer_ids))))
+        keys = {(values["employer_id"], reference) for _, values, reference in pending if reference is not None}
+        existing = {}
+        if keys:
+            rows = db.session.execute(
+                select(Job.id, Job.employer_id, Job.reference, *(getattr(Job, f) for f in FIELDS))
+                .where(tuple_(Job.employer_id, Job.reference).in_(list(keys)))
+            )
+            existing = {(row.employer_id, row.reference): row for row in rows}
+
+        candidates, seen = [], set()
+        for result, values, reference in pending:
+            if values["employer_id"] not in known:
+                self._fail(result, "Unknown employer_id")
+                continue
+            key = (values["employer_id"], reference)
+            if reference is not None:
+                if key in seen:
+                    self._fail(result, "Duplicate reference in request")
+                    continue
+                seen.add(key)
+            current = existing.get(key) if reference is not None else None
+            if current is not None and all(getattr(current, f) == values[f] for f in FIELDS):
+                result.update(status="unchanged", id=current.id)
+                continue
+            candidates.append((result, values, reference, current))
+
+        if self.duplicate_policy != "off" and candidates:
+            found = dedupe.find_duplicates_many([
+                (values["title"], values["description"], values["employer_id"],
+                 current.id if current is not None else None)
+                for _, values, _, current in candidates
+            ])
+            kept = []
+            for row, duplicates in zip(candidates, found):
+                if duplicates and self.duplicate_policy == "reject":
+                    self._fail(row[0], "Duplicate of an existing job", duplicates=duplicates)
+                    continue
+                if duplicates:
+                    row[0]["possible_duplicates"] = duplicates
+                kept.append(row)
+            candidates = kept
+        new = [row for row in candidates if row[3] is None]
+        changed = [row for row in candidates if row[3] is not None]
+
+        try:
+            self._write_within_limit(new, changed)
+        except IntegrityError:
+            # Another request created one of these references after the lookup
+            # above. Look them up again (they become updates) and retry once.
+            db.session.rollback()
+            if retry:
+                for result, *_ in pending:
+                    for key in set(result) - {"index", "reference"}:
+                        del result[key]
+                return self._write_chunk(pending, retry=False)
+            # Still racing: fail the new rows whose reference exists by now.
+            keys = [(values["employer_id"], reference) for _, values, reference, _ in new if reference is not None]
+            taken = set(db.session.execute(
+                select(Job.employer_id, Job.reference).where(tuple_(Job.employer_id, Job.reference).in_(keys))
+            ).tuples()) if keys else set()
+            for result, *_ in (row for row in new if (row[1]["employer_id"], row[2]) in taken):
+                self._fail(result, "Conflicting write, retry the row")
+            new = [row for row in new if (row[1]["employer_id"], row[2]) not in taken]
+            try:
+                self._write_within_limit(new, changed)
+            except IntegrityError:
+                db.session.rollback()
+                for result, *_ in new + changed:
+                    self._fail(result, "Conflicting write, retry the row")
+
+    def _write_within_limit(self, new, changed):
+        while True:
+            over = self._write(new, changed)
+            if not over:
+                return
+            # Past MAX_JOBS: keep the rows that fit and write again.
+            for result, *_ in new[len(new) - over:]:
+                self._fail(result, f"Job limit reached ({self.max_jobs}). Admin review required.")
+            new = new[:len(new) - over]
+
+    def _write(self, new, changed):
+        """Write one chunk and commit; returns how many new rows exceed the
+        job limit (after rolling back) or 0."""
+        if not new and not changed:
+            return 0
+        now = datetime.utcnow()
+        changes = []
+        if new:
+            job_ids = db.session.scalars(
+                insert(Job).returning(Job.id, sort_by_parameter_order=True),
+                [
+                    {**values, "reference": reference, "source": "local", "created_at": now, "updated_at": now}
+                    for _, values, reference, _ in new
+                ],
+            ).all()
+            # The inserts hold the write lock, so the count can't race another worker.
+            if self.max_jobs is not None:
+                total = counters.get_count(counters.TOTAL_JOBS, Job.query.filter_by(source="local").count)
+                if total > self.max_jobs:
+                    db.session.rollback()
+                    return min(len(new), total - self.max_jobs)
+            db.session.execute(insert(ApplicationForm), [{"job_id": job_id, "created_at": now} for job_id in job_ids])
+            for job_id, (result, values, reference, _) in zip(job_ids, new):
+                result.update(status="created", id=job_id)
+                changes.append(ModelChange("insert", "Job", job_id, {"id": job_id, **values, "reference": reference}, {}))
+        if changed:
+            db.session.execute(
+                update(Job),
+                [{"id": current.id, **{f: values[f] for f in FIELDS}, "updated_at": now} for _, values, _, current in changed],
+            )
+            for result, values, _, current in changed:
+                result.update(status="updated", id=current.id)
+                previous = {f: getattr(current, f) for f in FIELDS if getattr(current, f) != values[f]}
+                changes.append(ModelChange("update", "Job", current.id, {"id": current.id, **values}, previous))
+
+        texts = [(c.id, c.values["title"], c.values["description"]) for c in changes]
+        dedupe.index_jobs(db.session.connection(), texts)
+        matching.index_jobs(db.session.connection(), texts)
+        bump_versions(db.session.connection(), ["jobs"])
+        record_changes(db.session, changes)
+        db.session.commit()
+        return 0
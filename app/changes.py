@@ -0,0 +1,71 @@
+from collections import namedtuple
+
+from blinker import Namespace
+from flask import current_app
+from sqlalchemy import event, inspect
+
+from .extensions import db
+
+# Sent once per successful commit with the rows that commit inserted, updated
+# or deleted: models_committed.send(app, changes=[ModelChange, ...]).
+# Subscribers (cache invalidation, search indexes, ...) run after the data is
+# durable, so they never act on a transaction that later rolls back.
+_signals = Namespace()
+models_committed = _signals.signal("models-committed")
+
+# `values` holds the column values loaded on the instance at flush time and
+# `previous` the pre-update values of columns that changed (updates only).
+ModelChange = namedtuple("ModelChange", ["op", "model", "id", "values", "previous"])
+
+_INFO_KEY = "model_changes"
+
+
+def _snapshot(obj, op):
+    state = inspect(obj)
+    mapper = state.mapper
+    loaded = state.dict
+    values = {}
+    previous = {}
+    for attr in mapper.column_attrs:
+        key = attr.key
+        if key in loaded:
+            values[key] = loaded[key]
+        if op == "update":
+            history = state.attrs[key].history
+            if history.has_changes() and history.deleted:
+                previous[key] = history.deleted[0]
+    return ModelChange(op, mapper.class_.__name__, values.get("id"), values, previous)
+
+
+def _record_flush(session, flush_context):
+    changes = session.info.setdefault(_INFO_KEY, [])
+    for obj in session.new:
+        changes.append(_snapshot(obj, "insert"))
+    for obj in session.dirty:
+        if session.is_modified(obj, include_collections=False):
+            changes.append(_snapshot(obj, "update"))
+    for obj in session.deleted:
+        changes.append(_snapshot(obj, "delete"))
+
+
+def record_changes(session, changes):
+    """Queue ModelChanges for writes made with Core/bulk statements, which
+    bypass the flush hook, so they are sent with the session's next commit."""
+    session.info.setdefault(_INFO_KEY, []).extend(changes)
+
+
+def _send_committed(session):
+    changes = session.info.pop(_INFO_KEY, None)
+    if changes:
+        models_committed.send(current_app._get_current_object(), changes=changes)
+
+
+def _discard(session, *args):
+    session.info.pop(_INFO_KEY, None)
+
+
+def init_app(app):
+    if not event.contains(db.session, "after_flush", _record_flush):
+        event.listen(db.session, "after_flush", _record_flush)
+        event.listen(db.session, "after_commit", _send_committed)
+        event.listen(db.session, "after_rollback", _discard)
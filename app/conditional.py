@@ -0,0 +1,115 @@
+import hashlib
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+
+from flask import current_app, make_response, request
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import event, update
+
+from .extensions import db
+from .models import TableVersion
+from .principal import current_principal
+
+TRACKED_TABLES = ["users", "employers", "jobs", "applications", "profiles", "saved_jobs"]
+
+# Rows removed by ON DELETE CASCADE never pass through the session, so a
+# delete also bumps the tables it cascades into.
+CASCADES = {
+    "users": ["employers", "jobs", "applications", "profiles", "saved_jobs"],
+    "employers": ["jobs", "applications", "saved_jobs"],
+    "jobs": ["applications", "saved_jobs"],
+}
+
+
+def bump_versions(connection, tables):
+    tables = sorted(set(tables) & set(TRACKED_TABLES))
+    if not tables:
+        return
+    connection.execute(
+        update(TableVersion)
+        .where(TableVersion.name.in_(tables))
+        .values(version=TableVersion.version + 1, updated_at=datetime.utcnow())
+    )
+
+
+def _bump_after_flush(session, flush_context):
+    tables = set()
+    for obj in session.new:
+        tables.add(obj.__table__.name)
+    for obj in session.dirty:
+        if session.is_modified(obj, include_collections=False):
+            tables.add(obj.__table__.name)
+    for obj in session.deleted:
+        name = obj.__table__.name
+        tables.add(name)
+        tables.update(CASCADES.get(name, ()))
+    tables.discard(TableVersion.__tablename__)
+    if tables:
+        bump_versions(session.connection(), tables)
+
+
+def ensure_table_versions():
+    existing = {name for (name,) in db.session.query(TableVersion.name)}
+    missing = [name for name in TRACKED_TABLES if name not in existing]
+    if missing:
+        db.session.add_all(TableVersion(name=name, version=0) for name in missing)
+        db.session.commit()
+
+
+def init_app(app):
+    if not event.contains(db.session, "after_flush", _bump_after_flush):
+        event.listen(db.session, "after_flush", _bump_after_flush)
+    with app.app_context():
+        ensure_table_versions()
+
+
+def conditional(*tables, includes=None):
+    """Answer 304 Not Modified for an unchanged collection without running the view.
+
+    The ETag is derived from the version counters of `tables`, the caller and
+    the request URL, so it is strong without hashing the response body. Put it
+    under @jwt_required(). `includes` maps values of the `include` query
+    parameter to the extra tables they pull data from.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            names = set(tables)
+            for value in request.args.get("include", "").split(","):
+                names.update((includes or {}).get(value.strip(), ()))
+            rows = TableVersion.query.filter(TableVersion.name.in_(names)).all()
+            principal = current_principal()
+            scope = (principal.role, principal.employer_id) if principal else None
+            seed = "|".join(
+                [f"{r.name}:{r.version}" for r in sorted(rows, key=lambda r: r.name)]
+                + [str(get_jwt_identity()), str(scope), request.full_path]
+            )
+            etag = hashlib.sha1(seed.encode()).hexdigest()
+            last_modified = max((r.updated_at for r in rows), default=None)
+            # HTTP dates have whole seconds: only advertise a second that is
+            # over, or a later write within it would compare as unmodified.
+            if last_modified is not None and datetime.utcnow() - last_modified >= timedelta(seconds=1):
+                last_modified = last_modified.replace(microsecond=0, tzinfo=timezone.utc)
+            else:
+                last_modified = None
+
+            if request.if_none_match:
+                not_modified = request.if_none_match.contains(etag)
+            else:
+                since = request.if_modified_since
+                not_modified = bool(since and last_modified and last_modified <= since)
+
+            if not_modified:
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            if last_modified is not None:
+                response.last_modified = last_modified
+            response.headers["Cache-Control"] = "private, no-cache"
+            response.vary.add("Authorization")
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,163 @@
+from flask import current_app
+from sqlalchemy import func, text
+from sqlalchemy.exc import OperationalError
+
+from .extensions import db
+from .models import Application, Counter, Job
+
+# Running counts in the `counters` table, maintained by triggers inside the
+# writing transaction so they also follow ON DELETE CASCADE and bulk inserts.
+# Quota checks insert first and read the counter back before committing: the
+# transaction already holds SQLite's write lock, so no other worker can slip a
+# row in between the check and the commit.
+TOTAL_JOBS = "jobs"  # locally posted; ingested postings don't count toward MAX_JOBS
+TOTAL_EMPLOYERS = "employers"
+
+
+def employer_jobs(employer_id):
+    return f"employer:{employer_id}:jobs"
+
+
+def job_applications(job_id):
+    return f"job:{job_id}:applications"
+
+
+def user_saved_jobs(user_id):
+    return f"user:{user_id}:saved_jobs"
+
+
+COUNTERS_DDL = [
+    "CREATE TRIGGER IF NOT EXISTS counters_jobs_ai AFTER INSERT ON jobs BEGIN "
+    "INSERT INTO counters (name, value) SELECT 'jobs', 1 WHERE new.source = 'local' "
+    "ON CONFLICT(name) DO UPDATE SET value = value + 1; "
+    "INSERT INTO counters (name, value) VALUES ('employer:' || new.employer_id || ':jobs', 1) "
+    "ON CONFLICT(name) DO UPDATE SET value = value + 1; "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS counters_jobs_ad AFTER DELETE ON jobs BEGIN "
+    "UPDATE counters SET value = value - 1 WHERE name = 'jobs' AND old.source = 'local'; "
+    "UPDATE counters SET value = value - 1 WHERE name = 'employer:' || old.employer_id || ':jobs'; "
+    "DELETE FROM counters WHERE name = 'job:' || old.id || ':applications'; "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS counters_jobs_au AFTER UPDATE OF employer_id ON jobs "
+    "WHEN old.employer_id IS NOT new.employer_id BEGIN "
+    "UPDATE counters SET value = value - 1 WHERE name = 'employer:' || old.employer_id || ':jobs'; "
+    "INSERT INTO counters (name, value) VALUES ('employer:' || new.employer_id || ':jobs', 1) "
+    "ON CONFLICT(name) DO UPDATE SET value = value + 1; "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS counters_employers_ai AFTER INSERT ON employers BEGIN "
+    "INSERT INTO counters (name, value) VALUES ('employers', 1) "
+    "ON CONFLICT(name) DO UPDATE SET value = value + 1; "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS counters_employers_ad AFTER DELETE ON employers BEGIN "
+    "UPDATE counters SET value = value - 1 WHERE name = 'employers'; "
+    "DELETE FROM counters WHERE name = 'employer:' || old.id || ':jobs'; "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS counters_applications_ai AFTER INSERT ON applications BEGIN "
+    "INSERT INTO counters (name, value) VALUES ('job:' || new.job_id || ':applications', 1) "
+    "ON CONFLICT(name) DO UPDATE SET value = value + 1; "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS counters_applications_ad AFTER DELETE ON applications BEGIN "
+    "UPDATE counters SET value = value - 1 WHERE name = 'job:' || old.job_id || ':applications'; "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS counters_applications_au AFTER UPDATE OF job_id ON applications "
+    "WHEN old.job_id IS NOT new.job_id BEGIN "
+    "UPDATE counters SET value = value - 1 WHERE name = 'job:' || old.job_id || ':applications'; "
+    "INSERT INTO counters (name, value) VALUES ('job:' || new.job_id || ':applications', 1) "
+    "ON CONFLICT(name) DO UPDATE SET value = value + 1; "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS counters_saved_jobs_ai AFTER INSERT ON saved_jobs BEGIN "
+    "INSERT INTO counters (name, value) VALUES ('user:' || new.user_id || ':saved_jobs', 1) "
+    "ON CONFLICT(name) DO UPDATE SET value = value + 1; "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS counters_saved_jobs_ad AFTER DELETE ON saved_jobs BEGIN "
+    "UPDATE counters SET value = value - 1 WHERE name = 'user:' || old.user_id || ':saved_jobs'; "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS counters_users_ad AFTER DELETE ON users BEGIN "
+    "DELETE FROM counters WHERE name = 'user:' || old.id || ':saved_jobs'; "
+    "END",
+]
+
+REBUILD_SQL = [
+    "DELETE FROM counters",
+    "INSERT INTO counters (name, value) SELECT 'jobs', COUNT(*) FROM jobs WHERE source = 'local'",
+    "INSERT INTO counters (name, value) SELECT 'employers', COUNT(*) FROM employers",
+    "INSERT INTO counters (name, value) "
+    "SELECT 'employer:' || employer_id || ':jobs', COUNT(*) FROM jobs GROUP BY employer_id",
+    "INSERT INTO counters (name, value) "
+    "SELECT 'job:' || job_id || ':applications', COUNT(*) FROM applications GROUP BY job_id",
+    "INSERT INTO counters (name, value) "
+    "SELECT 'user:' || user_id || ':saved_jobs', COUNT(*) FROM saved_jobs GROUP BY user_id",
+]
+
+
+def install_counters(engine):
+    """Create the counter triggers if missing, backfilling the table the first
+    time. Returns False when the database is not SQLite; callers then fall back
+    to COUNT queries."""
+    if engine.dialect.name != "sqlite":
+        return False
+    try:
+        with engine.begin() as conn:
+            existed = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type='trigger' AND name='counters_jobs_ai'")
+            ).first() is not None
+            for statement in COUNTERS_DDL:
+                conn.exec_driver_sql(statement)
+            if not existed:
+                for statement in REBUILD_SQL:
+                    conn.exec_driver_sql(statement)
+    except OperationalError as exc:
+        current_app.logger.warning("Maintained counters unavailable: %s", exc)
+        return False
+    return True
+
+
+def counters_enabled():
+    return bool(current_app.extensions.get("counters"))
+
+
+def get_count(name, fallback):
+    """Current value of counter `name` as seen by this session's transaction.
+    `fallback` is a zero-argument callable computing the same number when the
+    counters are not maintained."""
+    if not counters_enabled():
+        return fallback()
+    value = db.session.query(Counter.value).filter(Counter.name == name).scalar()
+    return value or 0
+
+
+def _read(names):
+    rows = db.session.query(Counter.name, Counter.value).filter(Counter.name.in_(names)).all()
+    found = dict(rows)
+    return [found.get(name, 0) for name in names]
+
+
+def _grouped_counts(key_column, count_column, ids):
+    rows = (
+        db.session.query(key_column, func.count(count_column))
+        .filter(key_column.in_(ids))
+        .group_by(key_column)
+        .all()
+    )
+    found = dict(rows)
+    return {i: found.get(i, 0) for i in ids}
+
+
+def applicant_counts(job_ids):
+    """{job_id: number of applications} for a page of jobs, in one query."""
+    job_ids = list(job_ids)
+    if not job_ids:
+        return {}
+    if counters_enabled():
+        return dict(zip(job_ids, _read([job_applications(i) for i in job_ids])))
+    return _grouped_counts(Application.job_id, Application.id, job_ids)
+
+
+def employer_job_counts(employer_ids):
+    """{employer_id: number of jobs posted} for a page of employers, in one query."""
+    employer_ids = list(employer_ids)
+    if not employer_ids:
+        return {}
+    if counters_enabled():
+        return dict(zip(employer_ids, _read([employer_jobs(i) for i in employer_ids])))
+    return _grouped_counts(Job.employer_id, Job.id, employer_ids)
@@ -0,0 +1,300 @@
+import hashlib
+import itertools
+import re
+import time
+import zlib
+
+import click
+import numpy as np
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import delete, event, inspect, insert, select, tuple_
+
+from .extensions import db
+from .models import Application, Job, JobLSHBucket, JobSignature
+
+# Near-duplicate detection for job postings. Each job's title + description is
+# reduced to word 3-gram shingles and summarized by a MinHash signature of
+# NUM_PERM values; the fraction of equal values estimates the Jaccard
+# similarity of two postings. Signatures are split into BANDS bands of ROWS
+# values and each band is hashed into a bucket, so a lookup only compares the
+# jobs sharing at least one bucket with the query instead of every posting.
+# With 16 bands of 4 rows, pairs above ~0.5 similarity are likely to collide
+# and candidates are then checked against DUPLICATE_THRESHOLD.
+#
+# The permutations come from a fixed seed: changing NUM_PERM, BANDS or the
+# seed invalidates stored signatures (rebuild with `flask dedupe index --rebuild`).
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+
+_PRIME = np.uint64((1 << 32) + 15)
+_rng = np.random.default_rng(20261018)
+# a, b < 2**32 and hashes < 2**32 keep a * x + b below 2**64.
+_A = _rng.integers(1, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+_EMPTY = np.full(NUM_PERM, 0xFFFFFFFF, dtype=np.uint32)
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+dedupe_cli = AppGroup("dedupe", help="Find near-duplicate job postings.")
+
+
+def shingle_hashes(text):
+    words = _WORD_RE.findall((text or "").lower())
+    if len(words) <= SHINGLE_SIZE:
+        grams = [" ".join(words)] if words else []
+    else:
+        grams = (" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1))
+    return np.fromiter({zlib.crc32(g.encode()) for g in grams}, dtype=np.uint64)
+
+
+def signature(title, description):
+    hashes = shingle_hashes(f"{title or ''} {description or ''}")
+    if hashes.size == 0:
+        return _EMPTY
+    return ((np.outer(_A, hashes) + _B[:, None]) % _PRIME).min(axis=1).astype(np.uint32)
+
+
+def to_blob(sig):
+    return sig.astype("<u4").tobytes()
+
+
+def from_blob(blob):
+    return np.frombuffer(blob, dtype="<u4")
+
+
+def similarity(a, b):
+    return float(np.count_nonzero(a == b)) / NUM_PERM
+
+
+def band_buckets(sig):
+    raw = to_blob(sig)
+    step = ROWS * 4
+    return [
+        (band, int.from_bytes(
+            hashlib.blake2b(raw[band * step:(band + 1) * step], digest_size=8).digest(), "little", signed=True
+        ))
+        for band in range(BANDS)
+    ]
+
+
+def index_jobs(connection, jobs):
+    """(Re)compute and store signatures and buckets for (job_id, title,
+    description) tuples using `connection`, inside the caller's transaction."""
+    jobs = list(jobs)
+    for start in range(0, len(jobs), 500):
+        chunk = jobs[start:start + 500]
+        ids = [job_id for job_id, _, _ in chunk]
+        connection.execute(delete(JobLSHBucket).where(JobLSHBucket.job_id.in_(ids)))
+        connection.execute(delete(JobSignature).where(JobSignature.job_id.in_(ids)))
+        signatures, buckets = [], []
+        for job_id, title, description in chunk:
+            sig = signature(title, description)
+            signatures.append({"job_id": job_id, "minhash": to_blob(sig)})
+            buckets.extend({"band": band, "bucket": bucket, "job_id": job_id} for band, bucket in band_buckets(sig))
+        connection.execute(insert(JobSignature), signatures)
+        connection.execute(insert(JobLSHBucket), buckets)
+
+
+def _load_signatures(ids):
+    ids = list(ids)
+    found = {}
+    for start in range(0, len(ids), 900):
+        rows = db.session.execute(
+            select(JobSignature.job_id, JobSignature.minhash)
+            .where(JobSignature.job_id.in_(ids[start:start + 900]))
+        )
+        found.update((job_id, from_blob(blob)) for job_id, blob in rows)
+    return found
+
+
+def find_duplicates(title, description, employer_id=None, exclude_id=None, threshold=None, limit=5):
+    """Existing jobs whose text is near-identical to `title`/`description`, as
+    [{"job_id", "similarity"}] best first. Scoped to one employer if given."""
+    return find_duplicates_many([(title, description, employer_id, exclude_id)], threshold, limit)[0]
+
+
+def find_duplicates_many(postings, threshold=None, limit=5):
+    """find_duplicates for each (title, description, employer_id, exclude_id),
+    with one bucket lookup and one signature load for the whole list."""
+    threshold = threshold if threshold is not None else current_app.config.get("DUPLICATE_THRESHOLD", 0.8)
+    signatures = [signature(title, description) for title, description, _, _ in postings]
+    buckets = [band_buckets(sig) for sig in signatures]
+    owners = {employer_id for _, _, employer_id, _ in postings}
+    scoped = owners != {None}
+    members = {}
+    wanted = list({key for keys in buckets for key in keys})
+    for start in range(0, len(wanted), 400):
+        query = select(JobLSHBucket.band, JobLSHBucket.bucket, JobLSHBucket.job_id).where(
+            tuple_(JobLSHBucket.band, JobLSHBucket.bucket).in_(wanted[start:start + 400])
+        )
+        if scoped:
+            query = query.add_columns(Job.employer_id).join(Job, Job.id == JobLSHBucket.job_id)
+            if None not in owners:
+                query = query.where(Job.employer_id.in_(owners))
+        for row in db.session.execute(query):
+            members.setdefault((row.band, row.bucket), []).append((row.job_id, row.employer_id if scoped else None))
+
+    candidates = []
+    for keys, (_, _, employer_id, exclude_id) in zip(buckets, postings):
+        candidates.append({
+            job_id for key in keys for job_id, owner in members.get(key, ())
+            if job_id != exclude_id and (employer_id is None or owner == employer_id)
+        })
+    stored = _load_signatures(set().union(*candidates))
+    found = []
+    for sig, ids in zip(signatures, candidates):
+        scored = []
+        for job_id in ids:
+            score = similarity(sig, stored[job_id]) if job_id in stored else 0.0
+            if score >= threshold:
+                scored.append({"job_id": job_id, "similarity": round(score, 3)})
+        scored.sort(key=lambda d: (-d["similarity"], d["job_id"]))
+        found.append(scored[:limit])
+    return found
+
+
+def find_clusters(threshold):
+    """Groups of job ids that are near-duplicates of each other, found by
+    walking the bucket index in order; no pairwise pass over the table.
+
+    Within a bucket every member is compared against the bucket's first job,
+    and matches are merged across bands with union-find.
+    """
+    parent = {}
+
+    def find(x):
+        while parent.get(x, x) != x:
+            parent[x] = parent.get(parent[x], parent[x])
+            x = parent[x]
+        return x
+
+    def verify(groups):
+        signatures = _load_signatures({job_id for group in groups for job_id in group})
+        for group in groups:
+            head = group[0]
+            for other in group[1:]:
+                a, b = find(head), find(other)
+                if a != b and similarity(signatures[head], signatures[other]) >= threshold:
+                    parent[max(a, b)] = min(a, b)
+
+    rows = db.session.execute(
+        select(JobLSHBucket.band, JobLSHBucket.bucket, JobLSHBucket.job_id)
+        .order_by(JobLSHBucket.band, JobLSHBucket.bucket, JobLSHBucket.job_id)
+        .execution_options(yield_per=10000)
+    )
+    pending, pending_size = [], 0
+    for _, members in itertools.groupby(rows, key=lambda row: (row.band, row.bucket)):
+        group = [row.job_id for row in members]
+        if len(group) < 2:
+            continue
+        pending.append(group)
+        pending_size += len(group)
+        if pending_size >= 5000:
+            verify(pending)
+            pending, pending_size = [], 0
+    if pending:
+        verify(pending)
+
+    clusters = {}
+    for job_id in parent:
+        clusters.setdefault(find(job_id), set()).add(job_id)
+    for root, members in clusters.items():
+        members.add(root)
+    return sorted(sorted(members) for members in clusters.values() if len(members) > 1)
+
+
+def _text_changed(job):
+    state = inspect(job)
+    return state.attrs.title.history.has_changes() or state.attrs.description.history.has_changes()
+
+
+def _index_after_flush(session, flush_context):
+    jobs = [obj for obj in session.new if isinstance(obj, Job)]
+    jobs += [obj for obj in session.dirty if isinstance(obj, Job) and _text_changed(obj)]
+    if jobs:
+        index_jobs(session.connection(), [(job.id, job.title, job.description) for job in jobs])
+
+
+@dedupe_cli.command("index")
+@click.option("--rebuild", is_flag=True, help="Recompute every signature, not just missing ones.")
+@click.option("--batch-size", type=int, default=1000)
+def index_command(rebuild, batch_size):
+    """Compute signatures for jobs that don't have one yet."""
+    started = time.perf_counter()
+    query = select(Job.id, Job.title, Job.description).order_by(Job.id)
+    if not rebuild:
+        query = query.where(~select(JobSignature.job_id).where(JobSignature.job_id == Job.id).exists())
+    total = 0
+    last_id = 0
+    while True:
+        batch = db.session.execute(query.where(Job.id > last_id).limit(batch_size)).all()
+        if not batch:
+            break
+        index_jobs(db.session.connection(), batch)
+        db.session.commit()
+        total += len(batch)
+        last_id = batch[-1][0]
+    elapsed = time.perf_counter() - started
+    click.echo(f"Indexed {total} jobs in {elapsed:.1f}s")
+
+
+@dedupe_cli.command("scan")
+@click.option("--threshold", type=float, default=None, help="Similarity cutoff (default: DUPLICATE_THRESHOLD).")
+@click.option("--delete", "delete_duplicates", is_flag=True,
+              help="Keep the oldest posting of each employer (or import source) in a cluster and delete "
+                   "its other ones. Postings of different owners are reported, never deleted.")
+@click.option("--show", type=int, default=10, help="Clusters to print.")
+def scan_command(threshold, delete_duplicates, show):
+    """Report near-duplicate clusters across the whole jobs table."""
+    from .ingest import delete_jobs
+
+    threshold = threshold if threshold is not None else current_app.config.get("DUPLICATE_THRESHOLD", 0.8)
+    started = time.perf_counter()
+    clusters = find_clusters(threshold)
+    duplicates = sum(len(cluster) - 1 for cluster in clusters)
+    click.echo(
+        f"{len(clusters)} clusters, {duplicates} duplicate postings "
+        f"(threshold {threshold}, {time.perf_counter() - started:.1f}s)"
+    )
+    for cluster in clusters[:show]:
+        click.echo("  " + ", ".join(str(job_id) for job_id in cluster))
+    if not delete_duplicates or not clusters:
+        return
+
+    doomed, shared = [], []
+    for start in range(0, len(clusters), 200):
+        chunk = clusters[start:start + 200]
+        ids = [job_id for cluster in chunk for job_id in cluster]
+        jobs = {
+            row.id: row for row in db.session.execute(
+                select(Job.id, Job.employer_id).where(Job.id.in_(ids))
+            )
+        }
+        applied = set(db.session.scalars(
+            select(Application.job_id).where(Application.job_id.in_(ids)).distinct()
+        ))
+        for cluster in chunk:
+            # Imported postings are filed under one employer per source, so
+            # grouping on employer_id also keeps feeds apart.
+            owners = {}
+            for job_id in sorted(cluster):
+                if job_id in jobs:
+                    owners.setdefault(jobs[job_id].employer_id, []).append(job_id)
+            if len(owners) > 1:
+                shared.append(cluster)
+            for members in owners.values():
+                # Postings people applied to are never removed.
+                doomed.extend((job_id, jobs[job_id].employer_id) for job_id in members[1:] if job_id not in applied)
+    if shared:
+        click.echo(f"{len(shared)} clusters span several employers; only postings sharing an employer were deleted:")
+        for cluster in shared[:show]:
+            click.echo("  " + ", ".join(str(job_id) for job_id in cluster))
+    click.echo(f"Deleted {delete_jobs(doomed)} postings")
+
+
+def init_app(app):
+    app.cli.add_command(dedupe_cli)
+    if not event.contains(db.session, "after_flush", _index_after_flush):
+        event.listen(db.session, "after_flush", _index_after_flush)
@@ -0,0 +1,300 @@
+import hashlib
+import json
+import os
+import secrets
+import threading
+import time
+from datetime import datetime, timedelta
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import delete, exists, insert, select, update
+from werkzeug.security import generate_password_hash
+
+from .adzuna_client import AdzunaError, get_client
+from .changes import ModelChange, record_changes
+from .conditional import bump_versions
+from . import dedupe, matching
+from .extensions import db
+from .models import Application, ApplicationForm, Employer, Job, User
+
+# Pulls the configured Adzuna searches into `jobs` so external postings can be
+# listed, searched, saved and applied to like local ones. Each run walks every
+# query's result pages up to INGEST_MAX_PAGES (or the end of the results).
+# Rows are upserted in batches keyed on (source, external_id); unchanged
+# postings (same content hash) only have last_seen_at bumped. Postings not seen
+# for INGEST_STALE_DAYS are removed, but only after a run in which every page
+# was fetched: an outage or a revoked key must not look like delisting.
+SOURCE = "adzuna"
+
+TITLE_MAX = 120
+LOCATION_MAX = 120
+URL_MAX = 500
+
+ingest_cli = AppGroup("ingest", help="Import external job postings.")
+
+
+def _parse_created(value):
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).replace(tzinfo=None)
+    except (AttributeError, ValueError):
+        return None
+
+
+def normalize(result):
+    """Adzuna search result -> dict of Job columns, or None if unusable."""
+    external_id = result.get("id")
+    title = (result.get("title") or "").strip()
+    if not external_id or not title:
+        return None
+    salaries = [s for s in (result.get("salary_min"), result.get("salary_max")) if isinstance(s, (int, float))]
+    row = {
+        "external_id": str(external_id),
+        "title": title[:TITLE_MAX],
+        "description": (result.get("description") or "").strip(),
+        "location": ((result.get("location") or {}).get("display_name") or "Unspecified")[:LOCATION_MAX],
+        "salary": float(sum(salaries) / len(salaries)) if salaries else 0.0,
+        "external_url": (result.get("redirect_url") or "")[:URL_MAX] or None,
+    }
+    digest_fields = {k: row[k] for k in ("title", "description", "location", "salary", "external_url")}
+    row["content_hash"] = hashlib.sha1(
+        json.dumps(digest_fields, sort_keys=True).encode()
+    ).hexdigest()
+    row["created_at"] = _parse_created(result.get("created"))
+    return row
+
+
+def source_employer(source=SOURCE):
+    """The employer every posting from `source` is filed under, created on first
+    use. Its account has an unusable password, so nobody can log in as it."""
+    email = f"{source}-ingest@system.invalid"
+    employer = Employer.query.filter_by(email=email).first()
+    if employer is not None:
+        return employer
+    user = User(
+        username=f"{source}-ingest",
+        email=email,
+        password_hash=generate_password_hash(secrets.token_urlsafe(32)),
+        role="employer",
+    )
+    db.session.add(user)
+    db.session.flush()
+    employer = Employer(
+        user_id=user.id,
+        name=f"{source.title()} (imported)",
+        email=email,
+        company_name=source.title(),
+        phone="-",
+        contact_person="-",
+        password_hash=user.password_hash,
+    )
+    db.session.add(employer)
+    db.session.commit()
+    return employer
+
+
+def upsert_batch(rows, employer_id, now=None, source=SOURCE):
+    """Insert new postings, rewrite changed ones and touch unchanged ones, in
+    one transaction. Returns (inserted, updated, unchanged)."""
+    now = now or datetime.utcnow()
+    by_id = {row["external_id"]: row for row in rows}
+    existing = {
+        external_id: (job_id, content_hash)
+        for job_id, external_id, content_hash in db.session.execute(
+            select(Job.id, Job.external_id, Job.content_hash)
+            .where(Job.source == source, Job.external_id.in_(list(by_id)))
+        )
+    }
+
+    new_rows, changed_rows, unchanged_ids = [], [], []
+    for external_id, row in by_id.items():
+        values = {**row, "source": source, "employer_id": employer_id, "last_seen_at": now, "updated_at": now}
+        if external_id not in existing:
+            values["created_at"] = values["created_at"] or now
+            new_rows.append(values)
+            continue
+        job_id, content_hash = existing[external_id]
+        if content_hash == row["content_hash"]:
+            unchanged_ids.append(job_id)
+        else:
+            values.pop("created_at")
+            changed_rows.append({"id": job_id, **values})
+
+    changes = []
+    if new_rows:
+        inserted = db.session.execute(insert(Job).returning(Job.id, Job.external_id), new_rows).all()
+        db.session.execute(insert(ApplicationForm), [{"job_id": job_id, "created_at": now} for job_id, _ in inserted])
+        changes += [
+            ModelChange("insert", "Job", job_id, {"id": job_id, **by_id[ext], "employer_id": employer_id}, {})
+            for job_id, ext in inserted
+        ]
+    if changed_rows:
+        db.session.execute(update(Job), changed_rows)
+        changes += [
+            ModelChange("update", "Job", row["id"], row, {"content_hash": existing[row["external_id"]][1]})
+            for row in changed_rows
+        ]
+    if unchanged_ids:
+        db.session.execute(update(Job).where(Job.id.in_(unchanged_ids)).values(last_seen_at=now))
+    if changes:
+        # Bulk statements skip the ORM flush, so index, bump the version
+        # counters and feed the change signal (response cache, ...) directly.
+        texts = [(c.id, c.values["title"], c.values["description"]) for c in changes]
+        dedupe.index_jobs(db.session.connection(), texts)
+        matching.index_jobs(db.session.connection(), texts)
+        bump_versions(db.session.connection(), ["jobs"])
+        record_changes(db.session, changes)
+    db.session.commit()
+    return len(new_rows), len(changed_rows), len(unchanged_ids)
+
+
+def delete_jobs(doomed):
+    """Delete (job_id, employer_id) rows with bulk statements and commit,
+    keeping the version counters and the change signal in step."""
+    if not doomed:
+        return 0
+    ids = [job_id for job_id, _ in doomed]
+    for start in range(0, len(ids), 500):
+        db.session.execute(
+            delete(Job).where(Job.id.in_(ids[start:start + 500])),
+            execution_options={"synchronize_session": False},
+        )
+    # Deleting jobs cascades into saved_jobs and application_forms.
+    bump_versions(db.session.connection(), ["jobs", "saved_jobs"])
+    record_changes(db.session, [
+        ModelChange("delete", "Job", job_id, {"id": job_id, "employer_id": employer_id}, {})
+        for job_id, employer_id in doomed
+    ])
+    db.session.commit()
+    return len(ids)
+
+
+def expire_stale(stale_days=None, source=SOURCE):
+    """Delete postings from `source` not seen for `stale_days`. Postings that
+    already have applications are kept so applicants don't lose them."""
+    stale_days = stale_days if stale_days is not None else current_app.config.get("INGEST_STALE_DAYS", 14)
+    cutoff = datetime.utcnow() - timedelta(days=stale_days)
+    doomed = db.session.execute(
+        select(Job.id, Job.employer_id).where(
+            Job.source == source,
+            Job.last_seen_at < cutoff,
+            ~exists().where(Application.job_id == Job.id),
+        )
+    ).all()
+    return delete_jobs(doomed)
+
+
+def configured_queries():
+    return [q.strip() for q in current_app.config.get("INGEST_QUERIES", "").split(";") if q.strip()]
+
+
+def run_ingestion(queries=None, max_pages=None):
+    """One incremental pass over `queries`, then stale expiry. Returns stats."""
+    config = current_app.config
+    queries = queries if queries is not None else configured_queries()
+    max_pages = max_pages or config.get("INGEST_MAX_PAGES", 5)
+    batch_size = config.get("INGEST_BATCH_SIZE", 200)
+    country = config.get("INGEST_COUNTRY", "us")
+    credentials = {"app_id": os.getenv("ADZUNA_APP_ID"), "app_key": os.getenv("ADZUNA_APP_KEY")}
+    stats = {"queries": len(queries), "pages": 0, "fetched": 0, "inserted": 0, "updated": 0,
+             "unchanged": 0, "expired": 0, "errors": 0}
+    if not queries:
+        return stats
+    if not all(credentials.values()):
+        raise RuntimeError("Adzuna API credentials are not configured")
+
+    started = time.perf_counter()
+    employer_id = source_employer().id
+    client = get_client()
+    per_page = config.get("INGEST_RESULTS_PER_PAGE", 50)
+    for query in queries:
+        params = {
+            "what": query,
+            "results_per_page": per_page,
+            "sort_by": "date",
+        }
+        if config.get("INGEST_MAX_DAYS_OLD"):
+            params["max_days_old"] = config["INGEST_MAX_DAYS_OLD"]
+        for page in range(1, max_pages + 1):
+            try:
+                payload, _ = client.search(country, page, params, credentials)
+            except AdzunaError as exc:
+                current_app.logger.warning("Ingest of %r page %s failed: %s", query, page, exc.error)
+                stats["errors"] += 1
+                break
+            results = payload.get("results") or []
+            rows = [row for row in map(normalize, results) if row is not None]
+            stats["pages"] += 1
+            stats["fetched"] += len(rows)
+            # Every page is walked, unchanged ones included, so postings deeper
+            # in the results keep their last_seen_at fresh.
+            for start in range(0, len(rows), batch_size):
+                inserted, updated, unchanged = upsert_batch(rows[start:start + batch_size], employer_id)
+                stats["inserted"] += inserted
+                stats["updated"] += updated
+                stats["unchanged"] += unchanged
+            if len(results) < per_page:
+                break
+    if stats["errors"]:
+        current_app.logger.warning("Skipping stale expiry: %s ingest page(s) failed", stats["errors"])
+    else:
+        stats["expired"] = expire_stale()
+    stats["seconds"] = round(time.perf_counter() - started, 3)
+    stats["rows_per_sec"] = round(stats["fetched"] / stats["seconds"], 1) if stats["seconds"] else None
+    current_app.extensions["ingest"]["last_run"] = stats
+    return stats
+
+
+@ingest_cli.command("run")
+@click.option("--query", "queries", multiple=True, help="Search to import (default: INGEST_QUERIES).")
+@click.option("--pages", type=int, default=None, help="Most pages per query (default: INGEST_MAX_PAGES).")
+def run_command(queries, pages):
+    """Run one ingestion pass now."""
+    try:
+        stats = run_ingestion(list(queries) or None, pages)
+    except RuntimeError as exc:
+        raise click.ClickException(str(exc))
+    click.echo(json.dumps(stats))
+
+
+@ingest_cli.command("expire")
+@click.option("--days", type=int, default=None, help="Age cutoff (default: INGEST_STALE_DAYS).")
+def expire_command(days):
+    """Remove imported postings that upstream no longer lists."""
+    click.echo(f"Expired {expire_stale(days)} postings")
+
+
+def _schedule(app, interval):
+    def loop():
+        while not state["stop"].wait(interval):
+            with app.app_context():
+                try:
+                    run_ingestion()
+                except Exception:
+                    app.logger.exception("Scheduled ingestion failed")
+                finally:
+                    db.session.remove()
+
+    state = app.extensions["ingest"]
+    state["thread"] = threading.Thread(target=loop, name="ingest-scheduler", daemon=True)
+    state["thread"].start()
+
+
+def init_app(app):
+    app.extensions["ingest"] = {"last_run": None, "thread": None, "stop": threading.Event()}
+    app.cli.add_command(ingest_cli)
+    interval = app.config.get("INGEST_INTERVAL", 0)
+    if interval > 0:
+        lock = threading.Lock()
+
+        # Started on the first request rather than at import, so CLI commands
+        # and migrations never spawn the scheduler. Each server process runs
+        # its own; upserts are idempotent, but enable it on one process only.
+        @app.before_request
+        def _start_scheduler():
+            state = app.extensions["ingest"]
+            if state["thread"] is None:
+                with lock:
+                    if state["thread"] is None:
+                        _schedule(app, interval)
@@ -0,0 +1,507 @@
+import json
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import click
+import numpy as np
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import delete, event, func, insert, inspect, or_, select, text
+
+from . import search
+from .changes import models_committed
+from .extensions import db
+from .models import Application, Job, JobSkill, Profile, ProfileSkill, Skill, TableVersion
+
+# Candidate <-> job matching on skills. Profile.skills is parsed into
+# normalized names ("JS, Postgres" -> javascript, postgresql) that make up the
+# skill vocabulary (`skills`) and each profile's `profile_skills` rows. Every
+# job's title and description is scanned for vocabulary skills into posting
+# lists (`job_skills`), kept current as jobs and profiles are written: a job is
+# re-scanned when its text changes, and a skill new to the vocabulary is
+# looked up in existing jobs through the FTS index.
+#
+# A profile is scored against the posting lists of its skills in one NumPy
+# pass: each matched skill adds weight x idf (title mentions count more), and
+# the sum is divided by the best possible, so a job using all of a profile's
+# skills in its title scores 1.
+EXPLICIT_WEIGHT = 1.0
+# Skills only mentioned in job_experience / current_position / last_position.
+EXPERIENCE_WEIGHT = 0.5
+TITLE_BONUS = 0.5
+MAX_SKILL_LENGTH = 40
+MAX_SKILL_WORDS = 3
+MAX_RESULTS = 50
+MAX_CANDIDATES = 1000
+# Candidate rankings are cached until one of these tables' version counters
+# (app/conditional.py) moves.
+CANDIDATE_TABLES = ("applications", "jobs", "profiles")
+
+SKILL_ALIASES = {
+    "js": "javascript",
+    "ecmascript": "javascript",
+    "ts": "typescript",
+    "py": "python",
+    "python3": "python",
+    "golang": "go",
+    "k8s": "kubernetes",
+    "postgres": "postgresql",
+    "psql": "postgresql",
+    "mssql": "sql server",
+    "ms sql": "sql server",
+    "reactjs": "react",
+    "react.js": "react",
+    "nodejs": "node.js",
+    "node": "node.js",
+    "vuejs": "vue",
+    "vue.js": "vue",
+    "csharp": "c#",
+    "c sharp": "c#",
+    "cpp": "c++",
+    "ml": "machine learning",
+    "gcp": "google cloud",
+    "ms excel": "excel",
+    "microsoft excel": "excel",
+}
+
+# List separators in Profile.skills ("Python, SQL / JS and Go").
+_SPLIT_RE = re.compile(r"[,;|/\n\r•]+|\s+(?:and|&)\s+", re.IGNORECASE)
+# Words keep the characters skill names use: c++, c#, node.js, .net.
+_TOKEN_RE = re.compile(r"\.?[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+matching_cli = AppGroup("matching", help="Skill matching between profiles and jobs.")
+
+
+def normalize_skill(raw):
+    name = " ".join(_TOKEN_RE.findall((raw or "").lower()))
+    name = SKILL_ALIASES.get(name, name)
+    if not name or len(name) > MAX_SKILL_LENGTH or name.count(" ") >= MAX_SKILL_WORDS or name.isdigit():
+        return None
+    return name
+
+
+def parse_skills(text):
+    """Normalized skill names listed in free text, in order, without repeats."""
+    names = (normalize_skill(part) for part in _SPLIT_RE.split(text or ""))
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def extract_skills(text, vocabulary):
+    """Names in `vocabulary` mentioned anywhere in `text` (aliases included)."""
+    tokens = _TOKEN_RE.findall((text or "").lower())
+    found = set()
+    for size in range(1, MAX_SKILL_WORDS + 1):
+        for i in range(len(tokens) - size + 1):
+            gram = " ".join(tokens[i:i + size])
+            name = SKILL_ALIASES.get(gram, gram)
+            if name in vocabulary:
+                found.add(name)
+    return found
+
+
+def _vocabulary(connection):
+    # {name: id}, reloaded whenever the skills table has grown (possibly from
+    # another worker).
+    state = current_app.extensions["matching"]
+    latest = connection.execute(select(func.max(Skill.id))).scalar() or 0
+    if latest != state["vocabulary_max_id"]:
+        with state["lock"]:
+            state["vocabulary"] = dict(connection.execute(select(Skill.name, Skill.id)).all())
+            state["vocabulary_max_id"] = latest
+    return state["vocabulary"]
+
+
+def _job_skill_rows(vocabulary, job_id, title, description):
+    in_title = extract_skills(title, vocabulary)
+    found = in_title | extract_skills(description, vocabulary)
+    return [
+        {"skill_id": vocabulary[name], "job_id": job_id, "weight": 1.0 + TITLE_BONUS if name in in_title else 1.0}
+        for name in found
+    ]
+
+
+def index_jobs(connection, jobs):
+    """Rewrite the posting-list entries of (job_id, title, description)
+    tuples using `connection`, inside the caller's transaction."""
+    vocabulary = _vocabulary(connection)
+    jobs = list(jobs)
+    for start in range(0, len(jobs), 500):
+        chunk = jobs[start:start + 500]
+        connection.execute(delete(JobSkill).where(JobSkill.job_id.in_([job_id for job_id, _, _ in chunk])))
+        rows = [row for job in chunk for row in _job_skill_rows(vocabulary, *job)]
+        if rows:
+            connection.execute(insert(JobSkill), rows)
+
+
+def index_profiles(connection, profiles):
+    """Rewrite the profile_skills rows of (profile_id, skills text) tuples.
+    Names must already be in the vocabulary (see add_skills)."""
+    vocabulary = _vocabulary(connection)
+    profiles = list(profiles)
+    for start in range(0, len(profiles), 500):
+        chunk = profiles[start:start + 500]
+        connection.execute(delete(ProfileSkill).where(ProfileSkill.profile_id.in_([p for p, _ in chunk])))
+        rows = [
+            {"skill_id": vocabulary[name], "profile_id": profile_id}
+            for profile_id, skills in chunk for name in parse_skills(skills) if name in vocabulary
+        ]
+        if rows:
+            connection.execute(insert(ProfileSkill), rows)
+
+
+def _jobs_mentioning(connection, name):
+    # Cheap prefilter (FTS phrase or LIKE) on the skill and its aliases; the
+    # caller confirms each hit with extract_skills.
+    spellings = [name] + [alias for alias, canonical in SKILL_ALIASES.items() if canonical == name]
+    query = select(Job.id, Job.title, Job.description)
+    if search.fts_enabled():
+        phrases = [" ".join(_WORD_RE.findall(s)) for s in spellings]
+        expression = " OR ".join(f'"{p}"' for p in phrases if p)
+        if not expression:
+            return []
+        query = query.where(Job.id.in_(
+            select(search.jobs_fts.c.rowid).where(
+                text(f"{search.FTS_TABLE} MATCH :fts_query").bindparams(fts_query=expression)
+            )
+        ))
+    else:
+        query = query.where(or_(*[
+            column.ilike(f"%{s}%") for s in spellings for column in (Job.title, Job.description)
+        ]))
+    return connection.execute(query).all()
+
+
+def add_skills(connection, names, backfill=True):
+    """Add names missing from the vocabulary and, with `backfill`, index the
+    existing jobs that mention them. Returns how many were added."""
+    vocabulary = _vocabulary(connection)
+    new = [name for name in dict.fromkeys(names) if name not in vocabulary]
+    if not new:
+        return 0
+    statement = insert(Skill)
+    if connection.dialect.name == "sqlite":
+        # Another worker may add the same name first.
+        statement = statement.prefix_with("OR IGNORE")
+    connection.execute(statement, [{"name": name} for name in new])
+    vocabulary = _vocabulary(connection)
+    if backfill:
+        for name in new:
+            skill = {name: vocabulary[name]}
+            rows = []
+            for job_id, title, description in _jobs_mentioning(connection, name):
+                if extract_skills(title, skill):
+                    rows.append({"skill_id": skill[name], "job_id": job_id, "weight": 1.0 + TITLE_BONUS})
+                elif extract_skills(description, skill):
+                    rows.append({"skill_id": skill[name], "job_id": job_id, "weight": 1.0})
+            if rows:
+                connection.execute(insert(JobSkill).prefix_with("OR IGNORE", dialect="sqlite"), rows)
+    return len(new)
+
+
+def profile_skills(profile, vocabulary):
+    """{skill name: weight} for a profile: its listed skills, plus vocabulary
+    skills its experience and positions mention."""
+    weights = {}
+    for field in (profile.current_position, profile.last_position, profile.job_experience):
+        for name in extract_skills(field, vocabulary):
+            weights[name] = EXPERIENCE_WEIGHT
+    for name in parse_skills(profile.skills):
+        weights[name] = EXPLICIT_WEIGHT
+    return weights
+
+
+class SkillPostings:
+    """Job-skill posting lists as flat NumPy arrays grouped by skill id."""
+
+    def __init__(self, skill_ids, job_ids, weights, total_jobs):
+        order = np.argsort(skill_ids, kind="stable")
+        self.job_ids = job_ids[order]
+        self.weights = weights[order]
+        self.size = int(job_ids.max()) + 1 if job_ids.size else 0
+        skills, starts, counts = np.unique(skill_ids[order], return_index=True, return_counts=True)
+        self.slices = {
+            int(skill): (int(start), int(start + count), math.log(1 + total_jobs / count))
+            for skill, start, count in zip(skills, starts, counts)
+        }
+
+    @classmethod
+    def load(cls, connection, skill_ids=None):
+        query = select(JobSkill.skill_id, JobSkill.job_id, JobSkill.weight)
+        if skill_ids is not None:
+            query = query.where(JobSkill.skill_id.in_(list(skill_ids)))
+        columns = list(zip(*connection.execute(query).all())) or [(), (), ()]
+        # The highest id stands in for the job count in idf; it is an index
+        # lookup rather than a table scan.
+        total_jobs = connection.execute(select(func.max(Job.id))).scalar() or 1
+        return cls(
+            np.array(columns[0], dtype=np.int64),
+            np.array(columns[1], dtype=np.int64),
+            np.array(columns[2], dtype=np.float64),
+            total_jobs,
+        )
+
+    def rank(self, weights, limit, exclude=(), with_skills=True):
+        """Best jobs for {skill_id: weight} as [(job_id, score, [skill_id, ...])]
+        (the skill lists are empty unless `with_skills`)."""
+        parts = [(skill, *self.slices[skill], weight) for skill, weight in weights.items() if skill in self.slices]
+        if not parts:
+            return []
+        best = sum(weight * idf for _, _, _, idf, weight in parts) * (1.0 + TITLE_BONUS)
+        jobs = np.concatenate([self.job_ids[start:end] for _, start, end, _, _ in parts])
+        contributions = np.concatenate([self.weights[start:end] * (weight * idf) for _, start, end, idf, weight in parts])
+        # Dense per-job-id accumulator: one pass over the postings, no sort.
+        scores = np.bincount(jobs, weights=contributions, minlength=self.size) / best
+        if exclude:
+            scores[[job_id for job_id in exclude if job_id < self.size]] = 0.0
+        candidates = np.flatnonzero(scores)
+        if candidates.size == 0:
+            return []
+        limit = min(limit, candidates.size)
+        top = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        # Best score first, newer postings first on ties.
+        top = top[np.lexsort((-top, -scores[top]))]
+        matched = {int(job_id): [] for job_id in top}
+        if with_skills:
+            owners = np.repeat(np.arange(len(parts)), [end - start for _, start, end, _, _ in parts])
+            hits = np.isin(jobs, top)
+            for job_id, part in zip(jobs[hits].tolist(), owners[hits].tolist()):
+                matched[job_id].append(parts[part][0])
+        return [(int(job_id), round(float(scores[job_id]), 4), matched[int(job_id)]) for job_id in top]
+
+
+def recommend(profile, limit):
+    """[(job_id, score, [skill name, ...])] for the profile's best-matching
+    jobs, leaving out jobs its user already applied to."""
+    connection = db.session.connection()
+    vocabulary = _vocabulary(connection)
+    weights = profile_skills(profile, vocabulary)
+    names = {vocabulary[name]: name for name in weights if name in vocabulary}
+    if not names:
+        return []
+    postings = SkillPostings.load(connection, names)
+    applied = set(db.session.scalars(select(Application.job_id).where(Application.user_id == profile.user_id)))
+    ranked = postings.rank({skill_id: weights[name] for skill_id, name in names.items()}, limit, applied)
+    return [(job_id, score, [names[s] for s in matched]) for job_id, score, matched in ranked]
+
+
+def _job_skill_vector(connection, job_id):
+    # (skill ids, weight x idf) of the skills a job mentions.
+    rows = connection.execute(
+        select(JobSkill.skill_id, JobSkill.weight).where(JobSkill.job_id == job_id)
+    ).all()
+    if not rows:
+        return np.zeros(0, dtype=np.int64), np.zeros(0)
+    skill_ids = [skill_id for skill_id, _ in rows]
+    df = dict(connection.execute(
+        select(JobSkill.skill_id, func.count()).where(JobSkill.skill_id.in_(skill_ids)).group_by(JobSkill.skill_id)
+    ).all())
+    total_jobs = connection.execute(select(func.max(Job.id))).scalar() or 1
+    return (
+        np.array(skill_ids, dtype=np.int64),
+        np.array([weight * math.log(1 + total_jobs / df[skill_id]) for skill_id, weight in rows]),
+    )
+
+
+def _profile_vectors(rows, vocabulary):
+    # Parsed (skill ids, weights) per profile, reused until the profile or
+    # the vocabulary changes; least recently ranked profiles are dropped.
+    state = current_app.extensions["matching"]
+    cache = state["profile_vectors"]
+    version = state["vocabulary_max_id"]
+    vectors = []
+    for row in rows:
+        with state["lock"]:
+            entry = cache.get(row.id)
+            if entry is not None:
+                cache.move_to_end(row.id)
+        if entry is None or entry[0] != (row.updated_at, version):
+            weights = {vocabulary[name]: w for name, w in profile_skills(row, vocabulary).items() if name in vocabulary}
+            entry = (
+                (row.updated_at, version),
+                np.fromiter(weights.keys(), dtype=np.int64, count=len(weights)),
+                np.fromiter(weights.values(), dtype=np.float64, count=len(weights)),
+            )
+            with state["lock"]:
+                cache[row.id] = entry
+                while len(cache) > state["profile_vectors_size"]:
+                    cache.popitem(last=False)
+        vectors.append(entry[1:])
+    return vectors
+
+
+def rank_candidates(job, scope="applicants"):
+    """[(user_id, score, [skill name, ...])] best first, scoring the job's
+    applicants (or with scope "all", every profile) by the share of the job's
+    idf-weighted skills they have. Cached until a job, application or
+    profile is written, in any worker."""
+    state = current_app.extensions["matching"]
+    key = (job.id, scope)
+    connection = db.session.connection()
+    # A new skill can add postings to this job without the job changing.
+    vocabulary = _vocabulary(connection)
+    version = (state["vocabulary_max_id"], *connection.execute(
+        select(TableVersion.version)
+        .where(TableVersion.name.in_(CANDIDATE_TABLES))
+        .order_by(TableVersion.name)
+    ).scalars())
+    with state["lock"]:
+        entry = state["candidates"].get(key)
+        if entry is not None and entry[0] > time.monotonic() and entry[1] == version:
+            state["candidates"].move_to_end(key)
+            return entry[2]
+
+    columns = (
+        Profile.id, Profile.user_id, Profile.skills, Profile.job_experience,
+        Profile.current_position, Profile.last_position, Profile.updated_at,
+    )
+    if scope == "all":
+        user_ids = None
+        rows = connection.execute(select(*columns)).all()
+    else:
+        applicants = select(Application.user_id).where(Application.job_id == job.id)
+        user_ids = set(connection.execute(applicants).scalars())
+        rows = connection.execute(select(*columns).where(Profile.user_id.in_(applicants))).all() if user_ids else []
+
+    skill_ids, job_weights = _job_skill_vector(connection, job.id)
+    vectors = _profile_vectors(rows, vocabulary)
+    scores = np.zeros(len(rows))
+    matched = {}
+    if rows and skill_ids.size:
+        # One pass over every (profile, skill) pair of the candidate set.
+        lookup = np.zeros(int(max(skill_ids.max(), max((v[0].max() for v in vectors if v[0].size), default=0))) + 1)
+        lookup[skill_ids] = job_weights
+        owners = np.repeat(np.arange(len(rows)), [v[0].size for v in vectors])
+        flat_skills = np.concatenate([v[0] for v in vectors])
+        contributions = lookup[flat_skills] * np.concatenate([v[1] for v in vectors])
+        scores = np.bincount(owners, weights=contributions, minlength=len(rows)) / job_weights.sum()
+        wanted = set(skill_ids.tolist())
+        names = {skill_id: name for name, skill_id in vocabulary.items() if skill_id in wanted}
+        hits = contributions > 0
+        for owner, skill_id in zip(owners[hits].tolist(), flat_skills[hits].tolist()):
+            matched.setdefault(owner, []).append(names[skill_id])
+
+    order = np.lexsort((np.arange(len(rows)), -scores))
+    ranked = [(rows[i].user_id, round(float(scores[i]), 4), matched.get(i, [])) for i in order[:MAX_CANDIDATES]]
+    if user_ids is not None:
+        # Applicants without a profile rank last.
+        ranked += [(user_id, 0.0, []) for user_id in sorted(user_ids - {row.user_id for row in rows})]
+    with state["lock"]:
+        state["candidates"][key] = (time.monotonic() + state["cache_ttl"], version, ranked)
+        while len(state["candidates"]) > state["cache_size"]:
+            state["candidates"].popitem(last=False)
+    return ranked
+
+
+def _forget_profiles(app, changes, **extra):
+    state = app.extensions["matching"]
+    with state["lock"]:
+        for change in changes:
+            if change.model == "Profile" and change.op == "delete":
+                state["profile_vectors"].pop(change.id, None)
+
+
+def run_digest(limit):
+    """Yield (user_id, ranked) for every profile against every job, from one
+    in-memory copy of the posting lists."""
+    connection = db.session.connection()
+    vocabulary = _vocabulary(connection)
+    postings = SkillPostings.load(connection)
+    applied = {}
+    for user_id, job_id in connection.execute(select(Application.user_id, Application.job_id)):
+        applied.setdefault(user_id, set()).add(job_id)
+    for profile in Profile.query.order_by(Profile.id).yield_per(1000):
+        weights = {vocabulary[name]: w for name, w in profile_skills(profile, vocabulary).items() if name in vocabulary}
+        yield profile.user_id, postings.rank(weights, limit, applied.get(profile.user_id, ()), with_skills=False)
+
+
+def _text_changed(obj, *fields):
+    state = inspect(obj)
+    return any(state.attrs[field].history.has_changes() for field in fields)
+
+
+def _index_after_flush(session, flush_context):
+    # Profiles first, so a job saved in the same flush is scanned for their skills.
+    profiles = [obj for obj in session.new if isinstance(obj, Profile)]
+    profiles += [obj for obj in session.dirty if isinstance(obj, Profile) and _text_changed(obj, "skills")]
+    names = [name for profile in profiles for name in parse_skills(profile.skills)]
+    if names:
+        add_skills(session.connection(), names)
+    if profiles:
+        index_profiles(session.connection(), [(profile.id, profile.skills) for profile in profiles])
+    jobs = [obj for obj in session.new if isinstance(obj, Job)]
+    jobs += [obj for obj in session.dirty if isinstance(obj, Job) and _text_changed(obj, "title", "description")]
+    if jobs:
+        index_jobs(session.connection(), [(job.id, job.title, job.description) for job in jobs])
+
+
+@matching_cli.command("index")
+@click.option("--batch-size", type=int, default=1000)
+def index_command(batch_size):
+    """Rebuild the skill vocabulary and profile skills from profiles, then
+    re-scan every job."""
+    started = time.perf_counter()
+    added = profiles = jobs = 0
+    last_id = 0
+    query = select(Profile.id, Profile.skills).order_by(Profile.id)
+    while True:
+        batch = db.session.execute(query.where(Profile.id > last_id).limit(batch_size)).all()
+        if not batch:
+            break
+        names = [name for _, skills in batch for name in parse_skills(skills)]
+        added += add_skills(db.session.connection(), names, backfill=False)
+        index_profiles(db.session.connection(), batch)
+        db.session.commit()
+        profiles += len(batch)
+        last_id = batch[-1][0]
+    last_id = 0
+    query = select(Job.id, Job.title, Job.description).order_by(Job.id)
+    while True:
+        batch = db.session.execute(query.where(Job.id > last_id).limit(batch_size)).all()
+        if not batch:
+            break
+        index_jobs(db.session.connection(), batch)
+        db.session.commit()
+        jobs += len(batch)
+        last_id = batch[-1][0]
+    click.echo(
+        f"Added {added} skills, indexed {profiles} profiles and {jobs} jobs "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+
+
+@matching_cli.command("digest")
+@click.option("--limit", type=int, default=10, help="Jobs per profile.")
+@click.option("--output", type=click.File("w"), default="-", help="NDJSON file (default: stdout).")
+def digest_command(limit, output):
+    """Best-matching jobs for every profile, one JSON line per user."""
+    started = time.perf_counter()
+    profiles = 0
+    for user_id, ranked in run_digest(limit):
+        output.write(json.dumps({"user_id": user_id, "jobs": [
+            {"job_id": job_id, "score": score} for job_id, score, _ in ranked
+        ]}) + "\n")
+        profiles += 1
+    click.echo(f"Matched {profiles} profiles in {time.perf_counter() - started:.1f}s", err=True)
+
+
+def init_app(app):
+    app.extensions["matching"] = {
+        "vocabulary": {},
+        "vocabulary_max_id": None,
+        "lock": threading.Lock(),
+        # profile id -> ((updated_at, vocabulary version), skill ids, weights)
+        "profile_vectors": OrderedDict(),
+        "profile_vectors_size": app.config.get("PROFILE_VECTORS_CACHE_SIZE", 20000),
+        # (job_id, scope) -> (expires_at, (vocabulary version, *CANDIDATE_TABLES versions), ranked)
+        "candidates": OrderedDict(),
+        "cache_size": app.config.get("CANDIDATES_CACHE_SIZE", 512),
+        "cache_ttl": app.config.get("CANDIDATES_CACHE_TTL", 300),
+    }
+    app.cli.add_command(matching_cli)
+    models_committed.connect(_forget_profiles, sender=app, weak=False)
+    if not event.contains(db.session, "after_flush", _index_after_flush):
+        event.listen(db.session, "after_flush", _index_after_flush)
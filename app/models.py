@@ -29,6 +29,7 @@ class Employer(db.Model):
     contact_person = db.Column(db.String(120), nullable=False)
     password_hash = db.Column(db.String(128), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     user = db.relationship(
         "User",
         backref=db.backref("employer_profile", uselist=False, cascade="all, delete-orphan"),
@@ -40,6 +41,11 @@ class Employer(db.Model):
     # uselist=False means that there is a one-to-one relationship between User and Employer, 
     # so each user can only have one employer profile.
     
+    __table_args__ = (
+        db.Index("ix_employers_user_id", "user_id"),
+        db.Index("ix_employers_created_at_id", "created_at", "id"),
+    )
+
     def __repr__(self):
         return f'<Employer {self.name}>'#this is a string representation of the Employer object, 
                                        #which will be useful for debugging and logging purposes.
@@ -52,13 +58,34 @@ class Job(db.Model):
     location = db.Column(db.String(120), nullable=False)
     salary = db.Column(db.Float, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     employer_id = db.Column(db.Integer, db.ForeignKey('employers.id', ondelete='CASCADE'), nullable=False)
+    # "local" for postings made here; ingested postings carry their upstream
+    # source and id (see app/ingest.py).
+    source = db.Column(db.String(32), nullable=False, default="local", server_default="local")
+    external_id = db.Column(db.String(128), nullable=True)
+    external_url = db.Column(db.String(500), nullable=True)
+    content_hash = db.Column(db.String(40), nullable=True)
+    last_seen_at = db.Column(db.DateTime, nullable=True)
+    # Employer-supplied id for POST /jobs/bulk upserts, unique per employer.
+    reference = db.Column(db.String(128), nullable=True)
     employer = db.relationship(
         "Employer",
         backref=db.backref("jobs", lazy=True, cascade="all, delete-orphan"),
         passive_deletes=True
     )
     
+    __table_args__ = (
+        db.Index("uq_jobs_source_external_id", "source", "external_id", unique=True),
+        db.Index("ix_jobs_source_last_seen_at", "source", "last_seen_at"),
+        db.Index("uq_jobs_employer_id_reference", "employer_id", "reference", unique=True),
+        db.Index("ix_jobs_employer_id_created_at", "employer_id", "created_at", "id"),
+        db.Index("ix_jobs_created_at_id", "created_at", "id"),
+        db.Index("ix_jobs_lower_title_id", db.text("lower(title)"), "id"),
+        db.Index("ix_jobs_salary_id", "salary", "id"),
+        db.Index("ix_jobs_location", "location"),
+    )
+
     def __repr__(self):
         return f'<Job {self.title}>'
 
@@ -89,6 +116,7 @@ class Application(db.Model):
     cover_letter = db.Column(db.Text, nullable=True)
     status = db.Column(db.String(20), default='pending')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     user = db.relationship(
         "User",
         backref=db.backref("applications", lazy=True, cascade="all, delete-orphan"),
@@ -107,6 +135,9 @@ class Application(db.Model):
 
     __table_args__ = (
         db.UniqueConstraint("user_id", "job_id", name="uq_applications_user_job"),
+        db.Index("ix_applications_job_id_created_at", "job_id", "created_at", "id"),
+        db.Index("ix_applications_user_id_created_at", "user_id", "created_at", "id"),
+        db.Index("ix_applications_created_at_id", "created_at", "id"),
     )
 
 class Profile(db.Model):
@@ -123,12 +154,18 @@ class Profile(db.Model):
     last_position_end = db.Column(db.String(20), nullable=True)
     skills = db.Column(db.Text, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     user = db.relationship(
         "User",
         backref=db.backref("profile", uselist=False, cascade="all, delete-orphan"),
         passive_deletes=True
     )
     
+    __table_args__ = (
+        db.Index("ix_profiles_user_id", "user_id"),
+        db.Index("ix_profiles_created_at_id", "created_at", "id"),
+    )
+
     def __repr__(self):
         return f'<Profile {self.full_name}>'
 
@@ -138,6 +175,7 @@ class SavedJob(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     job_id = db.Column(db.Integer, db.ForeignKey('jobs.id', ondelete='CASCADE'), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     user = db.relationship(
         "User",
@@ -152,7 +190,120 @@ class SavedJob(db.Model):
 
     __table_args__ = (
         db.UniqueConstraint("user_id", "job_id", name="uq_saved_jobs_user_job"),
+        db.Index("ix_saved_jobs_job_id", "job_id"),
+        db.Index("ix_saved_jobs_user_id_created_at", "user_id", "created_at", "id"),
     )
 
     def __repr__(self):
         return f'<SavedJob {self.user_id} - Job {self.job_id}>'
+
+
+class TableVersion(db.Model):
+    # One row per API-visible table, bumped in the same transaction as any
+    # write to it. ETags and Last-Modified for list endpoints come from here.
+    __tablename__ = 'table_versions'
+    name = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f'<TableVersion {self.name} v{self.version}>'
+
+
+class Counter(db.Model):
+    # Running counts kept up to date by database triggers (see app/counters.py):
+    # "jobs" (locally posted only), "employers", "employer:<id>:jobs", "job:<id>:applications" and
+    # "user:<id>:saved_jobs".
+    __tablename__ = 'counters'
+    name = db.Column(db.String(64), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<Counter {self.name}={self.value}>'
+
+
+class JobSignature(db.Model):
+    # MinHash signature of a job's title + description (app/dedupe.py):
+    # NUM_PERM little-endian uint32 values packed into one blob.
+    __tablename__ = 'job_signatures'
+    job_id = db.Column(db.Integer, db.ForeignKey('jobs.id', ondelete='CASCADE'), primary_key=True)
+    minhash = db.Column(db.LargeBinary, nullable=False)
+
+    def __repr__(self):
+        return f'<JobSignature Job {self.job_id}>'
+
+
+class JobLSHBucket(db.Model):
+    # One row per (LSH band, bucket hash) a job's signature falls into; jobs
+    # sharing any bucket are near-duplicate candidates.
+    __tablename__ = 'job_lsh_buckets'
+    band = db.Column(db.SmallInteger, primary_key=True)
+    bucket = db.Column(db.BigInteger, primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('jobs.id', ondelete='CASCADE'), primary_key=True)
+
+    __table_args__ = (
+        db.Index("ix_job_lsh_buckets_job_id", "job_id"),
+    )
+
+    def __repr__(self):
+        return f'<JobLSHBucket {self.band}:{self.bucket} Job {self.job_id}>'
+
+
+class Skill(db.Model):
+    # Normalized skill names (app/matching.py), collected from profiles.
+    __tablename__ = 'skills'
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(64), nullable=False, unique=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<Skill {self.name}>'
+
+
+class JobSkill(db.Model):
+    # Posting list of the jobs whose title or description mentions a skill;
+    # weight is higher when the skill is in the title.
+    __tablename__ = 'job_skills'
+    skill_id = db.Column(db.Integer, db.ForeignKey('skills.id', ondelete='CASCADE'), primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('jobs.id', ondelete='CASCADE'), primary_key=True)
+    weight = db.Column(db.Float, nullable=False, default=1.0)
+
+    __table_args__ = (
+        db.Index("ix_job_skills_job_id", "job_id"),
+    )
+
+    def __repr__(self):
+        return f'<JobSkill {self.skill_id} Job {self.job_id}>'
+
+
+class ProfileSkill(db.Model):
+    # Posting list of the profiles listing a skill in Profile.skills,
+    # normalized (app/matching.py).
+    __tablename__ = 'profile_skills'
+    skill_id = db.Column(db.Integer, db.ForeignKey('skills.id', ondelete='CASCADE'), primary_key=True)
+    profile_id = db.Column(db.Integer, db.ForeignKey('profiles.id', ondelete='CASCADE'), primary_key=True)
+
+    __table_args__ = (
+        db.Index("ix_profile_skills_profile_id", "profile_id"),
+    )
+
+    def __repr__(self):
+        return f'<ProfileSkill {self.skill_id} Profile {self.profile_id}>'
+
+
+class RevokedToken(db.Model):
+    # JWT ids that must no longer be accepted (logout, rotated refresh tokens),
+    # kept until the token would have expired anyway; see app/tokens.py.
+    __tablename__ = 'revoked_tokens'
+    jti = db.Column(db.String(64), primary_key=True)
+    token_type = db.Column(db.String(10), nullable=False)
+    user_id = db.Column(db.Integer, nullable=True)
+    expires_at = db.Column(db.DateTime, nullable=False)
+    revoked_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index("ix_revoked_tokens_expires_at", "expires_at"),
+    )
+
+    def __repr__(self):
+        return f'<RevokedToken {self.jti}>'
@@ -0,0 +1,120 @@
+import base64
+import binascii
+import json
+from collections import namedtuple
+from datetime import datetime
+
+from flask import current_app, jsonify, request
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# limit is None for a legacy request (no limit/cursor while PAGINATION_LEGACY_ARRAYS
+# is on): those get the whole result as a bare JSON array, like before.
+Page = namedtuple("Page", ["limit", "after", "scope"])
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict) and "$dt" in value:
+        return datetime.fromisoformat(value["$dt"])
+    return value
+
+
+def encode_cursor(scope, values):
+    payload = json.dumps({"s": scope, "k": [_encode_value(v) for v in values]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, scope):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = [_decode_value(v) for v in payload["k"]]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        return None
+    # A cursor only makes sense for the ordering it was issued under.
+    if payload.get("s") != scope:
+        return None
+    return values
+
+
+def parse_page_args(scope):
+    """Read limit/cursor from the query string. Returns (Page, error)."""
+    raw_limit = request.args.get("limit")
+    cursor = request.args.get("cursor")
+    if raw_limit is None and not cursor and current_app.config.get("PAGINATION_LEGACY_ARRAYS", True):
+        return Page(None, None, scope), None
+
+    limit = DEFAULT_PAGE_SIZE
+    if raw_limit is not None:
+        try:
+            limit = int(raw_limit)
+        except ValueError:
+            return None, "Invalid limit"
+        if limit < 1:
+            return None, "Invalid limit"
+        limit = min(limit, MAX_PAGE_SIZE)
+
+    after = None
+    if cursor:
+        after = decode_cursor(cursor, scope)
+        if after is None:
+            return None, "Invalid cursor"
+    return Page(limit, after, scope), None
+
+
+def keyset_filter(keys, values):
+    # (k1, k2, ...) > (v1, v2, ...) written out as OR-ed prefixes, which SQLite
+    # can drive from an index on the leading key.
+    clauses = []
+    for i, (key, value) in enumerate(zip(keys, values)):
+        equal_prefix = [k == v for k, v in zip(keys[:i], values[:i])]
+        clauses.append(and_(*equal_prefix, key > value))
+    return or_(*clauses)
+
+
+def paginate(query, keys, key_of, page):
+    """Order `query` by `keys` (ascending) and return (rows, next_cursor).
+
+    `key_of(row)` must return the values of `keys` for a result row; they are
+    what the next cursor is built from.
+    """
+    query = query.order_by(*keys)
+    if page.limit is None:
+        return query.all(), None
+    if page.after is not None:
+        if len(page.after) != len(keys):
+            return [], None
+        query = query.filter(keyset_filter(keys, page.after))
+    rows = query.limit(page.limit + 1).all()
+    if len(rows) <= page.limit:
+        return rows, None
+    rows = rows[:page.limit]
+    return rows, encode_cursor(page.scope, key_of(rows[-1]))
+
+
+def paginate_sorted(items, key_of, page):
+    # Same contract as paginate() for results that can only be ordered in Python.
+    items = sorted(items, key=key_of)
+    if page.limit is None:
+        return items, None
+    if page.after is not None:
+        after = tuple(page.after)
+        items = [i for i in items if tuple(key_of(i)) > after]
+    if len(items) <= page.limit:
+        return items, None
+    items = items[:page.limit]
+    return items, encode_cursor(page.scope, key_of(items[-1]))
+
+
+def page_response(page, items, next_cursor=None):
+    if page.limit is None:
+        return jsonify(items)
+    return jsonify({"items": items, "next_cursor": next_cursor})
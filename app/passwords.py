@@ -0,0 +1,124 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+# Password hashing is deliberately slow (scrypt/pbkdf2), so it runs in a small
+# pool of worker processes instead of on the request thread: a burst of logins
+# then queues behind PASSWORD_HASH_WORKERS processes rather than tying up every
+# server worker. At most PASSWORD_HASH_QUEUE calls may wait; beyond that
+# HashingBusy is raised and the auth routes answer 429.
+#
+# Hashes record the method they were made with ("scrypt:32768:8:1$salt$..."),
+# so ones made with other parameters than PASSWORD_HASH_METHOD are replaced
+# at the user's next successful login.
+
+
+class HashingBusy(Exception):
+    pass
+
+
+class PasswordHasher:
+    def __init__(self, method="scrypt", workers=2, queue_size=16, timeout=30):
+        self.method = method
+        self.workers = workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(workers + queue_size) if workers else None
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._prefix = None
+
+    def _pool(self):
+        # Created on first use in each server process (never inherited
+        # across a fork); "spawn" keeps the app's threads out of the workers.
+        if self._executor is None or self._pid != os.getpid():
+            with self._lock:
+                if self._executor is None or self._pid != os.getpid():
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                    )
+                    self._pid = os.getpid()
+        return self._executor
+
+    def _run(self, fn, *args):
+        if not self.workers:
+            return fn(*args)
+        if not self._slots.acquire(blocking=False):
+            raise HashingBusy()
+        executor = self._pool()
+        try:
+            future = executor.submit(fn, *args)
+        except BrokenProcessPool:
+            self._slots.release()
+            self._discard(executor)
+            raise HashingBusy()
+        except BaseException:
+            self._slots.release()
+            raise
+        # The slot is held until the task itself finishes, so calls that time
+        # out can't pile more work onto workers still busy with theirs.
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            raise HashingBusy()
+        except BrokenProcessPool:
+            # A worker died (OOM kill, crash); the next call starts a new pool.
+            self._discard(executor)
+            raise HashingBusy()
+
+    def _discard(self, executor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, stored_hash, password):
+        return bool(stored_hash) and self._run(check_password_hash, stored_hash, password)
+
+    def needs_rehash(self, stored_hash):
+        if self._prefix is None:
+            # werkzeug fills in defaults ("scrypt" -> "scrypt:32768:8:1").
+            self._prefix = generate_password_hash("", self.method).split("$", 1)[0]
+        return stored_hash.split("$", 1)[0] != self._prefix
+
+
+def get_hasher():
+    return current_app.extensions["passwords"]
+
+
+def hash_password(password):
+    """Hash with PASSWORD_HASH_METHOD in the pool. Raises HashingBusy."""
+    return get_hasher().hash(password)
+
+
+def verify_password(user, password):
+    """Check `password` against `user.password_hash`, upgrading the stored
+    hash to PASSWORD_HASH_METHOD when it matches (caller commits). Raises
+    HashingBusy."""
+    hasher = get_hasher()
+    if not hasher.verify(user.password_hash, password):
+        return False
+    if hasher.needs_rehash(user.password_hash):
+        try:
+            user.password_hash = hasher.hash(password)
+        except HashingBusy:
+            pass  # upgraded at a later login
+    return True
+
+
+def init_app(app):
+    app.extensions["passwords"] = PasswordHasher(
+        app.config.get("PASSWORD_HASH_METHOD", "scrypt"),
+        workers=app.config.get("PASSWORD_HASH_WORKERS", 2),
+        queue_size=app.config.get("PASSWORD_HASH_QUEUE", 16),
+        timeout=app.config.get("PASSWORD_HASH_TIMEOUT", 30),
+    )
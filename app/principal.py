@@ -0,0 +1,112 @@
+from datetime import timedelta
+
+from flask import current_app, g
+from flask_jwt_extended import get_jwt, get_jwt_identity
+
+from .caching import TTLCache
+from .extensions import db
+from .models import Employer, User
+
+
+class Principal:
+    """The caller of the current request: user id, role and employer id.
+
+    Routes only need these three values for their authorization checks, so
+    the full User row is loaded lazily through `.user` when a handler needs it.
+    """
+
+    __slots__ = ("id", "role", "employer_id", "_user")
+
+    def __init__(self, id, role, employer_id=None):
+        self.id = id
+        self.role = role
+        self.employer_id = employer_id
+        self._user = None
+
+    @property
+    def user(self):
+        if self._user is None:
+            self._user = db.session.get(User, self.id)
+        return self._user
+
+    def __repr__(self):
+        return f"<Principal {self.id} {self.role} employer={self.employer_id}>"
+
+
+def init_app(app):
+    ttl = app.config.get("PRINCIPAL_CACHE_TTL", 30)
+    size = app.config.get("PRINCIPAL_CACHE_SIZE", 1024)
+    expires = app.config.get("JWT_ACCESS_TOKEN_EXPIRES", timedelta(minutes=15))
+    token_lifetime = expires.total_seconds() if isinstance(expires, timedelta) else 365 * 24 * 3600
+    app.extensions["principals"] = {
+        "cache": TTLCache(maxsize=size, ttl=ttl),
+        # Users whose signed claims are out of date (deleted, role or employer
+        # changed). Kept for a token lifetime, after which old tokens are dead.
+        "stale": TTLCache(maxsize=size, ttl=token_lifetime),
+    }
+
+
+def principal_claims(user):
+    """Extra JWT claims that let later requests skip the principal lookup."""
+    employer = user.employer_profile
+    return {"role": user.role, "employer_id": employer.id if employer else None}
+
+
+def _from_claims(user_id, stale):
+    if not current_app.config.get("PRINCIPAL_TRUST_CLAIMS"):
+        return None
+    if user_id in stale:
+        return None
+    claims = get_jwt()
+    role = claims.get("role")
+    employer_id = claims.get("employer_id")
+    if role is None or (role == "employer" and employer_id is None):
+        # Employers can create their company profile after logging in.
+        return None
+    return Principal(user_id, role, employer_id)
+
+
+def _load(user_id):
+    row = (
+        db.session.query(User.id, User.role, Employer.id)
+        .outerjoin(Employer, Employer.user_id == User.id)
+        .filter(User.id == user_id)
+        .first()
+    )
+    if row is None:
+        return None
+    return Principal(row[0], row[1], row[2])
+
+
+def current_principal():
+    """Return the Principal for the JWT on this request, or None if the user is gone.
+
+    Resolved at most once per request; signed claims and a short-lived
+    process cache usually avoid the database entirely.
+    """
+    if "principal" in g:
+        return g.principal
+
+    state = current_app.extensions["principals"]
+    user_id = int(get_jwt_identity())
+    principal = _from_claims(user_id, state["stale"])
+    if principal is None:
+        # The cache holds plain tuples so no ORM state leaks between requests.
+        cached = state["cache"].get(user_id)
+        if cached is not None:
+            principal = Principal(*cached)
+    if principal is None:
+        principal = _load(user_id)
+        if principal is not None:
+            state["cache"].set(user_id, (principal.id, principal.role, principal.employer_id))
+    g.principal = principal
+    return principal
+
+
+def invalidate_principal(user_id):
+    # Call after deleting a user or changing their role/employer profile.
+    state = current_app.extensions["principals"]
+    state["cache"].pop(user_id)
+    state["stale"].set(user_id, True)
+    if g.get("principal") is not None and g.principal.id == user_id:
+        g.pop("principal")
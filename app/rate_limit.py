@@ -0,0 +1,202 @@
+import hashlib
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from functools import wraps
+
+from flask import current_app, jsonify, request
+from flask_jwt_extended import get_jwt_identity
+
+try:
+    import fcntl
+except ImportError:  # Windows: only the per-process backend is available
+    fcntl = None
+
+# Request rate limits using GCRA (a token bucket stored as one timestamp per
+# key): a limit of "N/minute" lets a client burst N requests, then one more
+# every 60/N seconds. A limit is declared per route with @rate_limit or for a
+# whole blueprint with limit_blueprint(), naming the config key holding its
+# rate and what to key it on ("ip", "identity" or "email").
+#
+# The "shared" backend keeps every key's timestamp in a memory-mapped file of
+# fixed-size slots, so all workers on the host share one budget; a check
+# locks only the few slots the key can live in (fcntl byte-range lock).
+# Expired slots are reused freely; if all of a key's slots are busy the one
+# closest to expiring is taken over, which can only make a limit more lenient.
+UNITS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+def parse_rate(text):
+    """"N/unit" -> (emission interval, burst tolerance) in seconds, or None
+    for "off"/empty."""
+    text = (text or "").strip().lower()
+    if text in {"", "off", "none"}:
+        return None
+    count, _, unit = text.partition("/")
+    period = UNITS.get(unit.strip().rstrip("s"))
+    if period is None or not count.strip().isdigit() or int(count) < 1:
+        raise ValueError(f"Invalid rate {text!r}")
+    return period / int(count), float(period)
+
+
+class MemoryBackend:
+    """Per-process store; each worker enforces its own copy of a limit."""
+
+    def __init__(self, max_keys=65536):
+        self.max_keys = max_keys
+        self._tats = {}
+        self._lock = threading.Lock()
+
+    def hit(self, key, interval, tolerance, now):
+        with self._lock:
+            tat = max(self._tats.get(key, 0.0), now) + interval
+            if tat - now > tolerance:
+                return tat - tolerance - now
+            self._tats[key] = tat
+            if len(self._tats) > self.max_keys:
+                self._tats = {k: v for k, v in self._tats.items() if v > now}
+                while len(self._tats) > self.max_keys:
+                    del self._tats[next(iter(self._tats))]
+            return 0.0
+
+
+class SharedBackend:
+    """Slots of (key fingerprint, theoretical arrival time) in a file mapped
+    by every worker."""
+
+    SLOT = struct.Struct("<Qd")
+    PROBES = 4
+
+    def __init__(self, path, slots=65536):
+        self.slots = max(slots, self.PROBES)
+        size = self.slots * self.SLOT.size
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(self._fd).st_size < size:
+            os.ftruncate(self._fd, size)
+        self._map = mmap.mmap(self._fd, size)
+        # fcntl locks are per process, so threads also need this one.
+        self._lock = threading.Lock()
+
+    def hit(self, key, interval, tolerance, now):
+        fingerprint = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little") or 1
+        start = min(fingerprint % self.slots, self.slots - self.PROBES)
+        offset, length = start * self.SLOT.size, self.PROBES * self.SLOT.size
+        with self._lock:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, length, offset)
+            try:
+                slot, stored, free, oldest = None, 0.0, None, None
+                for i in range(start, start + self.PROBES):
+                    other, tat = self.SLOT.unpack_from(self._map, i * self.SLOT.size)
+                    if other == fingerprint:
+                        slot, stored = i, tat
+                        break
+                    if tat <= now:
+                        free = i if free is None else free
+                    elif oldest is None or tat < oldest[1]:
+                        oldest = (i, tat)
+                if slot is None:
+                    slot = free if free is not None else oldest[0]
+                tat = max(stored, now) + interval
+                if tat - now > tolerance:
+                    return tat - tolerance - now
+                self.SLOT.pack_into(self._map, slot * self.SLOT.size, fingerprint, tat)
+                return 0.0
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, length, offset)
+
+
+class RateLimiter:
+    def __init__(self, backend):
+        self.backend = backend
+        self._rates = {}
+        self.limited = 0
+
+    def rate(self, config_key):
+        if config_key not in self._rates:
+            self._rates[config_key] = parse_rate(current_app.config.get(config_key))
+        return self._rates[config_key]
+
+    def hit(self, config_key, client):
+        """Seconds until `client` may retry, or 0 if this request is allowed."""
+        rate = self.rate(config_key)
+        if rate is None:
+            return 0.0
+        retry_after = self.backend.hit(f"{config_key}:{client}", rate[0], rate[1], time.time())
+        if retry_after:
+            self.limited += 1
+        return retry_after
+
+
+def too_many_requests(retry_after=1):
+    response = jsonify({"error": "Too many requests, try again shortly"})
+    response.headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+    return response, 429
+
+
+def _client(key):
+    if key == "identity":
+        try:
+            identity = get_jwt_identity()
+        except RuntimeError:  # not behind @jwt_required
+            identity = None
+        if identity is not None:
+            return f"user:{identity}"
+    elif key == "email":
+        data = request.get_json(silent=True)
+        email = data.get("email") if isinstance(data, dict) else None
+        # Without an email the route rejects the request anyway.
+        return f"email:{email.strip().lower()}" if isinstance(email, str) and email.strip() else None
+    return f"ip:{request.remote_addr}"
+
+
+def check(config_key, key="ip"):
+    """None if the request may proceed, else a 429 response."""
+    limiter = current_app.extensions.get("rate_limit")
+    if limiter is None:
+        return None
+    client = _client(key)
+    if client is None:
+        return None
+    retry_after = limiter.hit(config_key, client)
+    return too_many_requests(retry_after) if retry_after else None
+
+
+def rate_limit(config_key, key="ip"):
+    """Limit a view to the rate in app.config[config_key], per `key`. Put it
+    below @jwt_required when keying on "identity"."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            limited = check(config_key, key)
+            if limited is not None:
+                return limited
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def limit_blueprint(blueprint, config_key, key="ip"):
+    """Apply one limit to every route of `blueprint`."""
+    blueprint.before_request(lambda: check(config_key, key))
+
+
+def init_app(app):
+    backend_name = app.config.get("RATE_LIMIT_BACKEND", "shared")
+    if backend_name == "off":
+        app.extensions["rate_limit"] = None
+        return
+    if backend_name == "shared" and fcntl is None:
+        app.logger.warning("RATE_LIMIT_BACKEND=shared needs fcntl; limiting per worker instead")
+        backend_name = "memory"
+    slots = app.config.get("RATE_LIMIT_SLOTS", 65536)
+    if backend_name == "shared":
+        path = app.config.get("RATE_LIMIT_PATH") or os.path.join(app.instance_path, "rate_limits.bin")
+        backend = SharedBackend(path, slots=slots)
+    elif backend_name == "memory":
+        backend = MemoryBackend(max_keys=slots)
+    else:
+        raise ValueError(f"Unknown RATE_LIMIT_BACKEND {backend_name!r}")
+    app.extensions["rate_limit"] = RateLimiter(backend)
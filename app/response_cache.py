@@ -0,0 +1,277 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app
+
+from .changes import models_committed
+
+
+class MemoryBackend:
+    """Per-process LRU store with a TTL, an entry cap and a byte budget."""
+
+    def __init__(self, max_entries=2048, max_bytes=32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (body, expires_at, tags)
+        self._tags = {}  # tag -> set of keys
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.time():
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key, body, tags, ttl):
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (body, time.time() + ttl, tuple(tags))
+            self._bytes += len(body)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                self._drop(next(iter(self._entries)))
+
+    def invalidate(self, tags):
+        with self._lock:
+            for tag in tags:
+                for key in self._tags.pop(tag, ()):
+                    self._drop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self._bytes = 0
+
+    def size(self):
+        with self._lock:
+            return len(self._entries), self._bytes
+
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= len(entry[0])
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class SQLiteBackend:
+    """Store shared by every worker on the host, kept in its own SQLite file.
+
+    Reads never write, so eviction is by expiry and then oldest-stored first
+    rather than strict LRU.
+    """
+
+    SCHEMA = [
+        "CREATE TABLE IF NOT EXISTS cache_entries ("
+        "key TEXT PRIMARY KEY, body BLOB NOT NULL, size INTEGER NOT NULL, "
+        "expires_at REAL NOT NULL, stored_at REAL NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS ix_cache_entries_stored_at ON cache_entries (stored_at)",
+        "CREATE TABLE IF NOT EXISTS cache_tags (tag TEXT NOT NULL, key TEXT NOT NULL, PRIMARY KEY (tag, key))",
+        "CREATE INDEX IF NOT EXISTS ix_cache_tags_key ON cache_tags (key)",
+    ]
+
+    def __init__(self, path, max_entries=2048, max_bytes=32 * 1024 * 1024):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        conn = self._conn()
+        with conn:
+            for statement in self.SCHEMA:
+                conn.execute(statement)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = self._conn().execute(
+            "SELECT body FROM cache_entries WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key, body, tags, ttl):
+        if len(body) > self.max_bytes:
+            return
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM cache_tags WHERE key = ?", (key,))
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, body, size, expires_at, stored_at) VALUES (?, ?, ?, ?, ?)",
+                (key, body, len(body), now + ttl, now),
+            )
+            conn.executemany("INSERT OR IGNORE INTO cache_tags (tag, key) VALUES (?, ?)", [(t, key) for t in tags])
+            self._evict(conn, now)
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+
+    def _evict(self, conn, now):
+        conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,))
+        count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries").fetchone()
+        if count > self.max_entries or total > self.max_bytes:
+            overflow_rows = conn.execute(
+                "SELECT key, size FROM cache_entries ORDER BY stored_at"
+            )
+            doomed = []
+            for key, size in overflow_rows:
+                if count <= self.max_entries and total <= self.max_bytes:
+                    break
+                doomed.append((key,))
+                count -= 1
+                total -= size
+            conn.executemany("DELETE FROM cache_entries WHERE key = ?", doomed)
+        conn.execute("DELETE FROM cache_tags WHERE key NOT IN (SELECT key FROM cache_entries)")
+
+    def invalidate(self, tags):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for tag in tags:
+                conn.execute(
+                    "DELETE FROM cache_entries WHERE key IN (SELECT key FROM cache_tags WHERE tag = ?)", (tag,)
+                )
+                conn.execute("DELETE FROM cache_tags WHERE tag = ?", (tag,))
+            conn.execute("COMMIT")
+        except sqlite3.Error as exc:
+            conn.execute("ROLLBACK")
+            # The write already committed; entries left behind expire after the TTL.
+            current_app.logger.error("Response cache invalidation failed for %s: %s", tags, exc)
+
+    def clear(self):
+        conn = self._conn()
+        conn.execute("DELETE FROM cache_entries")
+        conn.execute("DELETE FROM cache_tags")
+
+    def size(self):
+        return self._conn().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries").fetchone()
+
+
+class ResponseCache:
+    """Serialized JSON response bodies keyed on normalized request parameters."""
+
+    def __init__(self, backend, ttl):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(namespace, params):
+        raw = json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+        return f"{namespace}:{hashlib.sha1(raw.encode()).hexdigest()}"
+
+    def get(self, key):
+        body = self.backend.get(key)
+        if body is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return body
+
+    def set(self, key, body, tags):
+        self.backend.set(key, body, tags, self.ttl)
+
+    def invalidate(self, *tags):
+        self.invalidations += 1
+        self.backend.invalidate(tags)
+
+    def stats(self):
+        entries, size = self.backend.size()
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "invalidations": self.invalidations,
+            "entries": entries,
+            "bytes": size,
+        }
+
+
+def get_cache():
+    return current_app.extensions.get("response_cache")
+
+
+def job_listing_tags(employer_id=None, counts=False):
+    # Candidates and admins see every job; employers only their own.
+    tags = ["jobs:all"] if employer_id is None else [f"jobs:employer:{employer_id}"]
+    if counts:
+        # Listings with applicant counts also go stale when someone applies.
+        tags.append("jobs:counts")
+    return tags
+
+
+def _job_tags_for_changes(changes):
+    tags = set()
+    for change in changes:
+        if change.model == "Job":
+            tags.add("jobs:all")
+            for values in (change.values, change.previous):
+                if values.get("employer_id") is not None:
+                    tags.add(f"jobs:employer:{values['employer_id']}")
+        elif change.model == "Employer" and change.op == "delete":
+            tags.update(["jobs:all", f"jobs:employer:{change.id}"])
+        elif change.model == "User" and change.op == "delete":
+            # A deleted employer account takes its jobs with it (ON DELETE CASCADE).
+            tags.update(["jobs:all", "jobs:counts"])
+        elif change.model == "Application" and (change.op != "update" or "job_id" in change.previous):
+            tags.add("jobs:counts")
+    return tags
+
+
+def _invalidate_on_commit(app, changes, **extra):
+    cache = app.extensions.get("response_cache")
+    if cache is None:
+        return
+    tags = _job_tags_for_changes(changes)
+    if tags:
+        cache.invalidate(*sorted(tags))
+
+
+def init_app(app):
+    backend_name = app.config.get("RESPONSE_CACHE_BACKEND", "memory")
+    if backend_name == "off":
+        app.extensions["response_cache"] = None
+        return
+    max_entries = app.config.get("RESPONSE_CACHE_MAX_ENTRIES", 2048)
+    max_bytes = app.config.get("RESPONSE_CACHE_MAX_BYTES", 32 * 1024 * 1024)
+    if backend_name == "sqlite":
+        path = app.config.get("RESPONSE_CACHE_PATH") or os.path.join(app.instance_path, "response_cache.db")
+        backend = SQLiteBackend(path, max_entries=max_entries, max_bytes=max_bytes)
+    elif backend_name == "memory":
+        backend = MemoryBackend(max_entries=max_entries, max_bytes=max_bytes)
+    else:
+        raise ValueError(f"Unknown RESPONSE_CACHE_BACKEND {backend_name!r}")
+    app.extensions["response_cache"] = ResponseCache(backend, ttl=app.config.get("RESPONSE_CACHE_TTL", 60))
+    models_committed.connect(_invalidate_on_commit, sender=app, weak=False)
@@ -6,6 +6,8 @@ from .employers import employers_bp
 from .users import users_bp
 from .adzuna import adzuna_bp
 from .saved_jobs import saved_jobs_bp
+from .federated import federated_bp
+from .exports import export_bp
 
 __all__ = [
     "auth_bp",
@@ -16,4 +18,6 @@ __all__ = [
     "users_bp",
     "adzuna_bp",
     "saved_jobs_bp",
+    "federated_bp",
+    "export_bp",
 ]
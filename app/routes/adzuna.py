@@ -1,19 +1,26 @@
+import json
 import os
-import requests
-from flask import Blueprint, request, jsonify
+import re
+from flask import Blueprint, current_app, request, jsonify
+from ..adzuna_client import AdzunaError, get_client
+from ..rate_limit import limit_blueprint
 
 adzuna_bp = Blueprint("adzuna", __name__)
+# Every call can spend upstream API quota.
+limit_blueprint(adzuna_bp, "RATE_LIMIT_ADZUNA")
 
+_COUNTRY_RE = re.compile(r"^[a-z]{2}$")
 
-@adzuna_bp.route("/search", methods=["GET"])
-def search_adzuna():
+
+def _credentials():
     app_id = os.getenv("ADZUNA_APP_ID")
     app_key = os.getenv("ADZUNA_APP_KEY")
     if not app_id or not app_key:
-        return jsonify({"error": "Adzuna API credentials are not configured"}), 500
+        return None
+    return {"app_id": app_id, "app_key": app_key}
 
-    country = request.args.get("country", os.getenv("ADZUNA_COUNTRY", "us")).lower()
-    page = request.args.get("page", default=1, type=int)
+
+def _search_params():
     query = request.args.get("query", type=str, default="").strip()
     location = request.args.get("location", type=str, default="").strip()
     salary_min = request.args.get("salary_min", type=int)
@@ -21,11 +28,7 @@ def search_adzuna():
     results_per_page = request.args.get("results_per_page", default=20, type=int)
     sort_by = request.args.get("sort_by", type=str, default="").strip()
 
-    params = {
-        "app_id": app_id,
-        "app_key": app_key,
-        "results_per_page": results_per_page,
-    }
+    params = {"results_per_page": results_per_page}
     if query:
         params["what"] = query
     if location:
@@ -36,15 +39,81 @@ def search_adzuna():
         params["salary_max"] = salary_max
     if sort_by:
         params["sort_by"] = sort_by
+    return params
+
 
-    url = f"https://api.adzuna.com/v1/api/jobs/{country}/search/{page}"
+@adzuna_bp.route("/search", methods=["GET"])
+def search_adzuna():
+    credentials = _credentials()
+    if not credentials:
+        return jsonify({"error": "Adzuna API credentials are not configured"}), 500
+
+    country = request.args.get("country", os.getenv("ADZUNA_COUNTRY", "us")).lower()
+    page = request.args.get("page", default=1, type=int)
 
     try:
-        res = requests.get(url, params=params, timeout=15)
-    except requests.RequestException as exc:
-        return jsonify({"error": "Failed to reach Adzuna API", "detail": str(exc)}), 502
+        payload, outcome = get_client().search(country, page, _search_params(), credentials)
+    except AdzunaError as exc:
+        body = {"error": exc.error}
+        if exc.detail is not None:
+            body["detail"] = exc.detail
+        return jsonify(body), exc.status
+
+    response = jsonify(payload)
+    response.headers["X-Cache"] = outcome
+    return response, 200
+
+
+@adzuna_bp.route("/search/bulk", methods=["GET"])
+def search_adzuna_bulk():
+    """Pages 1..`pages` for each of `countries`, fetched concurrently and
+    streamed as NDJSON as each page arrives.
+
+    One line per page ({"type": "page", ...} with only results not already
+    sent, or {"type": "error", ...}), then a final {"type": "done", ...}.
+    """
+    credentials = _credentials()
+    if not credentials:
+        return jsonify({"error": "Adzuna API credentials are not configured"}), 500
+
+    raw_countries = request.args.get("countries") or request.args.get("country") or os.getenv("ADZUNA_COUNTRY", "us")
+    countries = list(dict.fromkeys(c.strip().lower() for c in raw_countries.split(",") if c.strip()))
+    if not countries or any(not _COUNTRY_RE.match(c) for c in countries):
+        return jsonify({"error": "Invalid country"}), 400
+    pages = request.args.get("pages", default=5, type=int)
+    if pages is None or pages < 1:
+        return jsonify({"error": "Invalid pages"}), 400
+    max_pages = current_app.config.get("ADZUNA_BULK_MAX_PAGES", 10)
+    if pages * len(countries) > max_pages:
+        return jsonify({"error": f"At most {max_pages} pages per request"}), 400
+
+    params = _search_params()
+    searches = [(country, page, params) for country in countries for page in range(1, pages + 1)]
+    client = get_client()
 
-    if not res.ok:
-        return jsonify({"error": "Adzuna API error", "detail": res.text}), res.status_code
+    def generate():
+        seen = set()
+        sent = errors = 0
+        for country, page, payload, outcome, error in client.search_many(searches, credentials):
+            if error is not None:
+                errors += 1
+                line = {"type": "error", "country": country, "page": page,
+                        "status": error.status, "error": error.error}
+            else:
+                results = []
+                for result in payload.get("results") or []:
+                    key = result.get("id") or result.get("redirect_url")
+                    if key is not None and key in seen:
+                        continue
+                    seen.add(key)
+                    results.append(result)
+                sent += len(results)
+                line = {"type": "page", "country": country, "page": page, "cache": outcome,
+                        "count": payload.get("count"), "results": results}
+            yield json.dumps(line) + "\n"
+        yield json.dumps({"type": "done", "pages": len(searches), "results": sent, "errors": errors}) + "\n"
 
-    return jsonify(res.json()), 200
+    response = current_app.response_class(generate(), mimetype="application/x-ndjson")
+    # Let each line through reverse proxies as soon as it is written.
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
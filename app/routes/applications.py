@@ -1,7 +1,11 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from ..extensions import db
-from ..models import Application, ApplicationForm, Job, User, Employer
+from ..models import Application, ApplicationForm, Job
+from ..principal import current_principal
+from ..conditional import conditional
+from ..pagination import page_response, paginate, parse_page_args
+from sqlalchemy import exists
 from sqlalchemy.exc import IntegrityError
 
 applications_bp = Blueprint("applications", __name__)
@@ -22,25 +26,46 @@ def _application_to_dict(application):
     }
 
 
+def _employer_owns_job(employer_id, job_id):
+    # Primary-key EXISTS probe instead of loading every job the employer posted.
+    if not employer_id:
+        return False
+    return db.session.query(
+        exists().where(Job.id == job_id, Job.employer_id == employer_id)
+    ).scalar()
+
+
 @applications_bp.route("/", methods=["GET"])
 @jwt_required()
+@conditional("applications", "jobs")
 def list_applications():
-    user = User.query.get(int(get_jwt_identity()))
+    user = current_principal()
     if not user:
         return jsonify({"error": "Unauthorized"}), 401
+    page, err = parse_page_args("applications")
+    if err:
+        return jsonify({"error": err}), 400
     if user.role == "user":
-        applications = Application.query.filter_by(user_id=user.id).all()
+        applications_query = Application.query.filter_by(user_id=user.id)
     elif user.role == "employer":
-        employer = Employer.query.filter_by(user_id=user.id).first()
-        if not employer:
-            return jsonify([]), 200
-        job_ids = [j.id for j in Job.query.filter_by(employer_id=employer.id).all()]
-        applications = Application.query.filter(Application.job_id.in_(job_ids)).all()
+        if not user.employer_id:
+            return page_response(page, []), 200
+        applications_query = (
+            Application.query
+            .join(Job, Job.id == Application.job_id)
+            .filter(Job.employer_id == user.employer_id)
+        )
     elif user.role == "admin":
-        applications = Application.query.all()
+        applications_query = Application.query
     else:
         return jsonify({"error": "Forbidden"}), 403
-    return jsonify([_application_to_dict(a) for a in applications]), 200
+    applications, next_cursor = paginate(
+        applications_query,
+        [Application.created_at, Application.id],
+        lambda a: (a.created_at, a.id),
+        page,
+    )
+    return page_response(page, [_application_to_dict(a) for a in applications], next_cursor), 200
 
 
 @applications_bp.route("/", methods=["POST"])
@@ -54,7 +79,7 @@ def create_application():
     if any(k not in data or data.get(k) in (None, "") for k in required):
         return jsonify({"error": "Missing fields"}), 400
 
-    user = User.query.get(int(get_jwt_identity()))
+    user = current_principal()
     if not user:
         return jsonify({"error": "Unauthorized"}), 401
     if user.role != "user":
@@ -94,17 +119,13 @@ def get_application(application_id):
     application = Application.query.get(application_id)
     if not application:
         return jsonify({"error": "Not found"}), 404
-    user = User.query.get(int(get_jwt_identity()))
+    user = current_principal()
     if not user:
         return jsonify({"error": "Unauthorized"}), 401
     if user.role == "user" and application.user_id != user.id:
         return jsonify({"error": "Forbidden"}), 403
     if user.role == "employer":
-        employer = Employer.query.filter_by(user_id=user.id).first()
-        if not employer:
-            return jsonify({"error": "Forbidden"}), 403
-        job_ids = [j.id for j in Job.query.filter_by(employer_id=employer.id).all()]
-        if application.job_id not in job_ids:
+        if not _employer_owns_job(user.employer_id, application.job_id):
             return jsonify({"error": "Forbidden"}), 403
     if user.role not in {"user", "employer", "admin"}:
         return jsonify({"error": "Forbidden"}), 403
@@ -117,15 +138,11 @@ def update_application(application_id):
     application = Application.query.get(application_id)
     if not application:
         return jsonify({"error": "Not found"}), 404
-    user = User.query.get(int(get_jwt_identity()))
+    user = current_principal()
     if not user:
         return jsonify({"error": "Unauthorized"}), 401
     if user.role == "employer":
-        employer = Employer.query.filter_by(user_id=user.id).first()
-        if not employer:
-            return jsonify({"error": "Forbidden"}), 403
-        job_ids = [j.id for j in Job.query.filter_by(employer_id=employer.id).all()]
-        if application.job_id not in job_ids:
+        if not _employer_owns_job(user.employer_id, application.job_id):
             return jsonify({"error": "Forbidden"}), 403
     elif user.role != "admin":
         return jsonify({"error": "Forbidden"}), 403
@@ -150,7 +167,7 @@ def delete_application(application_id):
     application = Application.query.get(application_id)
     if not application:
         return jsonify({"error": "Not found"}), 404
-    user = User.query.get(int(get_jwt_identity()))
+    user = current_principal()
     if not user:
         return jsonify({"error": "Unauthorized"}), 401
     if user.role != "admin":
@@ -163,7 +180,7 @@ def delete_application(application_id):
 @applications_bp.route("/form/<int:job_id>", methods=["GET"])
 @jwt_required()
 def get_application_form(job_id):
-    user = User.query.get(int(get_jwt_identity()))
+    user = current_principal()
     if not user:
         return jsonify({"error": "Unauthorized"}), 401
     job = Job.query.get(job_id)
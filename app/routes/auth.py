@@ -1,9 +1,13 @@
 from flask import Blueprint, request, jsonify
-from werkzeug.security import generate_password_hash, check_password_hash
-from flask_jwt_extended import create_access_token
+from flask_jwt_extended import decode_token, get_jwt, get_jwt_identity, jwt_required
+from jwt.exceptions import PyJWTError
 
 from ..extensions import db
 from ..models import User, Employer
+from ..passwords import HashingBusy, hash_password, verify_password
+from ..principal import invalidate_principal
+from ..rate_limit import rate_limit, too_many_requests
+from ..tokens import get_denylist, issue_tokens
 from sqlalchemy.exc import IntegrityError
 import os
 from ..schemas import UserSchema
@@ -11,8 +15,14 @@ from ..schemas import UserSchema
 auth_bp = Blueprint("auth", __name__)
 
 
+def _busy():
+    # The password hashing pool is saturated; ask the client to back off.
+    return too_many_requests(1)
+
+
 # REGISTER
 @auth_bp.route("/register", methods=["POST"])
+@rate_limit("RATE_LIMIT_REGISTER")
 def register():
     data = request.get_json()
     if not data:
@@ -40,7 +50,10 @@ def register():
     if existing:
         return jsonify({"error": "Email already exists"}), 400
 
-    hashed = generate_password_hash(password)
+    try:
+        hashed = hash_password(password)
+    except HashingBusy:
+        return _busy()
 
     user = User()
     user.username = username
@@ -77,6 +90,8 @@ def register():
 
 # LOGIN
 @auth_bp.route("/login", methods=["POST"])
+@rate_limit("RATE_LIMIT_LOGIN")
+@rate_limit("RATE_LIMIT_LOGIN_ACCOUNT", key="email")
 def login():
     data = request.get_json()
     if not data:
@@ -92,13 +107,15 @@ def login():
 
     user = User.query.filter_by(email=email).first()
 
-    if not user or not check_password_hash(user.password_hash, password):
-        return jsonify({"error": "Invalid credentials"}), 401
-
-    token = create_access_token(identity=str(user.id))
+    try:
+        if not user or not verify_password(user, password):
+            return jsonify({"error": "Invalid credentials"}), 401
+    except HashingBusy:
+        return _busy()
+    db.session.commit()
 
     return jsonify({
-        "token": token,
+        **issue_tokens(user),
         "user_id": user.id,
         "role": user.role
     })
@@ -106,6 +123,8 @@ def login():
 
 # ADMIN LOGIN
 @auth_bp.route("/admin-login", methods=["POST"])
+@rate_limit("RATE_LIMIT_LOGIN")
+@rate_limit("RATE_LIMIT_LOGIN_ACCOUNT", key="email")
 def admin_login():
     data = request.get_json()
     if not data:
@@ -120,13 +139,15 @@ def admin_login():
         return jsonify({"error": "Invalid email"}), 400
 
     user = User.query.filter_by(email=email).first()
-    if not user or user.role != "admin" or not check_password_hash(user.password_hash, password):
-        return jsonify({"error": "Invalid credentials"}), 401
-
-    token = create_access_token(identity=str(user.id))
+    try:
+        if not user or user.role != "admin" or not verify_password(user, password):
+            return jsonify({"error": "Invalid credentials"}), 401
+    except HashingBusy:
+        return _busy()
+    db.session.commit()
 
     return jsonify({
-        "token": token,
+        **issue_tokens(user),
         "user_id": user.id,
         "role": user.role
     })
@@ -134,6 +155,7 @@ def admin_login():
 
 # ADMIN BOOTSTRAP (env-gated)
 @auth_bp.route("/bootstrap-admin", methods=["POST"])
+@rate_limit("RATE_LIMIT_LOGIN")
 def bootstrap_admin():
     if os.getenv("ADMIN_BOOTSTRAP_ENABLED", "").lower() != "true":
         return jsonify({"error": "Bootstrap disabled"}), 403
@@ -157,7 +179,10 @@ def bootstrap_admin():
     if len(password) < 8:
         return jsonify({"error": "Password must be at least 8 characters"}), 400
 
-    hashed = generate_password_hash(password)
+    try:
+        hashed = hash_password(password)
+    except HashingBusy:
+        return _busy()
     existing = User.query.filter_by(email=email).first()
     if existing:
         existing.password_hash = hashed
@@ -165,6 +190,7 @@ def bootstrap_admin():
         if username:
             existing.username = username
         db.session.commit()
+        invalidate_principal(existing.id)
         return jsonify({"message": "Admin reset"}), 200
 
     user = User(
@@ -178,9 +204,38 @@ def bootstrap_admin():
     return jsonify({"message": "Admin created"}), 201
 
 
+# REFRESH
+@auth_bp.route("/refresh", methods=["POST"])
+@jwt_required(refresh=True)
+def refresh():
+    # Refresh tokens are single use: revoking this one first means two
+    # concurrent refreshes with the same token can't both succeed.
+    if not get_denylist().revoke(get_jwt()):
+        return jsonify({"error": "Token has been revoked"}), 401
+    user = db.session.get(User, int(get_jwt_identity()))
+    if not user:
+        return jsonify({"error": "Unauthorized"}), 401
+    return jsonify({
+        **issue_tokens(user),
+        "user_id": user.id,
+        "role": user.role
+    })
+
+
 # LOGOUT
 @auth_bp.route("/logout", methods=["POST"])
+@jwt_required(verify_type=False)
 def logout():
-    # In a real application, you would handle token revocation here.
+    denylist = get_denylist()
+    denylist.revoke(get_jwt())
+    # The client's refresh token, if sent, is revoked along with it.
+    refresh_token = (request.get_json(silent=True) or {}).get("refresh_token")
+    if refresh_token:
+        try:
+            payload = decode_token(refresh_token)
+        except PyJWTError:
+            payload = None
+        if payload and payload.get("type") == "refresh" and payload.get("sub") == get_jwt_identity():
+            denylist.revoke(payload)
     return jsonify({"message": "Logged out"}), 200
 
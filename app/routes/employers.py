@@ -1,8 +1,12 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from sqlalchemy.exc import IntegrityError
 from ..extensions import db
-from ..models import Employer, User
+from ..models import Employer
+from ..principal import current_principal, invalidate_principal
+from ..conditional import conditional
+from .. import counters
+from ..pagination import page_response, paginate, parse_page_args
 
 employers_bp = Blueprint("employers", __name__)
 MAX_EMPLOYERS = 100
@@ -23,17 +27,32 @@ def _employer_to_dict(employer):
 
 @employers_bp.route("/", methods=["GET"])
 @jwt_required()
+@conditional("employers", includes={"counts": ["jobs"]})
 def list_employers():
-    user = User.query.get(int(get_jwt_identity()))
+    user = current_principal()
     if not user:
         return jsonify({"error": "Unauthorized"}), 401
+    include = {i.strip() for i in request.args.get("include", "").split(",") if i.strip()}
+    if include - {"counts"}:
+        return jsonify({"error": "Invalid include"}), 400
+    page, err = parse_page_args("employers")
+    if err:
+        return jsonify({"error": err}), 400
     if user.role == "admin":
-        employers = Employer.query.all()
+        employers_query = Employer.query
     elif user.role == "employer":
-        employers = Employer.query.filter_by(user_id=user.id).all()
+        employers_query = Employer.query.filter_by(user_id=user.id)
     else:
         return jsonify({"error": "Forbidden"}), 403
-    return jsonify([_employer_to_dict(e) for e in employers]), 200
+    employers, next_cursor = paginate(
+        employers_query, [Employer.created_at, Employer.id], lambda e: (e.created_at, e.id), page
+    )
+    items = [_employer_to_dict(e) for e in employers]
+    if "counts" in include:
+        job_counts = counters.employer_job_counts(e.id for e in employers)
+        for item in items:
+            item["job_count"] = job_counts[item["id"]]
+    return page_response(page, items, next_cursor), 200
 
 
 @employers_bp.route("/", methods=["POST"])
@@ -47,15 +66,13 @@ def create_employer():
     if any(not data.get(k) for k in required):
         return jsonify({"error": "Missing fields"}), 400
 
-    user = User.query.get(int(get_jwt_identity()))
+    user = current_principal()
     if not user:
         return jsonify({"error": "Unauthorized"}), 401
     if user.role == "employer" and int(data["user_id"]) != user.id:
         return jsonify({"error": "Forbidden"}), 403
     if user.role not in {"employer", "admin"}:
         return jsonify({"error": "Forbidden"}), 403
-    if Employer.query.count() >= MAX_EMPLOYERS:
-        return jsonify({"error": "Employer limit reached (100). Admin review required."}), 409
 
     employer = Employer(
         user_id=int(data["user_id"]),
@@ -68,7 +85,12 @@ def create_employer():
         password_hash=data["password_hash"],
     )
     db.session.add(employer)
+    db.session.flush()
+    if counters.get_count(counters.TOTAL_EMPLOYERS, Employer.query.count) > MAX_EMPLOYERS:
+        db.session.rollback()
+        return jsonify({"error": "Employer limit reached (100). Admin review required."}), 409
     db.session.commit()
+    invalidate_principal(employer.user_id)
     return jsonify(_employer_to_dict(employer)), 201
 
 
@@ -78,7 +100,7 @@ def get_employer(employer_id):
     employer = Employer.query.get(employer_id)
     if not employer:
         return jsonify({"error": "Not found"}), 404
-    user = User.query.get(int(get_jwt_identity()))
+    user = current_principal()
     if not user:
         return jsonify({"error": "Unauthorized"}), 401
     if user.role == "admin":
@@ -94,7 +116,7 @@ def update_employer(employer_id):
     employer = Employer.query.get(employer_id)
     if not employer:
         return jsonify({"error": "Not found"}), 404
-    user = User.query.get(int(get_jwt_identity()))
+    user = current_principal()
     if not user:
         return jsonify({"error": "Unauthorized"}), 401
     if user.role == "admin":
@@ -118,12 +140,12 @@ def update_employer(employer_id):
 @employers_bp.route("/me", methods=["GET"])
 @jwt_required()
 def get_my_employer():
-    user = User.query.get(int(get_jwt_identity()))
+    user = current_principal()
     if not user:
         return jsonify({"error": "Unauthorized"}), 401
     if user.role != "employer":
         return jsonify({"error": "Forbidden"}), 403
-    employer = Employer.query.filter_by(user_id=user.id).first()
+    employer = Employer.query.get(user.employer_id) if user.employer_id else None
     if not employer:
         return jsonify({"error": "Not found"}), 404
     return jsonify(_employer_to_dict(employer)), 200
@@ -132,14 +154,13 @@ def get_my_employer():
 @employers_bp.route("/me", methods=["POST"])
 @jwt_required()
 def create_my_employer():
-    user = User.query.get(int(get_jwt_identity()))
+    user = current_principal()
     if not user:
         return jsonify({"error": "Unauthorized"}), 401
     if user.role != "employer":
         return jsonify({"error": "Forbidden"}), 403
 
-    existing = Employer.query.filter_by(user_id=user.id).first()
-    if existing:
+    if user.employer_id:
         return jsonify({"error": "Employer profile already exists"}), 400
 
     data = request.get_json()
@@ -158,23 +179,24 @@ def create_my_employer():
         location=data.get("location"),
         phone=data["phone"],
         contact_person=data["contact_person"],
-        password_hash=user.password_hash,
+        password_hash=user.user.password_hash,
     )
     db.session.add(employer)
     db.session.commit()
+    invalidate_principal(user.id)
     return jsonify(_employer_to_dict(employer)), 201
 
 
 @employers_bp.route("/me", methods=["PUT"])
 @jwt_required()
 def update_my_employer():
-    user = User.query.get(int(get_jwt_identity()))
+    user = current_principal()
     if not user:
         return jsonify({"error": "Unauthorized"}), 401
     if user.role != "employer":
         return jsonify({"error": "Forbidden"}), 403
 
-    employer = Employer.query.filter_by(user_id=user.id).first()
+    employer = Employer.query.get(user.employer_id) if user.employer_id else None
     if not employer:
         return jsonify({"error": "Not found"}), 404
 
@@ -203,15 +225,17 @@ def delete_employer(employer_id):
     employer = Employer.query.get(employer_id)
     if not employer:
         return jsonify({"error": "Not found"}), 404
-    user = User.query.get(int(get_jwt_identity()))
+    user = current_principal()
     if not user:
         return jsonify({"error": "Unauthorized"}), 401
     if user.role != "admin":
         return jsonify({"error": "Forbidden"}), 403
 
     try:
+        owner_id = employer.user_id
         db.session.delete(employer)
         db.session.commit()
+        invalidate_principal(owner_id)
         return jsonify({"message": "Deleted"}), 200
     except IntegrityError:
         db.session.rollback()
@@ -0,0 +1,128 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+
+from flask import Blueprint, current_app, jsonify, request, stream_with_context
+from flask_jwt_extended import jwt_required
+from sqlalchemy import select
+
+from ..extensions import db
+from ..models import Application, Job, User
+from ..principal import current_principal
+
+export_bp = Blueprint("export", __name__)
+
+# GET /export/<entity>?format=csv|ndjson streams a whole table as a download.
+# Rows come off a server-side cursor EXPORT_BATCH_SIZE at a time as plain
+# tuples (no ORM objects) and are encoded into ~CHUNK_BYTES pieces as they
+# are sent, gzipped on the fly when the client accepts it, so memory use
+# doesn't grow with the table. Scoping follows the matching list endpoint.
+COLUMNS = {
+    "jobs": [
+        Job.id, Job.title, Job.description, Job.location, Job.salary, Job.employer_id,
+        Job.source, Job.external_url, Job.reference, Job.created_at,
+    ],
+    "applications": [
+        Application.id, Application.user_id, Application.job_id, Application.full_name, Application.email,
+        Application.phone, Application.resume_url, Application.cover_letter, Application.status,
+        Application.created_at,
+    ],
+    "users": [User.id, User.username, User.email, User.role, User.created_at],
+}
+FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+CHUNK_BYTES = 64 * 1024
+
+
+def _scoped_query(entity, user):
+    """The export query for `user`, or None if they may not export `entity`."""
+    columns = COLUMNS[entity]
+    query = select(*columns).order_by(columns[0])
+    if entity == "jobs":
+        if user.role == "employer":
+            return query.where(Job.employer_id == (user.employer_id or -1))
+        return query if user.role in {"user", "admin"} else None
+    if entity == "applications":
+        if user.role == "user":
+            return query.where(Application.user_id == user.id)
+        if user.role == "employer":
+            return query.join(Job, Job.id == Application.job_id).where(Job.employer_id == (user.employer_id or -1))
+        return query if user.role == "admin" else None
+    return query if user.role == "admin" else None
+
+
+def _csv_cell(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    # Keep spreadsheets from evaluating text cells as formulas.
+    if isinstance(value, str) and value[:1] in ("=", "+", "-", "@"):
+        return "'" + value
+    return value
+
+
+def _encoded(rows, names, fmt):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == "csv" else None
+    if writer is not None:
+        writer.writerow(names)
+    encoder = json.JSONEncoder(separators=(",", ":"), default=datetime.isoformat)
+    for row in rows:
+        if writer is not None:
+            writer.writerow([_csv_cell(value) for value in row])
+        else:
+            buffer.write(encoder.encode(dict(zip(names, row))))
+            buffer.write("\n")
+        if buffer.tell() >= CHUNK_BYTES:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def _gzipped(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _rows(query, batch_size):
+    # Its own connection: the stream outlives the view function.
+    with db.engine.connect() as connection:
+        result = connection.execution_options(yield_per=batch_size).execute(query)
+        for partition in result.partitions():
+            yield from partition
+
+
+@export_bp.route("/<entity>", methods=["GET"])
+@jwt_required()
+def export(entity):
+    user = current_principal()
+    if not user:
+        return jsonify({"error": "Unauthorized"}), 401
+    if entity not in COLUMNS:
+        return jsonify({"error": "Unknown export"}), 404
+    fmt = request.args.get("format", "csv").strip().lower()
+    if fmt not in FORMATS:
+        return jsonify({"error": "Invalid format"}), 400
+    query = _scoped_query(entity, user)
+    if query is None:
+        return jsonify({"error": "Forbidden"}), 403
+
+    names = [column.key for column in COLUMNS[entity]]
+    body = _encoded(_rows(query, current_app.config.get("EXPORT_BATCH_SIZE", 1000)), names, fmt)
+    gzip = request.accept_encodings["gzip"] > 0
+    if gzip:
+        body = _gzipped(body)
+    response = current_app.response_class(stream_with_context(body), mimetype=FORMATS[fmt])
+    filename = f"{entity}-{datetime.utcnow():%Y%m%d}.{fmt}"
+    response.headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    response.headers["Vary"] = "Accept-Encoding"
+    response.headers["Cache-Control"] = "no-store"
+    if gzip:
+        response.headers["Content-Encoding"] = "gzip"
+    return response
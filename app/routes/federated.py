@@ -0,0 +1,182 @@
+import re
+import time
+from concurrent.futures import TimeoutError as FutureTimeout
+from types import SimpleNamespace
+
+from flask import Blueprint, current_app, jsonify, request
+from flask_jwt_extended import jwt_required
+from sqlalchemy import or_
+from sqlalchemy.exc import OperationalError
+
+from .. import search
+from ..adzuna_client import AdzunaError, get_client
+from ..extensions import db
+from ..ingest import SOURCE as ADZUNA_SOURCE, normalize
+from ..models import Job
+from ..principal import current_principal
+from ..rate_limit import rate_limit
+from ..sqlite_profile import statement_deadline
+from .adzuna import _COUNTRY_RE, _credentials
+from .jobs import _job_to_dict, _relevance_score
+
+federated_bp = Blueprint("federated", __name__)
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 50
+# Share of the unified score that comes from each source's own ranking
+# (BM25 locally, Adzuna's order upstream); the rest is query-term overlap.
+SOURCE_RANK_WEIGHT = 0.25
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _adzuna_to_dict(row):
+    return {
+        "id": None,
+        "title": row["title"],
+        "description": row["description"],
+        "location": row["location"],
+        "salary": row["salary"],
+        "employer_id": None,
+        "source": ADZUNA_SOURCE,
+        "reference": None,
+        "external_url": row["external_url"],
+        "created_at": row["created_at"].isoformat() if row["created_at"] else None,
+    }
+
+
+def _score(item, terms, position, total):
+    # Same term weighting as GET /jobs/?sort=relevance, scaled to 0..1.
+    lexical = _relevance_score(SimpleNamespace(title=item["title"], description=item["description"]), terms)
+    lexical = lexical / (3 * len(terms)) if terms else 0.0
+    rank = 1 - position / total if total else 0.0
+    return round((1 - SOURCE_RANK_WEIGHT) * lexical + SOURCE_RANK_WEIGHT * rank, 4)
+
+
+def _dedupe_key(item):
+    # Postings syndicated to several boards differ in punctuation, case and word
+    # order; title words plus the first location word catches those.
+    title = " ".join(sorted(set(_WORD_RE.findall((item["title"] or "").lower()))))
+    location = _WORD_RE.findall((item["location"] or "").lower())
+    return f"{title}|{location[0] if location else ''}"
+
+
+def _local_jobs(query_text, location, limit, budget):
+    jobs_query = Job.query
+    if location:
+        jobs_query = jobs_query.filter(Job.location.ilike(f"%{location}%"))
+    matches = search.match_subquery(query_text) if search.fts_enabled() else None
+    if matches is not None:
+        jobs_query = jobs_query.join(matches, matches.c.job_id == Job.id).order_by(matches.c.rank, Job.id)
+    else:
+        jobs_query = jobs_query.filter(
+            or_(Job.title.ilike(f"%{query_text}%"), Job.description.ilike(f"%{query_text}%"))
+        ).order_by(Job.created_at.desc(), Job.id.desc())
+    with statement_deadline(db.session.connection(), budget):
+        return jobs_query.limit(limit).all()
+
+
+@federated_bp.route("/", methods=["GET"])
+@jwt_required()
+@rate_limit("RATE_LIMIT_ADZUNA", key="identity")
+def federated_search():
+    """Local postings and a live Adzuna search, fetched concurrently and merged
+    into one ranked, de-duplicated list.
+
+    Each source has a latency budget; a source that misses it is reported in
+    `sources` and left out, and the rest is returned on time.
+    """
+    user = current_principal()
+    if not user:
+        return jsonify({"error": "Unauthorized"}), 401
+    if user.role not in {"user", "admin"}:
+        return jsonify({"error": "Forbidden"}), 403
+
+    query_text = request.args.get("query", type=str, default="").strip()
+    if not query_text:
+        return jsonify({"error": "Missing query"}), 400
+    location = request.args.get("location", type=str, default="").strip()
+    try:
+        limit = int(request.args.get("limit", DEFAULT_LIMIT))
+    except (TypeError, ValueError):
+        return jsonify({"error": "Invalid limit"}), 400
+    if limit < 1:
+        return jsonify({"error": "Invalid limit"}), 400
+    limit = min(limit, MAX_LIMIT)
+    country = request.args.get("country", current_app.config.get("INGEST_COUNTRY", "us")).lower()
+    if not _COUNTRY_RE.match(country):
+        return jsonify({"error": "Invalid country"}), 400
+
+    local_budget = current_app.config.get("FEDERATED_LOCAL_BUDGET_MS", 250) / 1000
+    adzuna_budget = current_app.config.get("FEDERATED_ADZUNA_BUDGET_MS", 800) / 1000
+    sources = {}
+
+    # Start the upstream call first so it overlaps the local query.
+    future = None
+    credentials = _credentials()
+    if credentials:
+        params = {"what": query_text, "results_per_page": limit}
+        if location:
+            params["where"] = location
+        adzuna_started = time.monotonic()
+        future = get_client().submit(country, 1, params, credentials)
+    else:
+        sources[ADZUNA_SOURCE] = {"status": "disabled"}
+
+    started = time.monotonic()
+    try:
+        jobs = _local_jobs(query_text, location, limit, local_budget)
+        sources["local"] = {"status": "ok", "count": len(jobs)}
+    except OperationalError as exc:
+        if "interrupted" not in str(exc):
+            raise
+        db.session.rollback()
+        jobs = []
+        sources["local"] = {"status": "timeout"}
+    sources["local"]["ms"] = round((time.monotonic() - started) * 1000, 1)
+
+    external = []
+    if future is not None:
+        remaining = adzuna_budget - (time.monotonic() - adzuna_started)
+        try:
+            # A search that misses the budget keeps running and fills the
+            # client cache, so the next identical query can include it.
+            payload, outcome = future.result(timeout=max(remaining, 0))
+        except FutureTimeout:
+            sources[ADZUNA_SOURCE] = {"status": "timeout"}
+        except AdzunaError as exc:
+            sources[ADZUNA_SOURCE] = {"status": "error", "error": exc.error}
+        else:
+            rows = [row for row in map(normalize, payload.get("results") or []) if row is not None]
+            on_page = {job.external_id for job in jobs if job.source == ADZUNA_SOURCE}
+            # Results already ingested are shown as their local posting (with
+            # its id), in Adzuna's order; ones on the local page are dropped.
+            ingested = {
+                job.external_id: job for job in Job.query.filter(
+                    Job.source == ADZUNA_SOURCE,
+                    Job.external_id.in_([row["external_id"] for row in rows if row["external_id"] not in on_page]),
+                )
+            } if rows else {}
+            external = [
+                _job_to_dict(ingested[row["external_id"]]) if row["external_id"] in ingested else _adzuna_to_dict(row)
+                for row in rows if row["external_id"] not in on_page
+            ]
+            sources[ADZUNA_SOURCE] = {"status": "ok", "count": len(external), "cache": outcome}
+        sources[ADZUNA_SOURCE]["ms"] = round((time.monotonic() - adzuna_started) * 1000, 1)
+
+    terms = [t for t in query_text.lower().split() if t]
+    candidates = []
+    for items in ([_job_to_dict(job) for job in jobs], external):
+        for position, item in enumerate(items):
+            item["score"] = _score(item, terms, position, len(items))
+            candidates.append(item)
+    # Highest score first; on a tie the local posting wins the dedupe.
+    candidates.sort(key=lambda item: (-item["score"], item["source"] != "local"))
+    seen = set()
+    merged = []
+    for item in candidates:
+        key = _dedupe_key(item)
+        if key in seen:
+            continue
+        seen.add(key)
+        merged.append(item)
+    return jsonify({"items": merged[:limit], "sources": sources}), 200
@@ -1,8 +1,13 @@
-from flask import Blueprint, request, jsonify
-from sqlalchemy import or_
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Blueprint, current_app, request, jsonify
+from sqlalchemy import or_, select
+from flask_jwt_extended import jwt_required
 from ..extensions import db
-from ..models import Job, Employer, User, ApplicationForm
+from ..models import Application, ApplicationForm, Job, Profile
+from ..principal import current_principal
+from ..conditional import conditional
+from .. import bulk_jobs, counters, dedupe, matching, search, similar, suggest
+from ..pagination import page_response, paginate, paginate_sorted, parse_page_args
+from ..response_cache import get_cache, job_listing_tags
 
 jobs_bp = Blueprint("jobs", __name__)
 MAX_JOBS = 100
@@ -29,10 +34,34 @@ def _job_to_dict(job):
         "location": job.location,
         "salary": job.salary,
         "employer_id": job.employer_id,
+        "source": job.source,
+        "external_url": job.external_url,
+        "reference": job.reference,
         "created_at": job.created_at.isoformat() if job.created_at else None,
     }
 
 
+def _job_values(data):
+    """Job columns from a posting body, checked like POST /jobs/: (values, None)
+    or (None, error)."""
+    required = ["title", "description", "location", "salary", "employer_id"]
+    if any(k not in data or data.get(k) in (None, "") for k in required):
+        return None, "Missing fields"
+    salary, err = _parse_float(data.get("salary"), "salary")
+    if err:
+        return None, err
+    employer_id, err = _parse_int(data.get("employer_id"), "employer_id")
+    if err:
+        return None, err
+    return {
+        "title": data["title"],
+        "description": data["description"],
+        "location": data["location"],
+        "salary": salary,
+        "employer_id": employer_id,
+    }, None
+
+
 def _relevance_score(job, terms):
     title = (job.title or "").lower()
     description = (job.description or "").lower()
@@ -51,12 +80,14 @@ applications = db.relationship("Application", backref="job", cascade="all, delet
 
 @jobs_bp.route("/", methods=["GET"])
 @jwt_required()
+@conditional("jobs", includes={"counts": ["applications"]})
 def list_jobs():
-    user = User.query.get(int(get_jwt_identity()))
+    user = current_principal()
     if not user:
         return jsonify({"error": "Unauthorized"}), 401
     query_text = request.args.get("query", type=str, default="").strip()
     location = request.args.get("location", type=str, default="").strip()
+    source = request.args.get("source", type=str, default="").strip().lower()
     min_salary, err = _parse_float(request.args.get("min_salary"), "min_salary")
     if err and request.args.get("min_salary") is not None:
         return jsonify({"error": err}), 400
@@ -66,20 +97,59 @@ def list_jobs():
     sort = request.args.get("sort", type=str, default="").strip().lower()
     if sort and sort not in {"alpha", "relevance"}:
         return jsonify({"error": "Invalid sort"}), 400
+    if sort == "relevance" and not query_text:
+        sort = "alpha"
+    # ?include=counts adds "applicant_count" to each job, read from the
+    # maintained counters rather than counted per request.
+    include = {i.strip() for i in request.args.get("include", "").split(",") if i.strip()}
+    if include - {"counts"}:
+        return jsonify({"error": "Invalid include"}), 400
+    with_counts = "counts" in include
+    page, err = parse_page_args(f"jobs:{sort or 'recent'}")
+    if err:
+        return jsonify({"error": err}), 400
 
     if user.role == "employer":
-        employer = Employer.query.filter_by(user_id=user.id).first()
-        if not employer:
-            return jsonify([]), 200
-        jobs_query = Job.query.filter_by(employer_id=employer.id)
+        if not user.employer_id:
+            return page_response(page, []), 200
+        jobs_query = Job.query.filter_by(employer_id=user.employer_id)
+        scope = user.employer_id
     elif user.role in {"user", "admin"}:
         jobs_query = Job.query
+        scope = None
     else:
         return jsonify({"error": "Forbidden"}), 403
 
+    cache = get_cache()
+    if cache is not None:
+        cache_key = cache.make_key("jobs", {
+            "query": " ".join(query_text.lower().split()),
+            "location": location.lower(),
+            "source": source,
+            "min_salary": min_salary,
+            "max_salary": max_salary,
+            "sort": sort,
+            "scope": scope,
+            "limit": page.limit,
+            "cursor": request.args.get("cursor"),
+            "counts": with_counts,
+        })
+        body = cache.get(cache_key)
+        if body is not None:
+            response = current_app.response_class(body, mimetype="application/json")
+            response.headers["X-Cache"] = "HIT"
+            return response, 200
+
     if location:
         jobs_query = jobs_query.filter(Job.location.ilike(f"%{location}%"))
-    if query_text:
+    if source:
+        jobs_query = jobs_query.filter(Job.source == source)
+    matches = None
+    if query_text and search.fts_enabled():
+        matches = search.match_subquery(query_text)
+    if matches is not None:
+        jobs_query = jobs_query.join(matches, matches.c.job_id == Job.id)
+    elif query_text:
         jobs_query = jobs_query.filter(
             or_(
                 Job.title.ilike(f"%{query_text}%"),
@@ -92,65 +162,193 @@ def list_jobs():
         jobs_query = jobs_query.filter(Job.salary <= max_salary)
 
     if sort == "alpha":
-        jobs = jobs_query.order_by(Job.title.asc()).all()
+        # Case-insensitive, as the unpaginated sort was; the cursor carries
+        # SQLite's lower() of the title so it compares like the ORDER BY.
+        title_key = db.func.lower(Job.title)
+        rows, next_cursor = paginate(
+            jobs_query.add_columns(title_key.label("title_key")),
+            [title_key, Job.id],
+            lambda row: (row.title_key, row.Job.id),
+            page,
+        )
+        jobs = [row.Job for row in rows]
+    elif sort == "relevance" and matches is not None:
+        # BM25 ranking happens in SQLite; the title column is weighted higher.
+        rows, next_cursor = paginate(
+            jobs_query.add_columns(matches.c.rank),
+            [matches.c.rank, Job.id],
+            lambda row: (row.rank, row.Job.id),
+            page,
+        )
+        jobs = [row.Job for row in rows]
     elif sort == "relevance":
-        jobs = jobs_query.all()
         terms = [t for t in query_text.lower().split() if t]
-        if terms:
-            jobs.sort(key=lambda j: (-_relevance_score(j, terms), (j.title or "").lower()))
-        else:
-            jobs.sort(key=lambda j: (j.title or "").lower())
+        jobs, next_cursor = paginate_sorted(
+            jobs_query.all(),
+            lambda j: (-_relevance_score(j, terms), (j.title or "").lower(), j.id),
+            page,
+        )
     else:
-        jobs = jobs_query.all()
+        jobs, next_cursor = paginate(
+            jobs_query, [Job.created_at, Job.id], lambda j: (j.created_at, j.id), page
+        )
+
+    items = [_job_to_dict(j) for j in jobs]
+    if with_counts:
+        applicants = counters.applicant_counts(j.id for j in jobs)
+        for item in items:
+            item["applicant_count"] = applicants[item["id"]]
+    response = page_response(page, items, next_cursor)
+    if cache is not None:
+        cache.set(cache_key, response.get_data(), job_listing_tags(scope, counts=with_counts))
+        response.headers["X-Cache"] = "MISS"
+    return response, 200
+
+
+@jobs_bp.route("/cache/stats", methods=["GET"])
+@jwt_required()
+def job_cache_stats():
+    user = current_principal()
+    if not user:
+        return jsonify({"error": "Unauthorized"}), 401
+    if user.role != "admin":
+        return jsonify({"error": "Forbidden"}), 403
+    cache = get_cache()
+    if cache is None:
+        return jsonify({"enabled": False}), 200
+    return jsonify({"enabled": True, **cache.stats()}), 200
+
 
-    return jsonify([_job_to_dict(j) for j in jobs]), 200
+@jobs_bp.route("/suggest", methods=["GET"])
+@jwt_required()
+def suggest_jobs():
+    """Typeahead for the search box: titles, locations and companies starting
+    with (a word of) ?prefix=, most frequent first. ?kind= narrows it."""
+    user = current_principal()
+    if not user:
+        return jsonify({"error": "Unauthorized"}), 401
+    prefix = request.args.get("prefix", type=str, default="").strip()
+    if not prefix:
+        return jsonify({"error": "Missing prefix"}), 400
+    if len(prefix) > suggest.MAX_PREFIX_LENGTH:
+        return jsonify({"error": "Prefix too long"}), 400
+    kinds = [k.strip() for k in request.args.get("kind", "").split(",") if k.strip()] or list(suggest.KINDS)
+    if set(kinds) - set(suggest.KINDS):
+        return jsonify({"error": "Invalid kind"}), 400
+    limit, err = _parse_int(request.args.get("limit", 8), "limit")
+    if err or limit < 1:
+        return jsonify({"error": "Invalid limit"}), 400
+    limit = min(limit, suggest.MAX_RESULTS)
+
+    if user.role == "employer":
+        if not user.employer_id:
+            return jsonify({"prefix": prefix, "items": []}), 200
+        items = suggest.employer_suggestions(user.employer_id, prefix, kinds, limit)
+    elif user.role in {"user", "admin"}:
+        items = suggest.get_suggester().suggest(prefix, kinds, limit)
+    else:
+        return jsonify({"error": "Forbidden"}), 403
+    return jsonify({"prefix": prefix, "items": items}), 200
 
 
 @jobs_bp.route("/", methods=["POST"])
 @jwt_required()
 def create_job():
-    user = User.query.get(int(get_jwt_identity()))
+    user = current_principal()
     if not user:
         return jsonify({"error": "Unauthorized"}), 401
     if user.role not in {"employer", "admin"}:
         return jsonify({"error": "Forbidden"}), 403
-    if Job.query.count() >= MAX_JOBS:
-        return jsonify({"error": "Job limit reached (100). Admin review required."}), 409
     data = request.get_json()
     if not data:
         return jsonify({"error": "Missing JSON body"}), 400
 
-    required = ["title", "description", "location", "salary", "employer_id"]
-    if any(k not in data or data.get(k) in (None, "") for k in required):
-        return jsonify({"error": "Missing fields"}), 400
-
-    salary, err = _parse_float(data.get("salary"), "salary")
-    if err:
-        return jsonify({"error": err}), 400
-    employer_id, err = _parse_int(data.get("employer_id"), "employer_id")
+    values, err = _job_values(data)
     if err:
         return jsonify({"error": err}), 400
 
-    # Use constructor args; bare `title=...` lines would be no-op tuple expressions.
-    employer_id = employer_id
     if user.role == "employer":
-        employer = Employer.query.filter_by(user_id=user.id).first()
-        if not employer:
+        if not user.employer_id:
             return jsonify({"error": "Employer profile required"}), 400
-        employer_id = employer.id
-
-    job = Job(
-        title=data["title"],
-        description=data["description"],
-        location=data["location"],
-        salary=salary,
-        employer_id=employer_id,
-    )
+        values["employer_id"] = user.employer_id
+    employer_id = values["employer_id"]
+
+    duplicates = []
+    policy = current_app.config.get("DUPLICATE_POLICY", "warn")
+    if policy != "off":
+        duplicates = dedupe.find_duplicates(data["title"], data["description"], employer_id=employer_id)
+        if duplicates and policy == "reject":
+            return jsonify({"error": "Duplicate of an existing job", "duplicates": duplicates}), 409
+
+    job = Job(**values)
     db.session.add(job)
     db.session.flush()
+    # The insert holds the write lock until commit, so checking the count
+    # after it cannot race another worker's insert.
+    if counters.get_count(counters.TOTAL_JOBS, Job.query.filter_by(source="local").count) > MAX_JOBS:
+        db.session.rollback()
+        return jsonify({"error": "Job limit reached (100). Admin review required."}), 409
     db.session.add(ApplicationForm(job_id=job.id))
     db.session.commit()
-    return jsonify(_job_to_dict(job)), 201
+    body = _job_to_dict(job)
+    if duplicates:
+        body["possible_duplicates"] = duplicates
+    return jsonify(body), 201
+
+
+@jobs_bp.route("/bulk", methods=["POST"])
+@jwt_required()
+def bulk_create_jobs():
+    """Create or update many postings from a JSON array or an NDJSON body.
+    Rows are checked like POST /jobs/; a row with a "reference" updates the
+    employer's posting with that reference if there is one. Answers with one
+    result per row, in order."""
+    user = current_principal()
+    if not user:
+        return jsonify({"error": "Unauthorized"}), 401
+    if user.role not in {"employer", "admin"}:
+        return jsonify({"error": "Forbidden"}), 403
+    if user.role == "employer" and not user.employer_id:
+        return jsonify({"error": "Employer profile required"}), 400
+
+    max_rows = current_app.config.get("BULK_MAX_ROWS", 10000)
+    if request.mimetype in bulk_jobs.NDJSON_TYPES:
+        rows = bulk_jobs.read_ndjson(request.stream)
+    else:
+        data = request.get_json(silent=True)
+        if not isinstance(data, list):
+            return jsonify({"error": "Expected a JSON array or NDJSON body"}), 400
+        if len(data) > max_rows:
+            return jsonify({"error": f"Too many rows (max {max_rows})"}), 413
+        rows = ((row, None) for row in data)
+
+    writer = bulk_jobs.BulkWriter(
+        chunk_size=current_app.config.get("BULK_CHUNK_SIZE", 500),
+        duplicate_policy=current_app.config.get("DUPLICATE_POLICY", "warn"),
+        max_jobs=MAX_JOBS,
+    )
+    truncated = False
+    for count, (row, err) in enumerate(rows):
+        if count == max_rows:
+            truncated = True
+            break
+        values = reference = None
+        if err is None and not isinstance(row, dict):
+            err = "Invalid row"
+        if err is None:
+            values, err = _job_values(row)
+        if err is None:
+            reference, err = bulk_jobs.parse_reference(row.get("reference"))
+        if err is None and user.role == "employer":
+            values["employer_id"] = user.employer_id
+        writer.add(values, reference, err)
+    writer.flush()
+
+    body = {**writer.summary(), "results": writer.results}
+    if truncated:
+        body["truncated"] = True
+        body["error"] = f"Too many rows (max {max_rows}); the rest were not read"
+    return jsonify(body), 200
 
 
 @jobs_bp.route("/<int:job_id>", methods=["GET"])
@@ -159,30 +357,116 @@ def get_job(job_id):
     job = Job.query.get(job_id)
     if not job:
         return jsonify({"error": "Not found"}), 404
-    user = User.query.get(int(get_jwt_identity()))
+    user = current_principal()
     if not user:
         return jsonify({"error": "Unauthorized"}), 401
     if user.role == "employer":
-        employer = Employer.query.filter_by(user_id=user.id).first()
-        if not employer or job.employer_id != employer.id:
+        if not user.employer_id or job.employer_id != user.employer_id:
             return jsonify({"error": "Forbidden"}), 403
     elif user.role not in {"user", "admin"}:
         return jsonify({"error": "Forbidden"}), 403
     return jsonify(_job_to_dict(job)), 200
 
 
+@jobs_bp.route("/<int:job_id>/similar", methods=["GET"])
+@jwt_required()
+def similar_jobs(job_id):
+    """Postings most like this one (cosine over hashed bag-of-words vectors),
+    best first, each with its "similarity". Employers only see their own."""
+    job = Job.query.get(job_id)
+    if not job:
+        return jsonify({"error": "Not found"}), 404
+    user = current_principal()
+    if not user:
+        return jsonify({"error": "Unauthorized"}), 401
+    candidate_ids = None
+    if user.role == "employer":
+        if not user.employer_id or job.employer_id != user.employer_id:
+            return jsonify({"error": "Forbidden"}), 403
+        candidate_ids = db.session.scalars(select(Job.id).where(Job.employer_id == user.employer_id)).all()
+    elif user.role not in {"user", "admin"}:
+        return jsonify({"error": "Forbidden"}), 403
+    limit, err = _parse_int(request.args.get("limit", 10), "limit")
+    if err or limit < 1:
+        return jsonify({"error": "Invalid limit"}), 400
+    limit = min(limit, similar.MAX_RESULTS)
+
+    scored = similar.similar_jobs(job, limit, candidate_ids)
+    # Rows deleted since they were indexed drop out here.
+    jobs = {j.id: j for j in Job.query.filter(Job.id.in_([job_id for job_id, _ in scored])).all()} if scored else {}
+    items = [{**_job_to_dict(jobs[i]), "similarity": score} for i, score in scored if i in jobs]
+    return jsonify({"job_id": job_id, "items": items}), 200
+
+
+@jobs_bp.route("/<int:job_id>/candidates", methods=["GET"])
+@jwt_required()
+def job_candidates(job_id):
+    """Applicants ranked by how many of the job's skills their profile has
+    ("score" 0..1, "matched_skills"). Admins can pass ?scope=all to rank
+    every profile instead."""
+    job = Job.query.get(job_id)
+    if not job:
+        return jsonify({"error": "Not found"}), 404
+    user = current_principal()
+    if not user:
+        return jsonify({"error": "Unauthorized"}), 401
+    if user.role == "employer":
+        if not user.employer_id or job.employer_id != user.employer_id:
+            return jsonify({"error": "Forbidden"}), 403
+    elif user.role != "admin":
+        return jsonify({"error": "Forbidden"}), 403
+    scope = request.args.get("scope", "applicants")
+    if scope not in {"applicants", "all"}:
+        return jsonify({"error": "Invalid scope"}), 400
+    if scope == "all" and user.role != "admin":
+        return jsonify({"error": "Forbidden"}), 403
+    limit, err = _parse_int(request.args.get("limit", 50), "limit")
+    if err or limit < 1:
+        return jsonify({"error": "Invalid limit"}), 400
+    limit = min(limit, matching.MAX_CANDIDATES)
+
+    ranked = matching.rank_candidates(job, scope)[:limit]
+    user_ids = [user_id for user_id, _, _ in ranked]
+    profiles = {p.user_id: p for p in Profile.query.filter(Profile.user_id.in_(user_ids))} if ranked else {}
+    applications = {}
+    if ranked:
+        for application in (
+            Application.query.filter(Application.job_id == job_id, Application.user_id.in_(user_ids))
+            .order_by(Application.created_at, Application.id)
+        ):
+            applications[application.user_id] = application
+    items = []
+    for user_id, score, skills in ranked:
+        profile = profiles.get(user_id)
+        application = applications.get(user_id)
+        if profile is None and application is None:
+            continue
+        items.append({
+            "user_id": user_id,
+            "profile_id": profile.id if profile else None,
+            "full_name": profile.full_name if profile else application.full_name,
+            "score": score,
+            "matched_skills": skills,
+            "application": {
+                "id": application.id,
+                "status": application.status,
+                "created_at": application.created_at.isoformat() if application.created_at else None,
+            } if application else None,
+        })
+    return jsonify({"job_id": job_id, "scope": scope, "items": items}), 200
+
+
 @jobs_bp.route("/<int:job_id>", methods=["PUT"])
 @jwt_required()
 def update_job(job_id):
     job = Job.query.get(job_id)
     if not job:
         return jsonify({"error": "Not found"}), 404
-    user = User.query.get(int(get_jwt_identity()))
+    user = current_principal()
     if not user:
         return jsonify({"error": "Unauthorized"}), 401
     if user.role == "employer":
-        employer = Employer.query.filter_by(user_id=user.id).first()
-        if not employer or job.employer_id != employer.id:
+        if not user.employer_id or job.employer_id != user.employer_id:
             return jsonify({"error": "Forbidden"}), 403
     elif user.role != "admin":
         return jsonify({"error": "Forbidden"}), 403
@@ -216,12 +500,11 @@ def delete_job(job_id):
     job = Job.query.get(job_id)
     if not job:
         return jsonify({"error": "Not found"}), 404
-    user = User.query.get(int(get_jwt_identity()))
+    user = current_principal()
     if not user:
         return jsonify({"error": "Unauthorized"}), 401
     if user.role == "employer":
-        employer = Employer.query.filter_by(user_id=user.id).first()
-        if not employer or job.employer_id != employer.id:
+        if not user.employer_id or job.employer_id != user.employer_id:
             return jsonify({"error": "Forbidden"}), 403
     elif user.role != "admin":
         return jsonify({"error": "Forbidden"}), 403
@@ -1,7 +1,13 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from ..extensions import db
-from ..models import Profile, User
+from ..models import Job, Profile
+from ..principal import current_principal
+from ..conditional import conditional
+from ..pagination import DEFAULT_PAGE_SIZE, encode_cursor, page_response, paginate, parse_page_args
+from .. import matching
+from ..skill_query import SkillQueryError, search_profiles
+from .jobs import _job_to_dict
 
 profiles_bp = Blueprint("profiles", __name__)
 
@@ -32,14 +38,51 @@ def _profile_to_dict(profile):
 
 @profiles_bp.route("/", methods=["GET"])
 @jwt_required()
+@conditional("profiles")
 def list_profiles():
-    user = User.query.get(int(get_jwt_identity()))
+    user = current_principal()
     if not user:
         return jsonify({"error": "Unauthorized"}), 401
     if user.role != "admin":
         return jsonify({"error": "Forbidden"}), 403
-    profiles = Profile.query.all()
-    return jsonify([_profile_to_dict(p) for p in profiles]), 200
+    page, err = parse_page_args("profiles")
+    if err:
+        return jsonify({"error": err}), 400
+    profiles, next_cursor = paginate(
+        Profile.query, [Profile.created_at, Profile.id], lambda p: (p.created_at, p.id), page
+    )
+    return page_response(page, [_profile_to_dict(p) for p in profiles], next_cursor), 200
+
+
+@profiles_bp.route("/search", methods=["GET"])
+@jwt_required()
+def search_profiles_by_skill():
+    """Profiles matching a boolean skill query, e.g.
+    ?skills=python AND (sql OR postgres) AND NOT java, in id order with a
+    "total" match count."""
+    user = current_principal()
+    if not user:
+        return jsonify({"error": "Unauthorized"}), 401
+    if user.role != "admin":
+        return jsonify({"error": "Forbidden"}), 403
+    page, err = parse_page_args("profiles:skills")
+    if err:
+        return jsonify({"error": err}), 400
+    try:
+        ids = search_profiles(request.args.get("skills", ""))
+    except SkillQueryError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    limit = page.limit or DEFAULT_PAGE_SIZE
+    start = int(ids.searchsorted(page.after[0], side="right")) if page.after else 0
+    page_ids = ids[start:start + limit].tolist()
+    profiles = Profile.query.filter(Profile.id.in_(page_ids)).order_by(Profile.id).all() if page_ids else []
+    next_cursor = encode_cursor(page.scope, [page_ids[-1]]) if start + limit < ids.size else None
+    return jsonify({
+        "items": [_profile_to_dict(p) for p in profiles],
+        "next_cursor": next_cursor,
+        "total": int(ids.size),
+    }), 200
 
 
 @profiles_bp.route("/", methods=["POST"])
@@ -57,7 +100,7 @@ def create_profile():
     if err:
         return jsonify({"error": err}), 400
 
-    user = User.query.get(int(get_jwt_identity()))
+    user = current_principal()
     if not user:
         return jsonify({"error": "Unauthorized"}), 401
     if user.role == "user" and user_id != user.id:
@@ -88,7 +131,7 @@ def get_profile(profile_id):
     profile = Profile.query.get(profile_id)
     if not profile:
         return jsonify({"error": "Not found"}), 404
-    user = User.query.get(int(get_jwt_identity()))
+    user = current_principal()
     if not user:
         return jsonify({"error": "Unauthorized"}), 401
     if user.role == "admin":
@@ -104,7 +147,7 @@ def update_profile(profile_id):
     profile = Profile.query.get(profile_id)
     if not profile:
         return jsonify({"error": "Not found"}), 404
-    user = User.query.get(int(get_jwt_identity()))
+    user = current_principal()
     if not user:
         return jsonify({"error": "Unauthorized"}), 401
     if user.role == "admin":
@@ -148,7 +191,7 @@ def delete_profile(profile_id):
     profile = Profile.query.get(profile_id)
     if not profile:
         return jsonify({"error": "Not found"}), 404
-    user = User.query.get(int(get_jwt_identity()))
+    user = current_principal()
     if not user:
         return jsonify({"error": "Unauthorized"}), 401
     if user.role == "admin":
@@ -165,7 +208,7 @@ def delete_profile(profile_id):
 @profiles_bp.route("/me", methods=["GET"])
 @jwt_required()
 def get_my_profile():
-    user = User.query.get(int(get_jwt_identity()))
+    user = current_principal()
     if not user:
         return jsonify({"error": "Unauthorized"}), 401
     if user.role != "user":
@@ -179,7 +222,7 @@ def get_my_profile():
 @profiles_bp.route("/me", methods=["POST"])
 @jwt_required()
 def create_my_profile():
-    user = User.query.get(int(get_jwt_identity()))
+    user = current_principal()
     if not user:
         return jsonify({"error": "Unauthorized"}), 401
     if user.role != "user":
@@ -217,7 +260,7 @@ def create_my_profile():
 @profiles_bp.route("/me", methods=["PUT"])
 @jwt_required()
 def update_my_profile():
-    user = User.query.get(int(get_jwt_identity()))
+    user = current_principal()
     if not user:
         return jsonify({"error": "Unauthorized"}), 401
     if user.role != "user":
@@ -251,10 +294,38 @@ def update_my_profile():
     return jsonify(_profile_to_dict(profile)), 200
 
 
+@profiles_bp.route("/me/recommendations", methods=["GET"])
+@jwt_required()
+def my_recommendations():
+    """Jobs best matching the profile's skills and experience, best first,
+    with a 0..1 "score" and the "matched_skills". Jobs already applied to
+    are left out."""
+    user = current_principal()
+    if not user:
+        return jsonify({"error": "Unauthorized"}), 401
+    if user.role != "user":
+        return jsonify({"error": "Forbidden"}), 403
+    profile = Profile.query.filter_by(user_id=user.id).first()
+    if not profile:
+        return jsonify({"error": "Not found"}), 404
+    limit, err = _parse_int(request.args.get("limit", 10), "limit")
+    if err or limit < 1:
+        return jsonify({"error": "Invalid limit"}), 400
+    limit = min(limit, matching.MAX_RESULTS)
+
+    ranked = matching.recommend(profile, limit)
+    jobs = {job.id: job for job in Job.query.filter(Job.id.in_([job_id for job_id, _, _ in ranked]))} if ranked else {}
+    items = [
+        {**_job_to_dict(jobs[job_id]), "score": score, "matched_skills": skills}
+        for job_id, score, skills in ranked if job_id in jobs
+    ]
+    return jsonify({"items": items}), 200
+
+
 @profiles_bp.route("/me", methods=["DELETE"])
 @jwt_required()
 def delete_my_profile():
-    user = User.query.get(int(get_jwt_identity()))
+    user = current_principal()
     if not user:
         return jsonify({"error": "Unauthorized"}), 401
     if user.role != "user":
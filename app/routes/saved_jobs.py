@@ -1,8 +1,12 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from sqlalchemy.exc import IntegrityError
 from ..extensions import db
-from ..models import SavedJob, Job, User
+from ..models import SavedJob, Job, Employer
+from ..principal import current_principal
+from ..conditional import conditional
+from ..pagination import page_response, paginate, parse_page_args
+from .jobs import _job_to_dict
 
 saved_jobs_bp = Blueprint("saved_jobs", __name__)
 
@@ -16,22 +20,68 @@ def _saved_job_to_dict(saved):
     }
 
 
+def _employer_summary(employer):
+    return {
+        "id": employer.id,
+        "company_name": employer.company_name,
+        "location": employer.location,
+    }
+
+
 @saved_jobs_bp.route("/", methods=["GET"])
 @jwt_required()
+@conditional("saved_jobs", "jobs", "employers")  # ?expand=employer embeds company details
 def list_saved_jobs():
-    user = User.query.get(int(get_jwt_identity()))
+    user = current_principal()
     if not user:
         return jsonify({"error": "Unauthorized"}), 401
     if user.role != "user":
         return jsonify({"error": "Forbidden"}), 403
-    saved = SavedJob.query.filter_by(user_id=user.id).all()
-    return jsonify([_saved_job_to_dict(s) for s in saved]), 200
+    page, err = parse_page_args("saved_jobs")
+    if err:
+        return jsonify({"error": err}), 400
+
+    # ?expand=job inlines each saved posting (and ?expand=job,employer its
+    # company) from a single JOIN, so clients don't fetch the whole catalogue.
+    expand = {e.strip() for e in request.args.get("expand", "").split(",") if e.strip()}
+    if expand - {"job", "employer"}:
+        return jsonify({"error": "Invalid expand"}), 400
+    if expand:
+        rows_query = (
+            db.session.query(SavedJob, Job)
+            .join(Job, Job.id == SavedJob.job_id)
+            .filter(SavedJob.user_id == user.id)
+        )
+        if "employer" in expand:
+            rows_query = rows_query.add_entity(Employer).join(Employer, Employer.id == Job.employer_id)
+        rows, next_cursor = paginate(
+            rows_query,
+            [SavedJob.created_at, SavedJob.id],
+            lambda row: (row.SavedJob.created_at, row.SavedJob.id),
+            page,
+        )
+        items = []
+        for row in rows:
+            item = _saved_job_to_dict(row.SavedJob)
+            item["job"] = _job_to_dict(row.Job)
+            if "employer" in expand:
+                item["employer"] = _employer_summary(row.Employer)
+            items.append(item)
+        return page_response(page, items, next_cursor), 200
+
+    saved, next_cursor = paginate(
+        SavedJob.query.filter_by(user_id=user.id),
+        [SavedJob.created_at, SavedJob.id],
+        lambda s: (s.created_at, s.id),
+        page,
+    )
+    return page_response(page, [_saved_job_to_dict(s) for s in saved], next_cursor), 200
 
 
 @saved_jobs_bp.route("/", methods=["POST"])
 @jwt_required()
 def save_job():
-    user = User.query.get(int(get_jwt_identity()))
+    user = current_principal()
     if not user:
         return jsonify({"error": "Unauthorized"}), 401
     if user.role != "user":
@@ -59,7 +109,7 @@ def save_job():
 @saved_jobs_bp.route("/<int:job_id>", methods=["DELETE"])
 @jwt_required()
 def unsave_job(job_id):
-    user = User.query.get(int(get_jwt_identity()))
+    user = current_principal()
     if not user:
         return jsonify({"error": "Unauthorized"}), 401
     if user.role != "user":
@@ -1,8 +1,11 @@
 from flask import Blueprint, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 
 from ..extensions import db
 from ..models import User
+from ..principal import current_principal, invalidate_principal
+from ..conditional import conditional
+from ..pagination import page_response, paginate, parse_page_args
 
 users_bp = Blueprint("users", __name__)
 
@@ -19,20 +22,24 @@ def _user_to_dict(user):
 
 @users_bp.route("/", methods=["GET"])
 @jwt_required()
+@conditional("users")
 def list_users():
-    user = User.query.get(int(get_jwt_identity()))
+    user = current_principal()
     if not user:
         return jsonify({"error": "Unauthorized"}), 401
     if user.role != "admin":
         return jsonify({"error": "Forbidden"}), 403
-    users = User.query.order_by(User.id.asc()).all()
-    return jsonify([_user_to_dict(u) for u in users]), 200
+    page, err = parse_page_args("users")
+    if err:
+        return jsonify({"error": err}), 400
+    users, next_cursor = paginate(User.query, [User.id], lambda u: (u.id,), page)
+    return page_response(page, [_user_to_dict(u) for u in users], next_cursor), 200
 
 
 @users_bp.route("/<int:user_id>", methods=["DELETE"])
 @jwt_required()
 def delete_user(user_id):
-    user = User.query.get(int(get_jwt_identity()))
+    user = current_principal()
     if not user:
         return jsonify({"error": "Unauthorized"}), 401
     if user.role != "admin":
@@ -46,4 +53,5 @@ def delete_user(user_id):
 
     db.session.delete(target)
     db.session.commit()
+    invalidate_principal(user_id)
     return jsonify({"message": "Deleted"}), 200
@@ -0,0 +1,81 @@
+import re
+
+from flask import current_app
+from sqlalchemy import column, func, literal_column, select, table, text
+from sqlalchemy.exc import OperationalError
+
+# Full-text index over jobs.title/jobs.description. It is an "external content"
+# FTS5 table, so it stores only the index and reads the text back from `jobs`;
+# the triggers below keep it in sync on every insert/update/delete (including
+# rows removed by ON DELETE CASCADE).
+FTS_TABLE = "jobs_fts"
+TITLE_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5("
+    "title, description, content='jobs', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE TRIGGER IF NOT EXISTS jobs_fts_ai AFTER INSERT ON jobs BEGIN "
+    "INSERT INTO jobs_fts(rowid, title, description) VALUES (new.id, new.title, new.description); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS jobs_fts_ad AFTER DELETE ON jobs BEGIN "
+    "INSERT INTO jobs_fts(jobs_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS jobs_fts_au AFTER UPDATE OF title, description ON jobs BEGIN "
+    "INSERT INTO jobs_fts(jobs_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO jobs_fts(rowid, title, description) VALUES (new.id, new.title, new.description); "
+    "END",
+]
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+jobs_fts = table(FTS_TABLE, column("rowid"))
+
+
+def install_jobs_fts(engine):
+    """Create the FTS table and triggers if missing. Returns False when the
+    database cannot host them (non-SQLite, or SQLite built without FTS5)."""
+    if engine.dialect.name != "sqlite":
+        return False
+    try:
+        with engine.begin() as conn:
+            existed = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type='table' AND name=:n"),
+                {"n": FTS_TABLE}
+            ).first() is not None
+            for statement in FTS_DDL:
+                conn.execute(text(statement))
+            if not existed:
+                conn.execute(text("INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')"))
+    except OperationalError as exc:
+        current_app.logger.warning("Job full-text index unavailable: %s", exc)
+        return False
+    return True
+
+
+def fts_enabled():
+    return bool(current_app.extensions.get("jobs_fts"))
+
+
+def build_match_expression(query_text):
+    # Every word must match as a prefix ("pyth dev" -> "pyth"* AND "dev"*).
+    # Quoting each token keeps user input from being parsed as FTS5 syntax.
+    tokens = _TOKEN_RE.findall(query_text or "")
+    if not tokens:
+        return None
+    return " ".join(f'"{t}"*' for t in tokens)
+
+
+def match_subquery(query_text):
+    """Subquery of (job_id, rank) rows matching `query_text`, or None when the
+    text has no searchable tokens. Lower rank is better (BM25)."""
+    expression = build_match_expression(query_text)
+    if expression is None:
+        return None
+    rank = func.bm25(literal_column(FTS_TABLE), TITLE_WEIGHT, DESCRIPTION_WEIGHT)
+    return (
+        select(jobs_fts.c.rowid.label("job_id"), rank.label("rank"))
+        .where(text(f"{FTS_TABLE} MATCH :fts_query").bindparams(fts_query=expression))
+        .subquery("job_matches")
+    )
@@ -0,0 +1,340 @@
+import json
+import os
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+import click
+import numpy as np
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import select
+
+from .changes import models_committed
+from .extensions import db
+from .models import Job
+
+# "Similar jobs": every posting's title + description is turned into a hashed
+# bag-of-words vector (each word hashed to one of SIMILAR_DIMENSIONS slots with a
+# +/-1 sign, sublinear term frequency, title words counted double, L2
+# normalized), so cosine similarity is a dot product. Vectors live in a raw
+# float32 file in the instance folder, one row per job id, memory-mapped by
+# every worker: a lookup is one matrix-vector product over the mapped rows.
+# Rows are rewritten as jobs are committed and zeroed when they are deleted.
+# A sidecar "<file>.json" written by each build records the database URL and
+# the newest job at the time; each process checks it once, in the background
+# after its first request, and rebuilds the file if that job is gone (another
+# or a restored database). Rebuilds replace the file; workers notice the new
+# inode and remap it.
+MAX_RESULTS = 50
+TITLE_WEIGHT = 2.0
+GROW_ROWS = 16384
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our the this to we will with you your".split()
+)
+
+similar_cli = AppGroup("similar", help="Maintain the similar-jobs vectors.")
+
+
+def _tokens(text):
+    return [w for w in _WORD_RE.findall((text or "").lower()) if len(w) > 1 and w not in _STOPWORDS]
+
+
+def vectorize(title, description, dimensions):
+    counts = {}
+    for weight, text in ((TITLE_WEIGHT, title), (1.0, description)):
+        for word in _tokens(text):
+            counts[word] = counts.get(word, 0.0) + weight
+    vector = np.zeros(dimensions, dtype=np.float32)
+    if not counts:
+        return vector
+    hashes = np.fromiter((zlib.crc32(w.encode()) for w in counts), dtype=np.uint64, count=len(counts))
+    signs = np.where(hashes & (1 << 31), -1.0, 1.0).astype(np.float32)
+    weights = 1.0 + np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+    np.add.at(vector, (hashes % dimensions).astype(np.intp), signs * weights)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class VectorStore:
+    """Job vectors in a memory-mapped file shared by every worker, plus a
+    per-process LRU of top-MAX_RESULTS lists keyed by job id."""
+
+    def __init__(self, path, dimensions, cache_size=1024, cache_ttl=300):
+        self.path = path
+        self.dimensions = dimensions
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._matrix = None
+        self._inode = None
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()  # job_id -> (expires_at, query vector, [(id, score), ...])
+        self.hits = 0
+        self.misses = 0
+
+    def _row_bytes(self):
+        return self.dimensions * 4
+
+    def _mapped(self):
+        # Another worker may have grown the file, or rebuilt it (a new inode),
+        # since it was mapped.
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            stat = None
+        rows = stat.st_size // self._row_bytes() if stat else 0
+        inode = stat.st_ino if stat else None
+        if inode != self._inode:
+            self._cache.clear()
+        if self._matrix is None or self._matrix.shape[0] != rows or inode != self._inode:
+            self._matrix = np.memmap(self.path, dtype=np.float32, mode="r+", shape=(rows, self.dimensions)) if rows else None
+            self._inode = inode
+        return self._matrix
+
+    def _ensure_rows(self, rows):
+        matrix = self._mapped()
+        if matrix is not None and matrix.shape[0] >= rows:
+            return matrix
+        target = (rows // GROW_ROWS + 1) * GROW_ROWS
+        if matrix is not None:
+            matrix.flush()
+        self._matrix = None
+        with open(self.path, "ab") as fh:
+            if fh.tell() < target * self._row_bytes():
+                fh.truncate(target * self._row_bytes())
+        return self._mapped()
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def _fingerprint(self, connection):
+        newest = connection.execute(select(Job.id, Job.created_at).order_by(Job.id.desc()).limit(1)).first()
+        return {
+            "database": db.engine.url.render_as_string(hide_password=True),
+            "job": [newest.id, newest.created_at.isoformat() if newest.created_at else None] if newest else None,
+        }
+
+    def is_current(self):
+        """Whether the file exists and was built from this database: same URL
+        and the job that was newest at build time still there."""
+        try:
+            with open(f"{self.path}.json") as fh:
+                stored = json.load(fh)
+        except (OSError, ValueError):
+            return False
+        if not self.exists() or stored.get("database") != db.engine.url.render_as_string(hide_password=True):
+            return False
+        if not stored.get("job"):
+            return True
+        job_id, created_at = stored["job"]
+        with db.engine.connect() as connection:
+            row = connection.execute(select(Job.created_at).where(Job.id == job_id)).first()
+        return row is not None and (row.created_at.isoformat() if row.created_at else None) == created_at
+
+    def build(self, batch_size=2000):
+        """Rewrite the whole file from the jobs table. Returns jobs indexed."""
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        total = 0
+        with db.engine.connect() as connection:
+            fingerprint = self._fingerprint(connection)
+            max_id = connection.scalar(select(db.func.max(Job.id))) or 0
+            rows = (max_id // GROW_ROWS + 1) * GROW_ROWS
+            matrix = np.memmap(tmp_path, dtype=np.float32, mode="w+", shape=(rows, self.dimensions))
+            result = connection.execution_options(yield_per=batch_size).execute(
+                select(Job.id, Job.title, Job.description).where(Job.id <= max_id)
+            )
+            for job_id, title, description in result:
+                matrix[job_id] = vectorize(title, description, self.dimensions)
+                total += 1
+        matrix.flush()
+        del matrix
+        with self._lock:
+            self._matrix = None
+            os.replace(tmp_path, self.path)
+            self._cache.clear()
+        meta_path = f"{self.path}.json"
+        with open(f"{meta_path}.{os.getpid()}.tmp", "w") as fh:
+            json.dump(fingerprint, fh)
+        os.replace(fh.name, meta_path)
+        return total
+
+    def update(self, vectors):
+        """Write {job_id: vector}; a None vector clears the row (deleted job)."""
+        if not vectors:
+            return
+        with self._lock:
+            matrix = self._ensure_rows(max(vectors) + 1)
+            for job_id, vector in vectors.items():
+                matrix[job_id] = 0.0 if vector is None else vector
+            self._invalidate(vectors)
+
+    def _invalidate(self, vectors):
+        # A cached list only goes stale if one of its jobs changed or a changed
+        # job now scores at least as high as the list's last entry.
+        for job_id in list(self._cache):
+            _, query, results = self._cache[job_id]
+            if job_id in vectors or any(other in vectors for other, _ in results):
+                del self._cache[job_id]
+                continue
+            floor = results[-1][1] if len(results) >= MAX_RESULTS else 0.0
+            for vector in vectors.values():
+                if vector is not None and float(vector @ query) >= floor:
+                    del self._cache[job_id]
+                    break
+
+    def vector(self, job_id):
+        matrix = self._mapped()
+        if matrix is None or job_id >= matrix.shape[0]:
+            return None
+        row = np.array(matrix[job_id])
+        return row if row.any() else None
+
+    def nearest(self, query, exclude_id=None, candidate_ids=None, limit=MAX_RESULTS):
+        """[(job_id, cosine)] best first, over all rows or just `candidate_ids`."""
+        matrix = self._mapped()
+        if matrix is None:
+            return []
+        if candidate_ids is not None:
+            ids = np.array([i for i in candidate_ids if i < matrix.shape[0] and i != exclude_id], dtype=np.intp)
+            if ids.size == 0:
+                return []
+            scores = matrix[ids] @ query
+        else:
+            ids = None
+            scores = matrix @ query
+            if exclude_id is not None and exclude_id < scores.shape[0]:
+                scores[exclude_id] = 0.0
+        limit = min(limit, scores.shape[0])
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [
+            (int(ids[i]) if ids is not None else int(i), round(float(scores[i]), 4))
+            for i in top if scores[i] > 0
+        ]
+
+    def similar_to(self, job_id, query):
+        with self._lock:
+            entry = self._cache.get(job_id)
+            if entry is not None and entry[0] > time.monotonic():
+                self._cache.move_to_end(job_id)
+                self.hits += 1
+                return entry[2]
+        self.misses += 1
+        results = self.nearest(query, exclude_id=job_id)
+        with self._lock:
+            self._cache[job_id] = (time.monotonic() + self.cache_ttl, query, results)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return results
+
+    def stats(self):
+        matrix = self._mapped()
+        return {
+            "rows": 0 if matrix is None else matrix.shape[0],
+            "dimensions": self.dimensions,
+            "cached": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def _check_store(app):
+    # Once per process, off the request path: a file left over from another
+    # database is rebuilt; requests meanwhile keep using it.
+    state = app.extensions["similar"]
+    with app.app_context():
+        try:
+            with state["build_lock"]:
+                store = state["store"]
+                if store.exists() and not store.is_current():
+                    store.build()
+        except Exception:
+            app.logger.exception("Similar-jobs vector check failed")
+        finally:
+            db.session.remove()
+
+
+def get_store():
+    """The app's VectorStore, built from the jobs table on first use."""
+    state = current_app.extensions["similar"]
+    store = state["store"]
+    if not store.exists():
+        with state["build_lock"]:
+            if not store.exists():
+                store.build()
+    return store
+
+
+def similar_jobs(job, limit, candidate_ids=None):
+    """[(job_id, cosine)] for the postings most like `job`, best first.
+    Restricted to `candidate_ids` (uncached) when given."""
+    store = get_store()
+    query = store.vector(job.id)
+    if query is None:
+        query = vectorize(job.title, job.description, store.dimensions)
+    if candidate_ids is not None:
+        return store.nearest(query, exclude_id=job.id, candidate_ids=candidate_ids, limit=limit)
+    return store.similar_to(job.id, query)[:limit]
+
+
+def _update_on_commit(app, changes, **extra):
+    store = app.extensions["similar"]["store"]
+    if not store.exists():
+        return
+    vectors = {}
+    for change in changes:
+        if change.model != "Job" or change.id is None:
+            continue
+        if change.op == "delete":
+            vectors[change.id] = None
+        elif "title" in change.values and "description" in change.values:
+            vectors[change.id] = vectorize(change.values["title"], change.values["description"], store.dimensions)
+    try:
+        store.update(vectors)
+    except OSError as exc:
+        app.logger.error("Similar-jobs vector update failed: %s", exc)
+
+
+@similar_cli.command("index")
+def index_command():
+    """Rebuild the vector file from the jobs table."""
+    started = time.perf_counter()
+    total = current_app.extensions["similar"]["store"].build()
+    click.echo(f"Indexed {total} jobs in {time.perf_counter() - started:.1f}s")
+
+
+def init_app(app):
+    dimensions = app.config.get("SIMILAR_DIMENSIONS", 256)
+    path = app.config.get("SIMILAR_VECTORS_PATH") or os.path.join(
+        app.instance_path, f"job_vectors-{dimensions}.f32"
+    )
+    app.extensions["similar"] = {
+        "store": VectorStore(
+            path,
+            dimensions,
+            cache_size=app.config.get("SIMILAR_CACHE_SIZE", 1024),
+            cache_ttl=app.config.get("SIMILAR_CACHE_TTL", 300),
+        ),
+        "build_lock": threading.Lock(),
+        "checker": None,
+    }
+    app.cli.add_command(similar_cli)
+    models_committed.connect(_update_on_commit, sender=app, weak=False)
+    lock = threading.Lock()
+
+    # Started on the first request, like the ingest scheduler, so CLI
+    # commands and migrations never touch the vector file.
+    @app.before_request
+    def _start_check():
+        state = app.extensions["similar"]
+        if state["checker"] is None:
+            with lock:
+                if state["checker"] is None:
+                    state["checker"] = threading.Thread(
+                        target=_check_store, args=(app,), name="similar-check", daemon=True
+                    )
+                    state["checker"].start()
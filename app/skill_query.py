@@ -0,0 +1,212 @@
+import re
+
+import numpy as np
+from sqlalchemy import func, select
+
+from .extensions import db
+from .matching import normalize_skill
+from .models import ProfileSkill, Skill
+
+# Boolean skill queries over the profile_skills posting lists:
+#
+#     python AND (sql OR postgres) AND NOT java
+#     "machine learning" OR ml
+#
+# Operators are AND, OR, NOT (any case) and parentheses; AND binds tighter than
+# OR. Adjacent words form one multi-word skill, normalized like Profile.skills
+# (so "JS" finds javascript). NOT only narrows an AND; a query can't ask for
+# "everyone without X".
+#
+# Each posting list is read in profile_id order from the (skill_id,
+# profile_id) primary key. AND starts from its rarest term and passes its
+# running result down to the rest (through OR groups too); a term whose list
+# is much longer than that result is probed for just those ids instead of
+# being read whole. Cost follows the sizes of the lists involved and of the
+# result, not the number of profiles.
+PROBE_RATIO = 8
+SIZE_CAP = 4096
+MAX_TERMS = 20
+
+_TOKEN_RE = re.compile(r'\s*(?:(\()|(\))|"([^"]*)"|([^\s()"]+))')
+_OPERATORS = {"AND", "OR", "NOT"}
+
+
+class SkillQueryError(ValueError):
+    pass
+
+
+def _tokenize(text):
+    tokens = []
+    position = 0
+    text = text or ""
+    joinable = False
+    while position < len(text):
+        match = _TOKEN_RE.match(text, position)
+        if match is None or match.end() == position:
+            if text[position:].strip():
+                raise SkillQueryError("Unbalanced quotes")
+            break
+        position = match.end()
+        opening, closing, quoted, word = match.groups()
+        if opening:
+            tokens.append(("(", None))
+        elif closing:
+            tokens.append((")", None))
+        elif quoted is not None:
+            tokens.append(("term", quoted))
+        elif word.upper() in _OPERATORS:
+            tokens.append((word.upper(), None))
+        elif joinable:
+            tokens[-1] = ("term", f"{tokens[-1][1]} {word}")
+        else:
+            tokens.append(("term", word))
+        joinable = word is not None and word.upper() not in _OPERATORS
+    return tokens
+
+
+class _Parser:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self):
+        return self.tokens[self.position][0] if self.position < len(self.tokens) else None
+
+    def take(self):
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def parse(self):
+        if not self.tokens:
+            raise SkillQueryError("Empty query")
+        node = self.parse_or()
+        if self.peek() is not None:
+            raise SkillQueryError(f"Unexpected {self.peek()}")
+        return node
+
+    def parse_or(self):
+        children = [self.parse_and()]
+        while self.peek() == "OR":
+            self.take()
+            children.append(self.parse_and())
+        return children[0] if len(children) == 1 else ("or", children)
+
+    def parse_and(self):
+        children = [self.parse_not()]
+        while self.peek() == "AND":
+            self.take()
+            children.append(self.parse_not())
+        return children[0] if len(children) == 1 else ("and", children)
+
+    def parse_not(self):
+        if self.peek() == "NOT":
+            self.take()
+            return ("not", self.parse_not())
+        return self.parse_atom()
+
+    def parse_atom(self):
+        kind = self.peek()
+        if kind == "(":
+            self.take()
+            node = self.parse_or()
+            if self.peek() != ")":
+                raise SkillQueryError("Missing )")
+            self.take()
+            return node
+        if kind == "term":
+            raw = self.take()[1]
+            name = normalize_skill(raw)
+            if name is None:
+                raise SkillQueryError(f"Invalid skill: {raw}")
+            return ("term", name)
+        raise SkillQueryError("Unexpected end of query" if kind is None else f"Unexpected {kind}")
+
+
+def parse(text):
+    """Query text -> tree of ("term", name), ("and"|"or", [children]) and
+    ("not", child). Raises SkillQueryError."""
+    return _Parser(_tokenize(text)).parse()
+
+
+def _terms(node):
+    if node[0] == "term":
+        return [node[1]]
+    if node[0] == "not":
+        return _terms(node[1])
+    return [name for child in node[1] for name in _terms(child)]
+
+
+class _Evaluator:
+    def __init__(self, connection, names):
+        self.connection = connection
+        self.ids = dict(connection.execute(select(Skill.name, Skill.id).where(Skill.name.in_(names))).all())
+        # Only needs to be exact for short lists, so counting stops at SIZE_CAP.
+        self.sizes = {
+            skill_id: connection.execute(
+                select(func.count()).select_from(
+                    select(ProfileSkill.profile_id).where(ProfileSkill.skill_id == skill_id).limit(SIZE_CAP).subquery()
+                )
+            ).scalar()
+            for skill_id in self.ids.values()
+        }
+
+    def size(self, node):
+        # Posting-list length for a term; unknown (evaluated last) otherwise.
+        if node[0] == "term":
+            return self.sizes.get(self.ids.get(node[1]), 0)
+        return float("inf")
+
+    def posting(self, name, within=None):
+        skill_id = self.ids.get(name)
+        if skill_id is None:
+            return np.zeros(0, dtype=np.int64)
+        query = select(ProfileSkill.profile_id).where(ProfileSkill.skill_id == skill_id)
+        if within is None:
+            return np.fromiter(
+                self.connection.execute(query.order_by(ProfileSkill.profile_id)).scalars(), dtype=np.int64
+            )
+        found = []
+        for start in range(0, within.size, 500):
+            chunk = within[start:start + 500].tolist()
+            found.extend(self.connection.execute(query.where(ProfileSkill.profile_id.in_(chunk))).scalars())
+        return np.unique(np.array(found, dtype=np.int64))
+
+    def evaluate(self, node, within=None):
+        """Sorted profile ids matching `node`, restricted to `within` if given."""
+        kind = node[0]
+        if kind == "term":
+            if within is not None and within.size * PROBE_RATIO < self.size(node):
+                return self.posting(node[1], within)
+            result = self.posting(node[1])
+            return result if within is None else np.intersect1d(within, result, assume_unique=True)
+        if kind == "not":
+            raise SkillQueryError("NOT must be combined with AND and a positive term")
+        if kind == "or":
+            result = np.zeros(0, dtype=np.int64)
+            for child in node[1]:
+                result = np.union1d(result, self.evaluate(child, within))
+            return result
+        positives = sorted((c for c in node[1] if c[0] != "not"), key=self.size)
+        negatives = sorted((c[1] for c in node[1] if c[0] == "not"), key=self.size)
+        if not positives:
+            raise SkillQueryError("NOT must be combined with AND and a positive term")
+        result = within
+        for child in positives:
+            result = self.evaluate(child, result)
+            if result.size == 0:
+                return result
+        for child in negatives:
+            result = np.setdiff1d(result, self.evaluate(child, result), assume_unique=True)
+            if result.size == 0:
+                return result
+        return result
+
+
+def search_profiles(text):
+    """Ascending profile ids matching boolean skill query `text`."""
+    tree = parse(text)
+    names = list(dict.fromkeys(_terms(tree)))
+    if len(names) > MAX_TERMS:
+        raise SkillQueryError(f"At most {MAX_TERMS} skills per query")
+    return _Evaluator(db.session.connection(), names).evaluate(tree)
@@ -0,0 +1,82 @@
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+
+def apply_pragmas(dbapi_connection, pragmas):
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA foreign_keys=ON")
+        for name, value in pragmas.items():
+            if value is None:
+                continue
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def run_maintenance(dbapi_connection):
+    # Refresh planner statistics for tables whose shape changed and fold the
+    # WAL back into the main file without waiting on active readers.
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA optimize")
+        cursor.execute("PRAGMA wal_checkpoint(PASSIVE)")
+    except sqlite3.OperationalError:
+        pass
+    finally:
+        cursor.close()
+
+
+@contextmanager
+def statement_deadline(connection, seconds):
+    """Abort statements run on `connection` (a SQLAlchemy Connection) once
+    `seconds` have passed; SQLite then raises OperationalError "interrupted".
+    No-op on other databases or when `seconds` is falsy."""
+    if connection.dialect.name != "sqlite" or not seconds:
+        yield
+        return
+    raw = connection.connection.driver_connection
+    deadline = time.monotonic() + seconds
+    raw.set_progress_handler(lambda: time.monotonic() > deadline, 1000)
+    try:
+        yield
+    finally:
+        raw.set_progress_handler(None, 0)
+
+
+def init_engine(app, engine):
+    """Attach the SQLITE_PRAGMAS profile to this app's engine only.
+
+    Every new pooled connection gets the pragmas; connections returned to
+    the pool run maintenance at most once per SQLITE_MAINTENANCE_INTERVAL
+    seconds (0 turns it off).
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    pragmas = dict(app.config.get("SQLITE_PRAGMAS") or {})
+    interval = app.config.get("SQLITE_MAINTENANCE_INTERVAL", 0)
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        apply_pragmas(dbapi_connection, pragmas)
+
+    if not interval:
+        return
+
+    lock = threading.Lock()
+    last_run = [time.monotonic()]
+
+    @event.listens_for(engine, "checkin")
+    def _periodic_maintenance(dbapi_connection, connection_record):
+        if dbapi_connection is None:
+            return
+        now = time.monotonic()
+        with lock:
+            if now - last_run[0] < interval:
+                return
+            last_run[0] = now
+        run_maintenance(dbapi_connection)
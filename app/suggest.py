@@ -0,0 +1,374 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+
+import click
+import numpy as np
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import func, select
+
+from .changes import models_committed
+from .extensions import db
+from .models import Employer, Job
+
+# Typeahead for the jobs search box (GET /jobs/suggest). Job titles, locations
+# and company names are counted per normalized value (lowercase, single
+# spaces) and every word-start suffix of a value is kept in one sorted array
+# per kind, so "dev" finds "Senior Python Developer" by bisecting to the range
+# of suffixes starting with "dev". Each suffix carries its value's score
+# (frequency, ties alphabetical) and the best of a range are picked with
+# argpartition; ranges for 1-2 character prefixes are large and are memoized.
+#
+# The arrays are written to one .npz snapshot in the instance folder and every
+# worker loads it, reloading when the file changes. A worker applies its own
+# job writes to a small overlay straight away and schedules a rebuild of the
+# snapshot from the jobs table at most every SUGGEST_REBUILD_INTERVAL seconds,
+# which is when other workers see them.
+KINDS = ("title", "location", "company")
+MAX_RESULTS = 20
+MAX_PREFIX_LENGTH = 64
+SHORT_PREFIX = 2
+FETCH = MAX_RESULTS * 2
+_END = "\U0010ffff"
+
+suggest_cli = AppGroup("suggest", help="Maintain the job search typeahead.")
+
+
+def normalize(text):
+    return " ".join((text or "").lower().split())
+
+
+def _suffixes(key):
+    words = key.split(" ")
+    return list(dict.fromkeys(" ".join(words[i:]) for i in range(len(words))))
+
+
+def _join(strings):
+    return np.frombuffer("\n".join(strings).encode(), dtype=np.uint8)
+
+
+def _split(blob):
+    text = blob.tobytes().decode()
+    return text.split("\n") if text else []
+
+
+class PrefixIndex:
+    """Values of one kind: `entry_keys` (sorted normalized values), their
+    display `texts` and `weights`, plus the sorted word-start suffixes `keys`
+    and the entry each one belongs to."""
+
+    def __init__(self, entry_keys, texts, weights, keys, key_entry):
+        self.entry_keys = entry_keys
+        self.texts = texts
+        self.weights = weights
+        self.keys = keys
+        self.key_entry = key_entry
+        n = len(keys)
+        self.scores = weights[key_entry] * max(n, 1) + np.arange(n - 1, -1, -1, dtype=np.int64)
+        self._short = {}
+
+    @classmethod
+    def from_counts(cls, rows):
+        """(raw value, count) rows -> index; values equal once normalized are
+        merged and shown with their most common spelling."""
+        groups = {}
+        for text, count in rows:
+            key = normalize(text)
+            if not key:
+                continue
+            group = groups.get(key)
+            if group is None:
+                groups[key] = [" ".join(text.split()), count, count]
+            else:
+                group[1] += count
+                if count > group[2]:
+                    group[0], group[2] = " ".join(text.split()), count
+        entry_keys = sorted(groups)
+        pairs = sorted((suffix, i) for i, key in enumerate(entry_keys) for suffix in _suffixes(key))
+        return cls(
+            entry_keys,
+            [groups[key][0] for key in entry_keys],
+            np.array([groups[key][1] for key in entry_keys], dtype=np.int64),
+            [suffix for suffix, _ in pairs],
+            np.array([i for _, i in pairs], dtype=np.int64),
+        )
+
+    def arrays(self, kind):
+        return {
+            f"{kind}_entry_keys": _join(self.entry_keys),
+            f"{kind}_texts": _join(self.texts),
+            f"{kind}_weights": self.weights,
+            f"{kind}_keys": _join(self.keys),
+            f"{kind}_key_entry": self.key_entry,
+        }
+
+    @classmethod
+    def from_arrays(cls, data, kind):
+        return cls(
+            _split(data[f"{kind}_entry_keys"]),
+            _split(data[f"{kind}_texts"]),
+            data[f"{kind}_weights"].astype(np.int64),
+            _split(data[f"{kind}_keys"]),
+            data[f"{kind}_key_entry"].astype(np.int64),
+        )
+
+    def weight(self, key):
+        i = bisect_left(self.entry_keys, key)
+        return int(self.weights[i]) if i < len(self.entry_keys) and self.entry_keys[i] == key else 0
+
+    def top(self, prefix):
+        """Up to FETCH [(key, text, weight)] starting with `prefix`, best first."""
+        short = len(prefix) <= SHORT_PREFIX
+        if short and prefix in self._short:
+            return self._short[prefix]
+        lo = bisect_left(self.keys, prefix)
+        hi = bisect_left(self.keys, prefix + _END, lo)
+        if hi - lo > FETCH:
+            picked = np.argpartition(-self.scores[lo:hi], FETCH - 1)[:FETCH] + lo
+        else:
+            picked = np.arange(lo, hi)
+        picked = picked[np.argsort(-self.scores[picked])]
+        results = []
+        seen = set()
+        for entry in self.key_entry[picked].tolist():
+            if entry not in seen:
+                seen.add(entry)
+                results.append((self.entry_keys[entry], self.texts[entry], int(self.weights[entry])))
+        if short:
+            self._short[prefix] = results
+        return results
+
+
+class SuggestIndex:
+    def __init__(self, kinds, built_at):
+        self.kinds = kinds
+        self.built_at = built_at
+
+    @classmethod
+    def build(cls, employer_id=None):
+        """Count titles, locations and companies across the jobs table (or one
+        employer's jobs)."""
+        built_at = time.time()
+        queries = {
+            "title": select(Job.title, func.count()).group_by(Job.title),
+            "location": select(Job.location, func.count()).group_by(Job.location),
+            "company": select(Employer.company_name, func.count())
+            .join(Job, Job.employer_id == Employer.id).group_by(Employer.company_name),
+        }
+        kinds = {}
+        for kind, query in queries.items():
+            if employer_id is not None:
+                query = query.where(Job.employer_id == employer_id)
+            kinds[kind] = PrefixIndex.from_counts(db.session.execute(query))
+        return cls(kinds, built_at)
+
+    def save(self, path):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        arrays = {"built_at": np.array([self.built_at])}
+        for kind, index in self.kinds.items():
+            arrays.update(index.arrays(kind))
+        with open(tmp_path, "wb") as fh:
+            np.savez(fh, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls({kind: PrefixIndex.from_arrays(data, kind) for kind in KINDS}, float(data["built_at"][0]))
+
+    def suggest(self, prefix, kinds, limit, overlay=None):
+        """[{"text", "kind", "count"}] for normalized `prefix`, most frequent first."""
+        scored = []
+        for kind in kinds:
+            index = self.kinds[kind]
+            found = {key: [text, weight] for key, text, weight in index.top(prefix)}
+            changed = (overlay or {}).get(kind)
+            if changed:
+                entries, suffixes, owners = changed
+                lo = bisect_left(suffixes, prefix)
+                for key in dict.fromkeys(owners[lo:bisect_left(suffixes, prefix + _END, lo)]):
+                    display, delta = entries[key]
+                    entry = found.get(key)
+                    if entry is None:
+                        found[key] = entry = [display, index.weight(key)]
+                    entry[1] += delta
+            scored.extend((weight, text, kind) for text, weight in found.values() if weight > 0)
+        scored.sort(key=lambda item: (-item[0], item[1].lower()))
+        return [{"text": text, "kind": kind, "count": weight} for weight, text, kind in scored[:limit]]
+
+
+class Suggester:
+    """The shared snapshot as loaded by this worker, plus the overlay of job
+    writes this worker committed since it was built."""
+
+    def __init__(self, path, rebuild_interval=30, overlay_max=500):
+        self.path = path
+        self.rebuild_interval = rebuild_interval
+        self.overlay_max = overlay_max
+        self.index = None
+        self.overlay = {}
+        self._signature = None
+        self._events = []  # (committed_at, kind, key, display, delta)
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._timer = None
+
+    def _file_signature(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_ino, stat.st_size
+
+    def _install(self, index, signature):
+        with self._lock:
+            self.index = index
+            self._signature = signature
+            # Writes committed before the snapshot's rows were read are in it.
+            self._events = [event for event in self._events if event[0] >= index.built_at]
+            self._rebuild_overlay()
+
+    def _rebuild_overlay(self):
+        # kind -> ({key: [display, delta]}, sorted suffixes, key of each suffix)
+        changed = {}
+        for _, kind, key, display, delta in self._events:
+            entry = changed.setdefault(kind, {}).setdefault(key, [display, 0])
+            entry[1] += delta
+        overlay = {}
+        for kind, entries in changed.items():
+            pairs = sorted((suffix, key) for key in entries for suffix in _suffixes(key))
+            overlay[kind] = (entries, [suffix for suffix, _ in pairs], [key for _, key in pairs])
+        self.overlay = overlay
+
+    def current(self):
+        signature = self._file_signature()
+        if signature is None:
+            with self._build_lock:
+                if self._file_signature() is None:
+                    self.rebuild()
+            return self.index
+        if signature != self._signature:
+            # One thread reloads; the others keep answering from the old
+            # snapshot meanwhile (unless there is none yet).
+            if self._reload_lock.acquire(blocking=self.index is None):
+                try:
+                    if self._file_signature() != self._signature:
+                        self._install(SuggestIndex.load(self.path), self._file_signature())
+                finally:
+                    self._reload_lock.release()
+        return self.index
+
+    def rebuild(self):
+        index = SuggestIndex.build()
+        index.save(self.path)
+        self._install(index, self._file_signature())
+        return index
+
+    def suggest(self, prefix, kinds, limit):
+        index = self.current()
+        return index.suggest(normalize(prefix), kinds, limit, self.overlay)
+
+    def record(self, app, events):
+        now = time.time()
+        with self._lock:
+            self._events.extend((now, *event) for event in events)
+            self._rebuild_overlay()
+            pending = sum(len(entries) for entries, _, _ in self.overlay.values())
+        built_at = self.index.built_at if self.index is not None else 0
+        delay = 0 if pending >= self.overlay_max else max(0.0, built_at + self.rebuild_interval - now)
+        self._schedule(app, delay)
+
+    def _schedule(self, app, delay):
+        with self._lock:
+            if self._timer is not None:
+                return
+            self._timer = threading.Timer(delay, self._rebuild_in_background, (app,))
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _rebuild_in_background(self, app):
+        with app.app_context():
+            try:
+                self.rebuild()
+            except Exception:
+                app.logger.exception("Typeahead snapshot rebuild failed")
+            finally:
+                db.session.remove()
+        with self._lock:
+            self._timer = None
+            pending = bool(self._events)
+        # Writes committed while the rebuild ran still need one.
+        if pending:
+            self._schedule(app, self.rebuild_interval)
+
+
+def get_suggester():
+    return current_app.extensions["suggest"]
+
+
+def employer_suggestions(employer_id, prefix, kinds, limit):
+    """Suggestions from one employer's own postings, counted on the fly."""
+    return SuggestIndex.build(employer_id).suggest(normalize(prefix), kinds, limit)
+
+
+def _on_commit(app, changes, **extra):
+    events = []
+    employers = {}
+    dirty = False
+    for change in changes:
+        if change.model == "Employer" and (change.op == "delete" or "company_name" in change.previous):
+            dirty = True
+        if change.model != "Job":
+            continue
+        values, previous = change.values, change.previous
+        if change.op == "delete" and "title" not in values:
+            # Bulk deletes only record ids; the next rebuild picks them up.
+            dirty = True
+            continue
+        sign = -1 if change.op == "delete" else 1
+        for kind, column in (("title", "title"), ("location", "location"), ("company", "employer_id")):
+            if column not in values:
+                continue
+            if change.op == "update":
+                if column not in previous:
+                    continue
+                events.append((kind, previous[column], -1))
+            events.append((kind, values[column], sign))
+    if not events and not dirty:
+        return
+    employer_ids = {value for kind, value, _ in events if kind == "company"}
+    if employer_ids:
+        # after_commit: the session can't run SQL here, so use a connection.
+        with db.engine.connect() as connection:
+            employers = dict(connection.execute(
+                select(Employer.id, Employer.company_name).where(Employer.id.in_(employer_ids))
+            ).all())
+    resolved = []
+    for kind, value, delta in events:
+        text = employers.get(value) if kind == "company" else value
+        key = normalize(text)
+        if key:
+            resolved.append((kind, key, " ".join(text.split()), delta))
+    app.extensions["suggest"].record(app, resolved)
+
+
+@suggest_cli.command("build")
+def build_command():
+    """Rebuild the typeahead snapshot from the jobs table."""
+    started = time.perf_counter()
+    index = current_app.extensions["suggest"].rebuild()
+    counts = ", ".join(f"{len(index.kinds[kind].entry_keys)} {kind}s" for kind in KINDS)
+    click.echo(f"Indexed {counts} in {time.perf_counter() - started:.1f}s")
+
+
+def init_app(app):
+    app.extensions["suggest"] = Suggester(
+        app.config.get("SUGGEST_SNAPSHOT_PATH") or os.path.join(app.instance_path, "suggest.npz"),
+        rebuild_interval=app.config.get("SUGGEST_REBUILD_INTERVAL", 30),
+        overlay_max=app.config.get("SUGGEST_OVERLAY_MAX", 500),
+    )
+    app.cli.add_command(suggest_cli)
+    models_committed.connect(_on_commit, sender=app, weak=False)
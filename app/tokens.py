@@ -0,0 +1,233 @@
+import hashlib
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from datetime import datetime
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from flask_jwt_extended import create_access_token, create_refresh_token
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+
+from .extensions import db, jwt
+from .models import RevokedToken
+from .principal import principal_claims
+
+try:
+    import fcntl
+except ImportError:  # Windows: no shared filter, every check goes to the table
+    fcntl = None
+
+# Access tokens are short-lived (JWT_ACCESS_TOKEN_EXPIRES); clients renew them
+# at POST /auth/refresh with a refresh token, which is revoked and replaced on
+# every use. Logout revokes the tokens it is given.
+#
+# Revoked token ids (jti) are stored in revoked_tokens until they expire.
+# Every authenticated request asks the denylist first, and a Bloom filter
+# kept in a memory-mapped file shared by all workers answers "not revoked" for
+# almost every token without touching the database; only filter hits are
+# confirmed against the table. Revocations set their bits before and again
+# after their row commits, so a concurrent rebuild can't drop them. Every
+# DENYLIST_SWEEP_INTERVAL seconds expired rows are deleted and the filter is
+# rebuilt from what is left (a Bloom filter can't remove entries).
+
+tokens_cli = AppGroup("tokens", help="Maintain the token denylist.")
+
+
+def issue_tokens(user):
+    """{"token", "refresh_token"} for `user`, both carrying principal claims."""
+    claims = principal_claims(user)
+    return {
+        "token": create_access_token(identity=str(user.id), additional_claims=claims),
+        "refresh_token": create_refresh_token(identity=str(user.id), additional_claims=claims),
+    }
+
+
+class BloomFile:
+    """Bloom filter bits in a file: a (bits, hashes, count) header, then the bit
+    array. Writers serialize on a lock file; readers never lock."""
+
+    HEADER = struct.Struct("<QQQ")
+
+    def __init__(self, path, capacity=100000, error_rate=0.001):
+        self.path = path
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._lock = threading.Lock()
+        self._lock_fd = None
+        self._map = None
+        self._inode = None
+        self.bits = self.hashes = 0
+
+    @staticmethod
+    def _positions(jti, bits, hashes):
+        digest = hashlib.blake2b(jti.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % bits for i in range(hashes)]
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def _mapped(self):
+        # Rebuilds replace the file; pick up the new one.
+        inode = os.stat(self.path).st_ino
+        if inode != self._inode:
+            with open(self.path, "r+b") as fh:
+                mapped = mmap.mmap(fh.fileno(), 0)
+            self.bits, self.hashes, _ = self.HEADER.unpack_from(mapped, 0)
+            self._map, self._inode = mapped, inode
+        return self._map
+
+    def __contains__(self, jti):
+        mapped = self._mapped()
+        offset = self.HEADER.size
+        return all(mapped[offset + (p >> 3)] & (1 << (p & 7)) for p in self._positions(jti, self.bits, self.hashes))
+
+    def _locked(self):
+        if self._lock_fd is None:
+            self._lock_fd = os.open(f"{self.path}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+        return self._lock_fd
+
+    def add(self, jtis):
+        """Set the bits for `jtis`; returns the entry count since the last build."""
+        with self._lock:
+            fd = self._locked()
+            fcntl.lockf(fd, fcntl.LOCK_EX)
+            try:
+                mapped = self._mapped()
+                for jti in jtis:
+                    for p in self._positions(jti, self.bits, self.hashes):
+                        mapped[self.HEADER.size + (p >> 3)] |= 1 << (p & 7)
+                count = self.HEADER.unpack_from(mapped, 0)[2] + len(jtis)
+                self.HEADER.pack_into(mapped, 0, self.bits, self.hashes, count)
+                return count
+            finally:
+                fcntl.lockf(fd, fcntl.LOCK_UN)
+
+    def rebuild(self, load_jtis):
+        """Replace the file with a filter holding `load_jtis()`, read while
+        writers are held off."""
+        with self._lock:
+            fd = self._locked()
+            fcntl.lockf(fd, fcntl.LOCK_EX)
+            try:
+                jtis = load_jtis()
+                entries = max(self.capacity, 2 * len(jtis))
+                bits = max(64, math.ceil(-entries * math.log(self.error_rate) / math.log(2) ** 2))
+                hashes = max(1, round(bits / entries * math.log(2)))
+                data = bytearray(self.HEADER.size + (bits + 7) // 8)
+                self.HEADER.pack_into(data, 0, bits, hashes, len(jtis))
+                for jti in jtis:
+                    for p in self._positions(jti, bits, hashes):
+                        data[self.HEADER.size + (p >> 3)] |= 1 << (p & 7)
+                tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(tmp_path, "wb") as fh:
+                    fh.write(data)
+                os.replace(tmp_path, self.path)
+                return len(jtis)
+            finally:
+                fcntl.lockf(fd, fcntl.LOCK_UN)
+
+
+class Denylist:
+    def __init__(self, app, path, capacity=100000, error_rate=0.001, sweep_interval=3600):
+        self.app = app
+        self.bloom = BloomFile(path, capacity, error_rate) if fcntl is not None else None
+        self.sweep_interval = sweep_interval
+        self._last_sweep = time.monotonic()
+        self._sweeping = threading.Lock()
+        self.checks = 0
+        self.lookups = 0
+
+    def _unexpired(self):
+        return db.session.scalars(select(RevokedToken.jti).where(RevokedToken.expires_at > datetime.utcnow())).all()
+
+    def is_revoked(self, jti):
+        self.checks += 1
+        self._maybe_sweep()
+        if self.bloom is not None:
+            if not self.bloom.exists():
+                self.bloom.rebuild(self._unexpired)
+            if jti not in self.bloom:
+                return False
+        self.lookups += 1
+        return db.session.get(RevokedToken, jti) is not None
+
+    def revoke(self, payload):
+        """Revoke the decoded token `payload` and commit. False if it was
+        already revoked (e.g. a refresh token used twice)."""
+        jti = payload["jti"]
+        if self.bloom is not None and self.bloom.exists():
+            self.bloom.add([jti])
+        db.session.add(RevokedToken(
+            jti=jti,
+            token_type=payload.get("type", "access"),
+            user_id=int(payload["sub"]) if str(payload.get("sub", "")).isdigit() else None,
+            expires_at=datetime.utcfromtimestamp(payload["exp"]) if payload.get("exp") else datetime.max,
+        ))
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return False
+        if self.bloom is not None and self.bloom.exists():
+            if self.bloom.add([jti]) > self.bloom.capacity:
+                self._last_sweep = 0  # filter is filling up; rebuild it larger soon
+        return True
+
+    def sweep(self):
+        """Delete expired rows and rebuild the filter. Returns (deleted, kept)."""
+        deleted = db.session.execute(delete(RevokedToken).where(RevokedToken.expires_at <= datetime.utcnow())).rowcount
+        db.session.commit()
+        kept = self.bloom.rebuild(self._unexpired) if self.bloom is not None else len(self._unexpired())
+        return deleted, kept
+
+    def _maybe_sweep(self):
+        if time.monotonic() - self._last_sweep < self.sweep_interval or not self._sweeping.acquire(blocking=False):
+            return
+        self._last_sweep = time.monotonic()
+
+        def run():
+            with self.app.app_context():
+                try:
+                    self.sweep()
+                except Exception:
+                    self.app.logger.exception("Token denylist sweep failed")
+                finally:
+                    db.session.remove()
+                    self._sweeping.release()
+
+        threading.Thread(target=run, name="denylist-sweep", daemon=True).start()
+
+
+def get_denylist():
+    return current_app.extensions["denylist"]
+
+
+@jwt.token_in_blocklist_loader
+def _token_revoked(jwt_header, jwt_payload):
+    return get_denylist().is_revoked(jwt_payload["jti"])
+
+
+@tokens_cli.command("sweep")
+def sweep_command():
+    """Delete expired revocations and rebuild the Bloom filter."""
+    deleted, kept = get_denylist().sweep()
+    click.echo(f"Deleted {deleted} expired revocations, {kept} remain")
+
+
+def init_app(app):
+    app.extensions["denylist"] = Denylist(
+        app,
+        app.config.get("DENYLIST_PATH") or os.path.join(app.instance_path, "revoked_tokens.bloom"),
+        capacity=app.config.get("DENYLIST_CAPACITY", 100000),
+        error_rate=app.config.get("DENYLIST_ERROR_RATE", 0.001),
+        sweep_interval=app.config.get("DENYLIST_SWEEP_INTERVAL", 3600),
+    )
+    app.cli.add_command(tokens_cli)
@@ -1,4 +1,5 @@
 import os
+from datetime import timedelta
 from dotenv import load_dotenv
 # Load environment variables from .env file
 load_dotenv()
@@ -21,9 +22,141 @@ class Config:
     SECRET_KEY = os.getenv("SECRET_KEY", "KEVINKEVIN71150%WHITE")
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "KevinKevin71150%ORANGELEVEL10")
     SQLALCHEMY_DATABASE_URI = _normalize_db_url(os.getenv("DATABASE_URL"))
+    # Short-lived access tokens, renewed at POST /auth/refresh with a refresh token
+    # that is replaced on every use (app/tokens.py).
+    JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=int(os.getenv("JWT_ACCESS_TOKEN_MINUTES", "15")))
+    JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=int(os.getenv("JWT_REFRESH_TOKEN_DAYS", "14")))
+    # Revoked token ids are kept in revoked_tokens behind a Bloom filter file shared
+    # by the workers (default: instance/revoked_tokens.bloom); expired ones are
+    # swept every DENYLIST_SWEEP_INTERVAL seconds.
+    DENYLIST_PATH = os.getenv("DENYLIST_PATH")
+    DENYLIST_CAPACITY = int(os.getenv("DENYLIST_CAPACITY", "100000"))
+    DENYLIST_ERROR_RATE = float(os.getenv("DENYLIST_ERROR_RATE", "0.001"))
+    DENYLIST_SWEEP_INTERVAL = int(os.getenv("DENYLIST_SWEEP_INTERVAL", "3600"))
     CORS_ORIGINS = os.getenv("CORS_ORIGINS", "http://localhost:5173,http://localhost:3000")
     CORS_ORIGINS = [o.strip() for o in os.getenv("CORS_ORIGINS", "").split(",") if o.strip()]
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # SQLite FTS5 index behind GET /jobs/?query= (falls back to ILIKE when off/unavailable)
+    JOBS_FTS_ENABLED = os.getenv("JOBS_FTS_ENABLED", "true").lower() == "true"
+    # List endpoints return bare arrays unless the client sends limit/cursor.
+    # Turn off once the frontend follows next_cursor, so every list is bounded.
+    PAGINATION_LEGACY_ARRAYS = os.getenv("PAGINATION_LEGACY_ARRAYS", "true").lower() == "true"
+    # Caller (user id, role, employer id) resolution, see app/principal.py.
+    # With PRINCIPAL_TRUST_CLAIMS the role/employer_id claims signed into the JWT
+    # at login are used without a DB lookup; role changes then apply to tokens
+    # issued by other workers only once the cache TTL / token lifetime passes.
+    PRINCIPAL_CACHE_TTL = int(os.getenv("PRINCIPAL_CACHE_TTL", "30"))
+    PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "1024"))
+    PRINCIPAL_TRUST_CLAIMS = os.getenv("PRINCIPAL_TRUST_CLAIMS", "false").lower() == "true"
+    # Rate limits (app/rate_limit.py) as "N/second|minute|hour|day" (a burst of N,
+    # then one every period/N) or "off". "shared" keeps the state in a memory-mapped
+    # file (default: instance/rate_limits.bin) used by every worker on the host;
+    # "memory" limits each worker separately.
+    RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "shared")  # shared | memory | off
+    RATE_LIMIT_PATH = os.getenv("RATE_LIMIT_PATH")
+    RATE_LIMIT_SLOTS = int(os.getenv("RATE_LIMIT_SLOTS", "65536"))
+    RATE_LIMIT_LOGIN = os.getenv("RATE_LIMIT_LOGIN", "30/minute")  # per IP, login/admin-login/bootstrap
+    RATE_LIMIT_LOGIN_ACCOUNT = os.getenv("RATE_LIMIT_LOGIN_ACCOUNT", "10/minute")  # per email
+    RATE_LIMIT_REGISTER = os.getenv("RATE_LIMIT_REGISTER", "20/hour")  # per IP
+    RATE_LIMIT_ADZUNA = os.getenv("RATE_LIMIT_ADZUNA", "60/minute")  # per IP on /adzuna, per user on /search
+    # Reverse proxies in front of the app (Render: 1). Per-IP limits then use the
+    # client address from X-Forwarded-For instead of the proxy's; leave at 0 when
+    # clients connect directly, or they could pick their own address.
+    RATE_LIMIT_TRUSTED_PROXIES = int(os.getenv("RATE_LIMIT_TRUSTED_PROXIES", "0"))
+    # Password hashing (app/passwords.py). PASSWORD_HASH_METHOD is a werkzeug method
+    # string, e.g. "scrypt:32768:8:1" or "pbkdf2:sha256:600000" (see
+    # scripts/bench_passwords.py for costs); hashes made with other parameters are
+    # upgraded at the user's next login. Hashing runs in PASSWORD_HASH_WORKERS
+    # processes (0 = inline) with up to PASSWORD_HASH_QUEUE calls waiting; once
+    # full, auth routes answer 429.
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", "16"))
+    PASSWORD_HASH_TIMEOUT = int(os.getenv("PASSWORD_HASH_TIMEOUT", "30"))
+    # Per-connection pragmas for this app's SQLite engine (foreign_keys is always on).
+    # WAL lets readers run alongside a writer; busy_timeout makes writers queue
+    # instead of failing with "database is locked". Set a value to None to skip it.
+    SQLITE_PRAGMAS = {
+        "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+        "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+        "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+        "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+        "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", "-65536")),  # negative = KiB
+        "temp_store": os.getenv("SQLITE_TEMP_STORE", "MEMORY"),
+    }
+    # Seconds between PRAGMA optimize + passive WAL checkpoints (0 disables).
+    SQLITE_MAINTENANCE_INTERVAL = int(os.getenv("SQLITE_MAINTENANCE_INTERVAL", "300"))
+    # Cache of serialized GET /jobs/ responses, invalidated by tag when jobs change.
+    # "memory" is per worker (other workers only see a write once the TTL passes);
+    # "sqlite" shares one file between gunicorn workers, so invalidation is global.
+    RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "memory")  # memory | sqlite | off
+    RESPONSE_CACHE_PATH = os.getenv("RESPONSE_CACHE_PATH")  # default: instance/response_cache.db
+    RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "60"))
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "2048"))
+    RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+    # Upstream Adzuna client (app/adzuna_client.py). Point ADZUNA_BASE_URL at a
+    # local stub (scripts/adzuna_stub.py) to exercise it without credentials or network.
+    ADZUNA_BASE_URL = os.getenv("ADZUNA_BASE_URL", "https://api.adzuna.com/v1/api")
+    ADZUNA_CONNECT_TIMEOUT = float(os.getenv("ADZUNA_CONNECT_TIMEOUT", "3.05"))
+    ADZUNA_READ_TIMEOUT = float(os.getenv("ADZUNA_READ_TIMEOUT", "8"))
+    ADZUNA_POOL_SIZE = int(os.getenv("ADZUNA_POOL_SIZE", "10"))
+    # Responses are fresh for ADZUNA_CACHE_TTL seconds, then served stale (while a
+    # background refresh runs, or while Adzuna is failing) up to ADZUNA_STALE_TTL.
+    ADZUNA_CACHE_TTL = int(os.getenv("ADZUNA_CACHE_TTL", "300"))
+    ADZUNA_STALE_TTL = int(os.getenv("ADZUNA_STALE_TTL", "3600"))
+    ADZUNA_CACHE_SIZE = int(os.getenv("ADZUNA_CACHE_SIZE", "512"))
+    # Consecutive upstream failures that open the circuit, and seconds before a retry probe.
+    ADZUNA_BREAKER_THRESHOLD = int(os.getenv("ADZUNA_BREAKER_THRESHOLD", "5"))
+    ADZUNA_BREAKER_RESET = int(os.getenv("ADZUNA_BREAKER_RESET", "30"))
+    # GET /adzuna/search/bulk: concurrent upstream calls per worker, and the most
+    # pages (pages x countries) one request may ask for.
+    ADZUNA_FANOUT_WORKERS = int(os.getenv("ADZUNA_FANOUT_WORKERS", "8"))
+    ADZUNA_BULK_MAX_PAGES = int(os.getenv("ADZUNA_BULK_MAX_PAGES", "10"))
+    # Adzuna -> jobs table import (app/ingest.py, `flask ingest run`).
+    # INGEST_QUERIES is ";"-separated; INGEST_INTERVAL > 0 runs it every N seconds
+    # in-process (enable on a single server process).
+    INGEST_QUERIES = os.getenv("INGEST_QUERIES", "")
+    INGEST_COUNTRY = os.getenv("INGEST_COUNTRY", os.getenv("ADZUNA_COUNTRY", "us")).lower()
+    INGEST_MAX_PAGES = int(os.getenv("INGEST_MAX_PAGES", "5"))
+    INGEST_RESULTS_PER_PAGE = int(os.getenv("INGEST_RESULTS_PER_PAGE", "50"))
+    INGEST_MAX_DAYS_OLD = int(os.getenv("INGEST_MAX_DAYS_OLD", "0"))  # 0 = no upstream age filter
+    INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "200"))
+    INGEST_STALE_DAYS = int(os.getenv("INGEST_STALE_DAYS", "14"))
+    INGEST_INTERVAL = int(os.getenv("INGEST_INTERVAL", "0"))
+    # GET /search latency budgets; a source that misses its budget is left out.
+    FEDERATED_LOCAL_BUDGET_MS = int(os.getenv("FEDERATED_LOCAL_BUDGET_MS", "250"))
+    FEDERATED_ADZUNA_BUDGET_MS = int(os.getenv("FEDERATED_ADZUNA_BUDGET_MS", "800"))
+    # Near-duplicate check on POST /jobs/ against the employer's own postings
+    # (app/dedupe.py): "warn" lists them in the response, "reject" answers 409.
+    DUPLICATE_POLICY = os.getenv("DUPLICATE_POLICY", "warn")  # warn | reject | off
+    DUPLICATE_THRESHOLD = float(os.getenv("DUPLICATE_THRESHOLD", "0.8"))
+    # POST /jobs/bulk (app/bulk_jobs.py): rows written per transaction, and the
+    # most rows one request may carry (an NDJSON body is cut off there).
+    BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", "500"))
+    BULK_MAX_ROWS = int(os.getenv("BULK_MAX_ROWS", "10000"))
+    # GET /export/<entity>: rows fetched per round trip from the streaming cursor.
+    EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+    # GET /jobs/<id>/similar (app/similar.py): hashed bag-of-words vectors in a
+    # memory-mapped file (default: instance/job_vectors-<dimensions>.f32, rebuilt
+    # automatically when missing or when SIMILAR_DIMENSIONS changes).
+    SIMILAR_DIMENSIONS = int(os.getenv("SIMILAR_DIMENSIONS", "256"))
+    SIMILAR_VECTORS_PATH = os.getenv("SIMILAR_VECTORS_PATH")
+    SIMILAR_CACHE_SIZE = int(os.getenv("SIMILAR_CACHE_SIZE", "1024"))
+    SIMILAR_CACHE_TTL = int(os.getenv("SIMILAR_CACHE_TTL", "300"))
+    # GET /jobs/<id>/candidates rankings, cached per worker until any job,
+    # application or profile is written (the table_versions counters every
+    # worker sees) or the TTL passes. Parsed profile skills are kept for the
+    # PROFILE_VECTORS_CACHE_SIZE most recently ranked profiles.
+    CANDIDATES_CACHE_SIZE = int(os.getenv("CANDIDATES_CACHE_SIZE", "512"))
+    CANDIDATES_CACHE_TTL = int(os.getenv("CANDIDATES_CACHE_TTL", "300"))
+    PROFILE_VECTORS_CACHE_SIZE = int(os.getenv("PROFILE_VECTORS_CACHE_SIZE", "20000"))
+    # GET /jobs/suggest (app/suggest.py): snapshot shared by every worker
+    # (default: instance/suggest.npz), rebuilt from the jobs table at most every
+    # SUGGEST_REBUILD_INTERVAL seconds after a write, or once a worker has
+    # SUGGEST_OVERLAY_MAX values changed locally that others haven't seen.
+    SUGGEST_SNAPSHOT_PATH = os.getenv("SUGGEST_SNAPSHOT_PATH")
+    SUGGEST_REBUILD_INTERVAL = int(os.getenv("SUGGEST_REBUILD_INTERVAL", "30"))
+    SUGGEST_OVERLAY_MAX = int(os.getenv("SUGGEST_OVERLAY_MAX", "500"))
     
     
 #My configuration file was initially in the wrong directory, which prevented Flask from resolving imports. 
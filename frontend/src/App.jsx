@@ -1,7 +1,7 @@
 import { useEffect, useRef, useState } from "react";
 import { Routes, Route, NavLink } from "react-router-dom";
 import "./App.css";
-import { getAuthToken, getAuthRole, clearAuthToken } from "./api";
+import { getAuthToken, getAuthRole, clearAuthToken, logoutUser } from "./api";
 import Home from "./pages/Home";
 import Jobs from "./pages/Jobs";
 import Employers from "./pages/Employers";
@@ -123,6 +123,8 @@ function App() {
   }, [a11yPos]);
 
   const handleLogout = () => {
+    // Revoke the tokens server-side; sign out locally either way.
+    logoutUser().catch(() => {});
     clearAuthToken();
     setAuthed(false);
     setRole(null);
@@ -1,11 +1,15 @@
 const BASE_URL = import.meta.env.VITE_API_BASE_URL || "http://127.0.0.1:5000";
 const TOKEN_KEY = "somedeed_token";
 const ROLE_KEY = "somedeed_role";
+const REFRESH_KEY = "somedeed_refresh_token";
 
-export function setAuthToken(token) {
+export function setAuthToken(token, refreshToken) {
   if (token) {
     localStorage.setItem(TOKEN_KEY, token);
   }
+  if (refreshToken) {
+    localStorage.setItem(REFRESH_KEY, refreshToken);
+  }
 }
 
 export function getAuthToken() {
@@ -14,9 +18,36 @@ export function getAuthToken() {
 
 export function clearAuthToken() {
   localStorage.removeItem(TOKEN_KEY);
+  localStorage.removeItem(REFRESH_KEY);
   localStorage.removeItem(ROLE_KEY);
 }
 
+// Access tokens are short-lived. On a 401 the refresh token (single use) is
+// traded for a new pair once; concurrent 401s share that one exchange.
+let refreshing = null;
+
+function refreshSession() {
+  const refreshToken = localStorage.getItem(REFRESH_KEY);
+  if (!refreshToken) return Promise.resolve(false);
+  if (!refreshing) {
+    refreshing = fetch(`${BASE_URL}/auth/refresh`, {
+      method: "POST",
+      headers: { Authorization: `Bearer ${refreshToken}` }
+    })
+      .then((res) => (res.ok ? res.json() : null))
+      .then((data) => {
+        if (!data?.token) return false;
+        setAuthToken(data.token, data.refresh_token);
+        return true;
+      })
+      .catch(() => false)
+      .finally(() => {
+        refreshing = null;
+      });
+  }
+  return refreshing;
+}
+
 export function setAuthRole(role) {
   if (role) {
     localStorage.setItem(ROLE_KEY, role);
@@ -40,7 +71,7 @@ export function formatApiError(err, fallback = "Something went wrong.") {
   return fallback;
 }
 
-async function request(path, options = {}) {
+async function request(path, options = {}, retried = false) {
   const token = getAuthToken();
   const res = await fetch(`${BASE_URL}${path}`, {
     headers: {
@@ -51,6 +82,12 @@ async function request(path, options = {}) {
     ...options
   });
 
+  if (res.status === 401 && token && !retried && !path.startsWith("/auth/")) {
+    if (await refreshSession()) {
+      return request(path, options, true);
+    }
+  }
+
   if (!res.ok) {
     let detailText = "";
     let detailJson = null;
@@ -92,6 +129,12 @@ export function listJobs(params = {}) {
   return request(`/jobs/${query ? `?${query}` : ""}`);
 }
 
+export function suggestJobs(prefix, kind = "") {
+  const search = new URLSearchParams({ prefix });
+  if (kind) search.set("kind", kind);
+  return request(`/jobs/suggest?${search.toString()}`);
+}
+
 export function createJob(payload) {
   return request("/jobs/", {
     method: "POST",
@@ -176,8 +219,15 @@ export function deleteEmployer(id) {
   });
 }
 
-export function listSavedJobs() {
-  return request("/saved-jobs/");
+export function listSavedJobs(params = {}) {
+  const search = new URLSearchParams();
+  Object.entries(params).forEach(([key, value]) => {
+    if (value !== undefined && value !== null && value !== "") {
+      search.set(key, value);
+    }
+  });
+  const query = search.toString();
+  return request(`/saved-jobs/${query ? `?${query}` : ""}`);
 }
 
 export function saveJob(job_id) {
@@ -289,6 +339,14 @@ export function loginUser(payload) {
   });
 }
 
+export function logoutUser() {
+  const refreshToken = localStorage.getItem(REFRESH_KEY);
+  return request("/auth/logout", {
+    method: "POST",
+    body: JSON.stringify(refreshToken ? { refresh_token: refreshToken } : {})
+  });
+}
+
 export function loginAdmin(payload) {
   return request("/auth/admin-login", {
     method: "POST",
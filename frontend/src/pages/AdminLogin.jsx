@@ -34,7 +34,7 @@ export default function AdminLogin() {
         setMessage("Admin access only.");
         return;
       }
-      if (data.token) setAuthToken(data.token);
+      if (data.token) setAuthToken(data.token, data.refresh_token);
       if (data.role) setAuthRole(data.role);
       setAuthed(true);
       setRole(data.role);
@@ -2,6 +2,7 @@ import { useEffect, useState } from "react";
 import { useNavigate } from "react-router-dom";
 import {
   listJobs,
+  suggestJobs,
   createJob,
   updateJob,
   deleteJob,
@@ -67,6 +68,25 @@ export default function Jobs() {
     employer_id: ""
   });
   const [deleteId, setDeleteId] = useState("");
+  const [suggestions, setSuggestions] = useState({ query: [], location: [] });
+
+  // Typeahead: ask /jobs/suggest once typing pauses instead of on every key.
+  useEffect(() => {
+    const fields = { query: "title,company", location: "location" };
+    const timer = setTimeout(() => {
+      Object.entries(fields).forEach(([field, kind]) => {
+        const prefix = filters[field].trim();
+        if (!prefix) {
+          setSuggestions((prev) => ({ ...prev, [field]: [] }));
+          return;
+        }
+        suggestJobs(prefix, kind)
+          .then((data) => setSuggestions((prev) => ({ ...prev, [field]: data?.items || [] })))
+          .catch(() => {});
+      });
+    }, 150);
+    return () => clearTimeout(timer);
+  }, [filters.query, filters.location]);
 
   const buildParams = (nextFilters) => {
     const params = {};
@@ -249,15 +269,27 @@ export default function Jobs() {
         <input
           className="input"
           placeholder="Search titles or keywords"
+          list="job-query-suggestions"
           value={filters.query}
           onChange={(e) => setFilters({ ...filters, query: e.target.value })}
         />
+        <datalist id="job-query-suggestions">
+          {suggestions.query.map((s) => (
+            <option key={`${s.kind}:${s.text}`} value={s.text} />
+          ))}
+        </datalist>
         <input
           className="input"
           placeholder="Location"
+          list="job-location-suggestions"
           value={filters.location}
           onChange={(e) => setFilters({ ...filters, location: e.target.value })}
         />
+        <datalist id="job-location-suggestions">
+          {suggestions.location.map((s) => (
+            <option key={s.text} value={s.text} />
+          ))}
+        </datalist>
         <select
           className="input"
           value={filters.salaryRange}
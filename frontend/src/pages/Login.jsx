@@ -25,7 +25,7 @@ export default function Login() {
     try {
       const data = await loginUser(form);
       if (data.token) {
-        setAuthToken(data.token);
+        setAuthToken(data.token, data.refresh_token);
       }
       if (data.role) {
         setAuthRole(data.role);
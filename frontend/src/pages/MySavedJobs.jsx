@@ -1,5 +1,5 @@
 import { useEffect, useState } from "react";
-import { listSavedJobs, listJobs, unsaveJob, formatApiError } from "../api";
+import { listSavedJobs, unsaveJob, formatApiError } from "../api";
 import "./MySavedJobs.css";
 
 export default function MySavedJobs() {
@@ -10,11 +10,8 @@ export default function MySavedJobs() {
   const load = async () => {
     setError("");
     try {
-      const saved = await listSavedJobs();
-      const ids = new Set((saved || []).map((s) => s.job_id));
-      const allJobs = await listJobs();
-      const filtered = (allJobs || []).filter((j) => ids.has(j.id));
-      setJobs(filtered);
+      const saved = await listSavedJobs({ expand: "job" });
+      setJobs((saved || []).map((s) => s.job));
     } catch (err) {
       setError(formatApiError(err, "Failed to load saved jobs"));
     }
@@ -0,0 +1,56 @@
+"""add job minhash signatures and lsh buckets
+
+Revision ID: 0b3e9d6c2f47
+Revises: f5c1d7e3a820
+Create Date: 2026-10-18 00:50:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision = '0b3e9d6c2f47'
+down_revision = 'f5c1d7e3a820'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    def _table_exists(name):
+        if bind.dialect.name == "sqlite":
+            rows = bind.execute(
+                text("SELECT name FROM sqlite_master WHERE type='table' AND name=:n"),
+                {"n": name}
+            ).fetchall()
+            return len(rows) > 0
+        rows = bind.execute(
+            text("SELECT table_name FROM information_schema.tables WHERE table_name = :n"),
+            {"n": name}
+        ).fetchall()
+        return len(rows) > 0
+
+    # Existing postings are indexed with `flask dedupe index` after upgrading.
+    if not _table_exists('job_signatures'):
+        op.create_table(
+            'job_signatures',
+            sa.Column('job_id', sa.Integer(), sa.ForeignKey('jobs.id', ondelete='CASCADE'), primary_key=True),
+            sa.Column('minhash', sa.LargeBinary(), nullable=False),
+        )
+    if not _table_exists('job_lsh_buckets'):
+        op.create_table(
+            'job_lsh_buckets',
+            sa.Column('band', sa.SmallInteger(), primary_key=True),
+            sa.Column('bucket', sa.BigInteger(), primary_key=True),
+            sa.Column('job_id', sa.Integer(), sa.ForeignKey('jobs.id', ondelete='CASCADE'), primary_key=True),
+        )
+        op.create_index('ix_job_lsh_buckets_job_id', 'job_lsh_buckets', ['job_id'])
+
+
+def downgrade():
+    op.drop_index('ix_job_lsh_buckets_job_id', table_name='job_lsh_buckets')
+    op.drop_table('job_lsh_buckets')
+    op.drop_table('job_signatures')
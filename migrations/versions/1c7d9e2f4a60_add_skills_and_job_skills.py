@@ -0,0 +1,58 @@
+"""add skills vocabulary and job skill posting lists
+
+Revision ID: 1c7d9e2f4a60
+Revises: 0b3e9d6c2f47
+Create Date: 2026-10-18 02:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision = '1c7d9e2f4a60'
+down_revision = '0b3e9d6c2f47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    def _table_exists(name):
+        if bind.dialect.name == "sqlite":
+            rows = bind.execute(
+                text("SELECT name FROM sqlite_master WHERE type='table' AND name=:n"),
+                {"n": name}
+            ).fetchall()
+            return len(rows) > 0
+        rows = bind.execute(
+            text("SELECT table_name FROM information_schema.tables WHERE table_name = :n"),
+            {"n": name}
+        ).fetchall()
+        return len(rows) > 0
+
+    # The vocabulary and posting lists are filled with `flask matching index`,
+    # which render.yaml runs after `flask db upgrade` on every deploy.
+    if not _table_exists('skills'):
+        op.create_table(
+            'skills',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('name', sa.String(length=64), nullable=False, unique=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+        )
+    if not _table_exists('job_skills'):
+        op.create_table(
+            'job_skills',
+            sa.Column('skill_id', sa.Integer(), sa.ForeignKey('skills.id', ondelete='CASCADE'), primary_key=True),
+            sa.Column('job_id', sa.Integer(), sa.ForeignKey('jobs.id', ondelete='CASCADE'), primary_key=True),
+            sa.Column('weight', sa.Float(), nullable=False, server_default='1'),
+        )
+        op.create_index('ix_job_skills_job_id', 'job_skills', ['job_id'])
+
+
+def downgrade():
+    op.drop_index('ix_job_skills_job_id', table_name='job_skills')
+    op.drop_table('job_skills')
+    op.drop_table('skills')
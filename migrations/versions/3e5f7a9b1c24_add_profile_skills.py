@@ -0,0 +1,49 @@
+"""add profile skills
+
+Revision ID: 3e5f7a9b1c24
+Revises: 1c7d9e2f4a60
+Create Date: 2026-10-18 03:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision = '3e5f7a9b1c24'
+down_revision = '1c7d9e2f4a60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    def _table_exists(name):
+        if bind.dialect.name == "sqlite":
+            rows = bind.execute(
+                text("SELECT name FROM sqlite_master WHERE type='table' AND name=:n"),
+                {"n": name}
+            ).fetchall()
+            return len(rows) > 0
+        rows = bind.execute(
+            text("SELECT table_name FROM information_schema.tables WHERE table_name = :n"),
+            {"n": name}
+        ).fetchall()
+        return len(rows) > 0
+
+    # Rows are backfilled from profiles.skills by `flask matching index`, which
+    # render.yaml runs after `flask db upgrade` on every deploy.
+    if not _table_exists('profile_skills'):
+        op.create_table(
+            'profile_skills',
+            sa.Column('skill_id', sa.Integer(), sa.ForeignKey('skills.id', ondelete='CASCADE'), primary_key=True),
+            sa.Column('profile_id', sa.Integer(), sa.ForeignKey('profiles.id', ondelete='CASCADE'), primary_key=True),
+        )
+        op.create_index('ix_profile_skills_profile_id', 'profile_skills', ['profile_id'])
+
+
+def downgrade():
+    op.drop_index('ix_profile_skills_profile_id', table_name='profile_skills')
+    op.drop_table('profile_skills')
@@ -0,0 +1,50 @@
+"""add revoked tokens denylist
+
+Revision ID: 4a8c2e6f9d13
+Revises: 3e5f7a9b1c24
+Create Date: 2026-10-18 05:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision = '4a8c2e6f9d13'
+down_revision = '3e5f7a9b1c24'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    def _table_exists(name):
+        if bind.dialect.name == "sqlite":
+            rows = bind.execute(
+                text("SELECT name FROM sqlite_master WHERE type='table' AND name=:n"),
+                {"n": name}
+            ).fetchall()
+            return len(rows) > 0
+        rows = bind.execute(
+            text("SELECT table_name FROM information_schema.tables WHERE table_name = :n"),
+            {"n": name}
+        ).fetchall()
+        return len(rows) > 0
+
+    if not _table_exists('revoked_tokens'):
+        op.create_table(
+            'revoked_tokens',
+            sa.Column('jti', sa.String(length=64), primary_key=True),
+            sa.Column('token_type', sa.String(length=10), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=True),
+            sa.Column('expires_at', sa.DateTime(), nullable=False),
+            sa.Column('revoked_at', sa.DateTime(), nullable=True),
+        )
+        op.create_index('ix_revoked_tokens_expires_at', 'revoked_tokens', ['expires_at'])
+
+
+def downgrade():
+    op.drop_index('ix_revoked_tokens_expires_at', table_name='revoked_tokens')
+    op.drop_table('revoked_tokens')
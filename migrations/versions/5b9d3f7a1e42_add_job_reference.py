@@ -0,0 +1,52 @@
+"""add employer reference to jobs for bulk upserts
+
+Revision ID: 5b9d3f7a1e42
+Revises: 4a8c2e6f9d13
+Create Date: 2026-10-18 06:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+
+# revision identifiers, used by Alembic.
+revision = '5b9d3f7a1e42'
+down_revision = '4a8c2e6f9d13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    def _index_exists(table, name):
+        if bind.dialect.name == "sqlite":
+            rows = bind.execute(text(f"PRAGMA index_list({table})")).fetchall()
+            return any(r[1] == name for r in rows)
+        rows = bind.execute(
+            text(
+                "SELECT indexname FROM pg_indexes "
+                "WHERE tablename = :t AND indexname = :n"
+            ),
+            {"t": table, "n": name}
+        ).fetchall()
+        return len(rows) > 0
+
+    # Plain ALTER TABLE ADD COLUMN: a batch rebuild would drop the jobs triggers.
+    try:
+        op.add_column("jobs", sa.Column("reference", sa.String(length=128), nullable=True))
+    except OperationalError as exc:
+        if "duplicate column" not in str(exc):
+            raise
+    if not _index_exists("jobs", "uq_jobs_employer_id_reference"):
+        op.create_index("uq_jobs_employer_id_reference", "jobs", ["employer_id", "reference"], unique=True)
+
+
+def downgrade():
+    op.drop_index("uq_jobs_employer_id_reference", table_name="jobs")
+    try:
+        op.drop_column("jobs", "reference")
+    except OperationalError:
+        pass
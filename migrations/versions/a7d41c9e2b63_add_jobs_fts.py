@@ -0,0 +1,62 @@
+"""add jobs full-text index
+
+Revision ID: a7d41c9e2b63
+Revises: 4f3c2b1a9d7e
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7d41c9e2b63'
+down_revision = '4f3c2b1a9d7e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    # FTS5 is SQLite-only; other databases keep the ILIKE search path.
+    if bind.dialect.name != "sqlite":
+        return
+
+    try:
+        bind.execute(text(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5("
+            "title, description, content='jobs', content_rowid='id', "
+            "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        ))
+    except OperationalError as exc:
+        if "no such module" in str(exc):
+            return
+        raise
+
+    bind.execute(text(
+        "CREATE TRIGGER IF NOT EXISTS jobs_fts_ai AFTER INSERT ON jobs BEGIN "
+        "INSERT INTO jobs_fts(rowid, title, description) VALUES (new.id, new.title, new.description); "
+        "END"
+    ))
+    bind.execute(text(
+        "CREATE TRIGGER IF NOT EXISTS jobs_fts_ad AFTER DELETE ON jobs BEGIN "
+        "INSERT INTO jobs_fts(jobs_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description); "
+        "END"
+    ))
+    bind.execute(text(
+        "CREATE TRIGGER IF NOT EXISTS jobs_fts_au AFTER UPDATE OF title, description ON jobs BEGIN "
+        "INSERT INTO jobs_fts(jobs_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description); "
+        "INSERT INTO jobs_fts(rowid, title, description) VALUES (new.id, new.title, new.description); "
+        "END"
+    ))
+    bind.execute(text("INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')"))
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != "sqlite":
+        return
+    for trigger in ["jobs_fts_au", "jobs_fts_ad", "jobs_fts_ai"]:
+        bind.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+    bind.execute(text("DROP TABLE IF EXISTS jobs_fts"))
@@ -0,0 +1,76 @@
+"""add foreign-key and filter indexes
+
+Revision ID: c3e8f25a9b14
+Revises: a7d41c9e2b63
+Create Date: 2026-10-18 00:10:00.000000
+
+"""
+from alembic import op
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3e8f25a9b14'
+down_revision = 'a7d41c9e2b63'
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns). Foreign-key columns lead so ON DELETE CASCADE
+# and employer/user scoped lookups are index searches; the trailing
+# (created_at, id) / (lower(title), id) / (salary, id) columns match the keyset
+# pagination orderings; sort=alpha is case-insensitive, as it was in Python.
+INDEXES = [
+    ("ix_applications_job_id_created_at", "applications", ["job_id", "created_at", "id"]),
+    ("ix_applications_user_id_created_at", "applications", ["user_id", "created_at", "id"]),
+    ("ix_applications_created_at_id", "applications", ["created_at", "id"]),
+    ("ix_jobs_employer_id_created_at", "jobs", ["employer_id", "created_at", "id"]),
+    ("ix_jobs_created_at_id", "jobs", ["created_at", "id"]),
+    ("ix_jobs_lower_title_id", "jobs", [text("lower(title)"), "id"]),
+    ("ix_jobs_salary_id", "jobs", ["salary", "id"]),
+    ("ix_jobs_location", "jobs", ["location"]),
+    ("ix_employers_user_id", "employers", ["user_id"]),
+    ("ix_employers_created_at_id", "employers", ["created_at", "id"]),
+    ("ix_profiles_user_id", "profiles", ["user_id"]),
+    ("ix_profiles_created_at_id", "profiles", ["created_at", "id"]),
+    ("ix_saved_jobs_job_id", "saved_jobs", ["job_id"]),
+    ("ix_saved_jobs_user_id_created_at", "saved_jobs", ["user_id", "created_at", "id"]),
+]
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    def _index_exists(table, name):
+        if bind.dialect.name == "sqlite":
+            rows = bind.execute(text(f"PRAGMA index_list({table})")).fetchall()
+            return any(r[1] == name for r in rows)
+        rows = bind.execute(
+            text(
+                "SELECT indexname FROM pg_indexes "
+                "WHERE tablename = :t AND indexname = :n"
+            ),
+            {"t": table, "n": name}
+        ).fetchall()
+        return len(rows) > 0
+
+    for name, table, columns in INDEXES:
+        if _index_exists(table, name):
+            continue
+        try:
+            op.create_index(name, table, columns)
+        except OperationalError as exc:
+            if "already exists" not in str(exc):
+                raise
+
+    if bind.dialect.name == "sqlite":
+        bind.execute(text("ANALYZE"))
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        try:
+            op.drop_index(name, table_name=table)
+        except OperationalError:
+            pass
@@ -0,0 +1,99 @@
+"""add updated_at columns and table_versions
+
+Revision ID: d81f6a3c5e27
+Revises: c3e8f25a9b14
+Create Date: 2026-10-18 00:20:00.000000
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+
+# revision identifiers, used by Alembic.
+revision = 'd81f6a3c5e27'
+down_revision = 'c3e8f25a9b14'
+branch_labels = None
+depends_on = None
+
+
+VERSIONED_TABLES = ["employers", "jobs", "applications", "profiles", "saved_jobs"]
+TRACKED_TABLES = ["users", "employers", "jobs", "applications", "profiles", "saved_jobs"]
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    def _table_exists(name):
+        if bind.dialect.name == "sqlite":
+            rows = bind.execute(
+                text("SELECT name FROM sqlite_master WHERE type='table' AND name=:n"),
+                {"n": name}
+            ).fetchall()
+            return len(rows) > 0
+        rows = bind.execute(
+            text("SELECT table_name FROM information_schema.tables WHERE table_name = :n"),
+            {"n": name}
+        ).fetchall()
+        return len(rows) > 0
+
+    def _column_exists(table, column):
+        if bind.dialect.name == "sqlite":
+            rows = bind.execute(text(f"PRAGMA table_info({table})")).fetchall()
+            return any(r[1] == column for r in rows)
+        rows = bind.execute(
+            text(
+                "SELECT column_name FROM information_schema.columns "
+                "WHERE table_name = :t AND column_name = :c"
+            ),
+            {"t": table, "c": column}
+        ).fetchall()
+        return len(rows) > 0
+
+    for table in VERSIONED_TABLES:
+        # Keyset pages are ordered on (created_at, id): a NULL created_at would
+        # make "created_at > :cursor" skip every row after it. Legacy rows get
+        # the table's earliest timestamp.
+        # Bound as a DateTime so SQLite stores it in the format cursors compare against.
+        bind.execute(
+            text(f"UPDATE {table} SET created_at = COALESCE((SELECT MIN(created_at) FROM {table}), :now) "
+                 "WHERE created_at IS NULL").bindparams(sa.bindparam("now", datetime.utcnow(), type_=sa.DateTime()))
+        )
+        if not _column_exists(table, "updated_at"):
+            with op.batch_alter_table(table) as batch:
+                batch.add_column(sa.Column("updated_at", sa.DateTime(), nullable=True))
+            bind.execute(text(f"UPDATE {table} SET updated_at = created_at WHERE updated_at IS NULL"))
+
+    if not _table_exists("table_versions"):
+        try:
+            op.create_table(
+                'table_versions',
+                sa.Column('name', sa.String(length=64), primary_key=True),
+                sa.Column('version', sa.Integer(), nullable=False, server_default="0"),
+                sa.Column('updated_at', sa.DateTime(), nullable=False),
+            )
+        except OperationalError as exc:
+            if "already exists" not in str(exc):
+                raise
+
+    existing = {r[0] for r in bind.execute(text("SELECT name FROM table_versions")).fetchall()}
+    for name in TRACKED_TABLES:
+        if name not in existing:
+            bind.execute(
+                text("INSERT INTO table_versions (name, version, updated_at) VALUES (:n, 0, CURRENT_TIMESTAMP)"),
+                {"n": name}
+            )
+
+
+def downgrade():
+    op.drop_table('table_versions')
+    # Plain ALTER TABLE DROP COLUMN (SQLite 3.35+) rather than a batch table
+    # rebuild, which would drop the jobs_fts triggers along with the table.
+    for table in VERSIONED_TABLES:
+        try:
+            op.drop_column(table, "updated_at")
+        except OperationalError:
+            pass
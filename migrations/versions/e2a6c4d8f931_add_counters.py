@@ -0,0 +1,115 @@
+"""add maintained counters
+
+Revision ID: e2a6c4d8f931
+Revises: d81f6a3c5e27
+Create Date: 2026-10-18 00:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2a6c4d8f931'
+down_revision = 'd81f6a3c5e27'
+branch_labels = None
+depends_on = None
+
+
+TRIGGERS = [
+    "CREATE TRIGGER IF NOT EXISTS counters_jobs_ai AFTER INSERT ON jobs BEGIN "
+    "INSERT INTO counters (name, value) VALUES ('jobs', 1) "
+    "ON CONFLICT(name) DO UPDATE SET value = value + 1; "
+    "INSERT INTO counters (name, value) VALUES ('employer:' || new.employer_id || ':jobs', 1) "
+    "ON CONFLICT(name) DO UPDATE SET value = value + 1; "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS counters_jobs_ad AFTER DELETE ON jobs BEGIN "
+    "UPDATE counters SET value = value - 1 WHERE name IN ('jobs', 'employer:' || old.employer_id || ':jobs'); "
+    "DELETE FROM counters WHERE name = 'job:' || old.id || ':applications'; "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS counters_jobs_au AFTER UPDATE OF employer_id ON jobs "
+    "WHEN old.employer_id IS NOT new.employer_id BEGIN "
+    "UPDATE counters SET value = value - 1 WHERE name = 'employer:' || old.employer_id || ':jobs'; "
+    "INSERT INTO counters (name, value) VALUES ('employer:' || new.employer_id || ':jobs', 1) "
+    "ON CONFLICT(name) DO UPDATE SET value = value + 1; "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS counters_employers_ai AFTER INSERT ON employers BEGIN "
+    "INSERT INTO counters (name, value) VALUES ('employers', 1) "
+    "ON CONFLICT(name) DO UPDATE SET value = value + 1; "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS counters_employers_ad AFTER DELETE ON employers BEGIN "
+    "UPDATE counters SET value = value - 1 WHERE name = 'employers'; "
+    "DELETE FROM counters WHERE name = 'employer:' || old.id || ':jobs'; "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS counters_applications_ai AFTER INSERT ON applications BEGIN "
+    "INSERT INTO counters (name, value) VALUES ('job:' || new.job_id || ':applications', 1) "
+    "ON CONFLICT(name) DO UPDATE SET value = value + 1; "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS counters_applications_ad AFTER DELETE ON applications BEGIN "
+    "UPDATE counters SET value = value - 1 WHERE name = 'job:' || old.job_id || ':applications'; "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS counters_applications_au AFTER UPDATE OF job_id ON applications "
+    "WHEN old.job_id IS NOT new.job_id BEGIN "
+    "UPDATE counters SET value = value - 1 WHERE name = 'job:' || old.job_id || ':applications'; "
+    "INSERT INTO counters (name, value) VALUES ('job:' || new.job_id || ':applications', 1) "
+    "ON CONFLICT(name) DO UPDATE SET value = value + 1; "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS counters_saved_jobs_ai AFTER INSERT ON saved_jobs BEGIN "
+    "INSERT INTO counters (name, value) VALUES ('user:' || new.user_id || ':saved_jobs', 1) "
+    "ON CONFLICT(name) DO UPDATE SET value = value + 1; "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS counters_saved_jobs_ad AFTER DELETE ON saved_jobs BEGIN "
+    "UPDATE counters SET value = value - 1 WHERE name = 'user:' || old.user_id || ':saved_jobs'; "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS counters_users_ad AFTER DELETE ON users BEGIN "
+    "DELETE FROM counters WHERE name = 'user:' || old.id || ':saved_jobs'; "
+    "END",
+]
+TRIGGER_NAMES = [
+    "counters_jobs_ai", "counters_jobs_ad", "counters_jobs_au",
+    "counters_employers_ai", "counters_employers_ad",
+    "counters_applications_ai", "counters_applications_ad", "counters_applications_au",
+    "counters_saved_jobs_ai", "counters_saved_jobs_ad", "counters_users_ad",
+]
+BACKFILL = [
+    "DELETE FROM counters",
+    "INSERT INTO counters (name, value) SELECT 'jobs', COUNT(*) FROM jobs",
+    "INSERT INTO counters (name, value) SELECT 'employers', COUNT(*) FROM employers",
+    "INSERT INTO counters (name, value) "
+    "SELECT 'employer:' || employer_id || ':jobs', COUNT(*) FROM jobs GROUP BY employer_id",
+    "INSERT INTO counters (name, value) "
+    "SELECT 'job:' || job_id || ':applications', COUNT(*) FROM applications GROUP BY job_id",
+    "INSERT INTO counters (name, value) "
+    "SELECT 'user:' || user_id || ':saved_jobs', COUNT(*) FROM saved_jobs GROUP BY user_id",
+]
+
+
+def upgrade():
+    bind = op.get_bind()
+    try:
+        op.create_table(
+            'counters',
+            sa.Column('name', sa.String(length=64), primary_key=True),
+            sa.Column('value', sa.Integer(), nullable=False, server_default="0"),
+        )
+    except OperationalError as exc:
+        if "already exists" not in str(exc):
+            raise
+
+    # Triggers are SQLite-only; other databases fall back to COUNT queries.
+    if bind.dialect.name != "sqlite":
+        return
+    for statement in TRIGGERS:
+        bind.exec_driver_sql(statement)
+    for statement in BACKFILL:
+        bind.exec_driver_sql(statement)
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == "sqlite":
+        for trigger in TRIGGER_NAMES:
+            bind.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+    op.drop_table('counters')
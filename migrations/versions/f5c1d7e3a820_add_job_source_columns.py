@@ -0,0 +1,110 @@
+"""add job source columns for ingested postings
+
+Revision ID: f5c1d7e3a820
+Revises: e2a6c4d8f931
+Create Date: 2026-10-18 00:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+
+# revision identifiers, used by Alembic.
+revision = 'f5c1d7e3a820'
+down_revision = 'e2a6c4d8f931'
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = [
+    sa.Column("source", sa.String(length=32), nullable=False, server_default="local"),
+    sa.Column("external_id", sa.String(length=128), nullable=True),
+    sa.Column("external_url", sa.String(length=500), nullable=True),
+    sa.Column("content_hash", sa.String(length=40), nullable=True),
+    sa.Column("last_seen_at", sa.DateTime(), nullable=True),
+]
+
+# Only locally posted jobs count toward the "jobs" quota counter.
+JOBS_TRIGGERS = [
+    "CREATE TRIGGER counters_jobs_ai AFTER INSERT ON jobs BEGIN "
+    "INSERT INTO counters (name, value) SELECT 'jobs', 1 WHERE new.source = 'local' "
+    "ON CONFLICT(name) DO UPDATE SET value = value + 1; "
+    "INSERT INTO counters (name, value) VALUES ('employer:' || new.employer_id || ':jobs', 1) "
+    "ON CONFLICT(name) DO UPDATE SET value = value + 1; "
+    "END",
+    "CREATE TRIGGER counters_jobs_ad AFTER DELETE ON jobs BEGIN "
+    "UPDATE counters SET value = value - 1 WHERE name = 'jobs' AND old.source = 'local'; "
+    "UPDATE counters SET value = value - 1 WHERE name = 'employer:' || old.employer_id || ':jobs'; "
+    "DELETE FROM counters WHERE name = 'job:' || old.id || ':applications'; "
+    "END",
+]
+PREVIOUS_JOBS_TRIGGERS = [
+    "CREATE TRIGGER counters_jobs_ai AFTER INSERT ON jobs BEGIN "
+    "INSERT INTO counters (name, value) VALUES ('jobs', 1) "
+    "ON CONFLICT(name) DO UPDATE SET value = value + 1; "
+    "INSERT INTO counters (name, value) VALUES ('employer:' || new.employer_id || ':jobs', 1) "
+    "ON CONFLICT(name) DO UPDATE SET value = value + 1; "
+    "END",
+    "CREATE TRIGGER counters_jobs_ad AFTER DELETE ON jobs BEGIN "
+    "UPDATE counters SET value = value - 1 WHERE name IN ('jobs', 'employer:' || old.employer_id || ':jobs'); "
+    "DELETE FROM counters WHERE name = 'job:' || old.id || ':applications'; "
+    "END",
+]
+
+
+def _replace_jobs_triggers(bind, statements):
+    if bind.dialect.name != "sqlite":
+        return
+    bind.execute(text("DROP TRIGGER IF EXISTS counters_jobs_ai"))
+    bind.execute(text("DROP TRIGGER IF EXISTS counters_jobs_ad"))
+    for statement in statements:
+        bind.exec_driver_sql(statement)
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    def _index_exists(table, name):
+        if bind.dialect.name == "sqlite":
+            rows = bind.execute(text(f"PRAGMA index_list({table})")).fetchall()
+            return any(r[1] == name for r in rows)
+        rows = bind.execute(
+            text(
+                "SELECT indexname FROM pg_indexes "
+                "WHERE tablename = :t AND indexname = :n"
+            ),
+            {"t": table, "n": name}
+        ).fetchall()
+        return len(rows) > 0
+
+    for column in COLUMNS:
+        # Plain ALTER TABLE ADD COLUMN: a batch rebuild would drop the jobs triggers.
+        try:
+            op.add_column("jobs", column)
+        except OperationalError as exc:
+            if "duplicate column" not in str(exc):
+                raise
+    if not _index_exists("jobs", "uq_jobs_source_external_id"):
+        op.create_index("uq_jobs_source_external_id", "jobs", ["source", "external_id"], unique=True)
+    if not _index_exists("jobs", "ix_jobs_source_last_seen_at"):
+        op.create_index("ix_jobs_source_last_seen_at", "jobs", ["source", "last_seen_at"])
+
+    _replace_jobs_triggers(bind, JOBS_TRIGGERS)
+    bind.execute(text(
+        "UPDATE counters SET value = (SELECT COUNT(*) FROM jobs WHERE source = 'local') WHERE name = 'jobs'"
+    ))
+
+
+def downgrade():
+    bind = op.get_bind()
+    op.drop_index("ix_jobs_source_last_seen_at", table_name="jobs")
+    op.drop_index("uq_jobs_source_external_id", table_name="jobs")
+    _replace_jobs_triggers(bind, PREVIOUS_JOBS_TRIGGERS)
+    bind.execute(text("UPDATE counters SET value = (SELECT COUNT(*) FROM jobs) WHERE name = 'jobs'"))
+    for column in reversed(COLUMNS):
+        try:
+            op.drop_column("jobs", column.name)
+        except OperationalError:
+            pass
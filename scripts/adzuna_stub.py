@@ -0,0 +1,105 @@
+"""Local stand-in for the Adzuna search API.
+
+Serves canned results for /jobs/<country>/search/<page> so the proxy client can
+be exercised without credentials or network access:
+
+    python scripts/adzuna_stub.py --port 8765 --delay 0.5
+    ADZUNA_BASE_URL=http://127.0.0.1:8765 ADZUNA_APP_ID=x ADZUNA_APP_KEY=x flask run
+
+GET /_stats returns how many searches it has answered. --fail-status makes
+every search fail with that HTTP status, to trip the circuit breaker.
+"""
+import argparse
+import json
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+SEARCH_PATH = re.compile(r"^/jobs/(?P<country>[a-z]{2})/search/(?P<page>\d+)$")
+
+
+def _results(country, page, params):
+    what = params.get("what", "job")
+    where = params.get("where", "Remote")
+    count = int(params.get("results_per_page", 20))
+    query_id = zlib.crc32(what.encode())
+    return {
+        "count": 1000,
+        "results": [
+            {
+                "id": f"{country}-{query_id}-{page}-{i}",
+                "title": f"{what.title()} #{(page - 1) * count + i}",
+                "description": f"Stub posting for '{what}' in {where}.",
+                "location": {"display_name": where},
+                "company": {"display_name": "Stub Co"},
+                "salary_min": 40000 + 1000 * i,
+                "salary_max": 60000 + 1000 * i,
+                "redirect_url": f"https://example.com/{country}/{page}/{i}",
+                "created": "2026-01-01T00:00:00Z",
+            }
+            for i in range(count)
+        ],
+    }
+
+
+def make_server(port=0, delay=0.0, fail_status=None):
+    """Build (but don't start) a stub server; `server.stats["searches"]`
+    counts the searches answered."""
+    stats = {"searches": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status, body):
+            raw = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(raw)))
+            self.end_headers()
+            self.wfile.write(raw)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == "/_stats":
+                return self._send(200, stats)
+            match = SEARCH_PATH.match(url.path)
+            if not match:
+                return self._send(404, {"error": "not found"})
+            params = {k: v[0] for k, v in parse_qs(url.query).items()}
+            if not params.get("app_id") or not params.get("app_key"):
+                return self._send(401, {"error": "missing credentials"})
+            with lock:
+                stats["searches"] += 1
+            if delay:
+                time.sleep(delay)
+            if fail_status:
+                return self._send(fail_status, {"error": "stub failure"})
+            self._send(200, _results(match["country"], int(match["page"]), params))
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    server.daemon_threads = True
+    server.stats = stats
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds to sleep per search")
+    parser.add_argument("--fail-status", type=int, default=None)
+    args = parser.parse_args()
+    server = make_server(args.port, args.delay, args.fail_status)
+    print(f"Adzuna stub listening on http://127.0.0.1:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""POST /jobs/ one posting at a time vs POST /jobs/bulk.
+
+Posts --rows postings as an employer against a throwaway database, first one
+request each, then as one NDJSON upload into a second employer's catalogue,
+then re-sends that upload unchanged and with --changed postings edited to
+time the upsert path. MAX_JOBS (the 100-posting quota) is lifted for the run:
+
+    python scripts/bench_bulk_jobs.py --rows 2000 --chunk-size 500
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+WORDS = "python flask sql react docker cloud data api design support sales remote senior junior team".split()
+
+
+def _posting(i, employer_id):
+    words = " ".join(WORDS[(i * k) % len(WORDS)] for k in range(1, 12))
+    return {
+        "title": f"{WORDS[i % len(WORDS)].title()} role {i}",
+        "description": f"Posting {i}: {words} {i * 7919}",
+        "location": f"City {i % 40}",
+        "salary": 40000 + i,
+        "employer_id": employer_id,
+        "reference": f"REF-{i}",
+    }
+
+
+def _employer(client, name):
+    body = {"username": name, "email": f"{name}@x.com", "password": "password1", "role": "employer",
+            "company_name": name.title(), "phone": "1"}
+    assert client.post("/auth/register", json=body).status_code == 201
+    token = client.post("/auth/login", json={"email": body["email"], "password": "password1"}).get_json()["token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _bulk(client, headers, postings):
+    body = "\n".join(json.dumps(p) for p in postings)
+    started = time.perf_counter()
+    response = client.post("/jobs/bulk", data=body, headers={**headers, "Content-Type": "application/x-ndjson"})
+    elapsed = time.perf_counter() - started
+    assert response.status_code == 200, response.get_json()
+    counts = response.get_json()
+    return elapsed, {k: counts[k] for k in ("created", "updated", "unchanged", "error")}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--changed", type=int, default=100)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench-bulk-jobs-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+    os.environ["SIMILAR_VECTORS_PATH"] = os.path.join(tmp, "vectors.f32")
+    os.environ["SUGGEST_SNAPSHOT_PATH"] = os.path.join(tmp, "suggest.npz")
+    os.environ["DENYLIST_PATH"] = os.path.join(tmp, "revoked.bloom")
+    os.environ["RATE_LIMIT_BACKEND"] = "off"
+    os.environ["PASSWORD_HASH_WORKERS"] = "0"
+    os.environ["BULK_CHUNK_SIZE"] = str(args.chunk_size)
+    os.environ["BULK_MAX_ROWS"] = str(max(args.rows, 10000))
+
+    from app import create_app
+    from app.routes import jobs
+
+    jobs.MAX_JOBS = 10 ** 9
+    app = create_app()
+    client = app.test_client()
+    single_headers = _employer(client, "single")
+    bulk_headers = _employer(client, "bulk")
+
+    started = time.perf_counter()
+    for i in range(args.rows):
+        response = client.post("/jobs/", json=_posting(i, 1), headers=single_headers)
+        assert response.status_code == 201, response.get_json()
+    single = time.perf_counter() - started
+    print(f"{'POST /jobs/ x' + str(args.rows):<24} {single:7.2f} s  {args.rows / single:8.0f} rows/s")
+
+    postings = [_posting(i, 2) for i in range(args.rows)]
+    for label, batch in (
+        ("bulk insert", postings),
+        ("bulk re-send", postings),
+        (f"bulk, {args.changed} changed", [
+            {**p, "salary": p["salary"] + 1} if i < args.changed else p for i, p in enumerate(postings)
+        ]),
+    ):
+        elapsed, counts = _bulk(client, bulk_headers, batch)
+        print(f"{label:<24} {elapsed:7.2f} s  {args.rows / elapsed:8.0f} rows/s  {counts}")
+
+
+if __name__ == "__main__":
+    main()
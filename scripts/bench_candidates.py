@@ -0,0 +1,86 @@
+"""Applicant ranking latency for one posting with many applicants.
+
+Creates a posting mentioning --job-skills skills and --applicants users who
+applied to it, each with a profile listing 3-12 skills, then times
+matching.rank_candidates cold (profiles parsed), warm (parsed profiles
+reused, ranking recomputed) and cached.
+
+    python scripts/bench_candidates.py --applicants 5000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--applicants", type=int, default=5000)
+    parser.add_argument("--skills", type=int, default=500)
+    parser.add_argument("--job-skills", type=int, default=15)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench-candidates-")
+    os.environ["SIMILAR_VECTORS_PATH"] = os.path.join(tmp, "vectors.f32")
+    from config import Config
+
+    path = os.path.join(tmp, "bench.db")
+    Config.SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+    from app import create_app, matching
+    from app.extensions import db
+    from app.models import Job
+
+    app = create_app()
+    rng = random.Random(args.seed)
+    skills = [f"skill{i}" for i in range(args.skills)]
+    now = datetime.utcnow().isoformat(" ")
+
+    conn = sqlite3.connect(path)
+    conn.execute("INSERT INTO users (id, username, email, password_hash, role) VALUES (1, 'b', 'b@b', 'x', 'employer')")
+    conn.execute(
+        "INSERT INTO employers (id, user_id, name, email, company_name, phone, contact_person, password_hash) "
+        "VALUES (1, 1, 'B', 'b@b', 'B', '0', 'b', 'x')"
+    )
+    conn.execute(
+        "INSERT INTO jobs (id, title, description, location, salary, employer_id, source, created_at) "
+        "VALUES (1, 'Engineer', ?, 'Remote', 1.0, 1, 'local', ?)",
+        ("We use " + ", ".join(rng.sample(skills, args.job_skills)), now),
+    )
+    user_ids = range(2, args.applicants + 2)
+    conn.executemany(
+        "INSERT INTO users (id, username, email, password_hash, role) VALUES (?, ?, ?, 'x', 'user')",
+        [(user_id, f"u{user_id}", f"u{user_id}@b") for user_id in user_ids],
+    )
+    conn.executemany(
+        "INSERT INTO profiles (user_id, full_name, skills, created_at, updated_at) VALUES (?, 'P', ?, ?, ?)",
+        [(user_id, ", ".join(rng.sample(skills, rng.randint(3, 12))), now, now) for user_id in user_ids],
+    )
+    conn.executemany(
+        "INSERT INTO applications (user_id, job_id, full_name, email, phone, created_at) VALUES (?, 1, 'P', 'p@b', '0', ?)",
+        [(user_id, now) for user_id in user_ids],
+    )
+    conn.commit()
+    conn.close()
+
+    print(app.test_cli_runner().invoke(args=["matching", "index"]).output.strip())
+    with app.app_context():
+        job = db.session.get(Job, 1)
+        state = app.extensions["matching"]
+        for label in ("cold", "warm", "cached"):
+            if label != "cached":
+                state["candidates"].clear()
+            started = time.perf_counter()
+            ranked = matching.rank_candidates(job)
+            print(f"{label:<7} {(time.perf_counter() - started) * 1000:8.1f} ms  {len(ranked)} ranked, best {ranked[0][1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Near-duplicate index build and whole-table scan on synthetic postings.
+
+Generates --jobs random postings, of which --dup-rate are light edits of an
+earlier posting (a few words swapped or appended), indexes them and runs the
+clustering scan, then reports timings and how many planted duplicates were
+found.
+
+    python scripts/bench_dedupe.py --jobs 100000 --dup-rate 0.05
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+VOCABULARY = [f"w{i}" for i in range(20000)]
+
+
+def _posting(rng):
+    return rng.choice(VOCABULARY).title() + " " + rng.choice(VOCABULARY), " ".join(rng.choices(VOCABULARY, k=rng.randint(40, 120)))
+
+
+def _edit(rng, description):
+    words = description.split()
+    for _ in range(rng.randint(1, 3)):
+        words[rng.randrange(len(words))] = rng.choice(VOCABULARY)
+    return " ".join(words)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=50000)
+    parser.add_argument("--dup-rate", type=float, default=0.05)
+    parser.add_argument("--batch-size", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    from config import Config
+
+    path = os.path.join(tempfile.mkdtemp(prefix="bench-dedupe-"), "bench.db")
+    Config.SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+    from app import create_app
+    from app.dedupe import find_clusters, index_jobs
+    from app.extensions import db
+
+    app = create_app()
+    rng = random.Random(args.seed)
+    rows, planted = [], {}
+    for job_id in range(1, args.jobs + 1):
+        if rows and rng.random() < args.dup_rate:
+            original = rng.randrange(len(rows))
+            title, description = rows[original][1], _edit(rng, rows[original][2])
+            planted[job_id] = original + 1
+        else:
+            title, description = _posting(rng)
+        rows.append((job_id, title, description))
+
+    conn = sqlite3.connect(path)
+    conn.execute("INSERT INTO users (id, username, email, password_hash, role) VALUES (1, 'b', 'b@b', 'x', 'employer')")
+    conn.execute(
+        "INSERT INTO employers (id, user_id, name, email, company_name, phone, contact_person, password_hash) "
+        "VALUES (1, 1, 'B', 'b@b', 'B', '0', 'b', 'x')"
+    )
+    now = datetime.utcnow().isoformat(" ")
+    conn.executemany(
+        "INSERT INTO jobs (id, title, description, location, salary, employer_id, source, created_at) "
+        "VALUES (?, ?, ?, 'Remote', 1.0, 1, 'local', ?)",
+        [(job_id, title, description, now) for job_id, title, description in rows],
+    )
+    conn.commit()
+    conn.close()
+
+    with app.app_context():
+        started = time.perf_counter()
+        for start in range(0, len(rows), args.batch_size):
+            index_jobs(db.session.connection(), rows[start:start + args.batch_size])
+            db.session.commit()
+        index_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        clusters = find_clusters(app.config["DUPLICATE_THRESHOLD"])
+        scan_seconds = time.perf_counter() - started
+
+    cluster_of = {job_id: i for i, cluster in enumerate(clusters) for job_id in cluster}
+    found = sum(
+        1 for dup, original in planted.items()
+        if dup in cluster_of and cluster_of[dup] == cluster_of.get(original)
+    )
+    print(f"jobs             {args.jobs}")
+    print(f"index            {index_seconds:.1f}s ({args.jobs / index_seconds:.0f} jobs/s)")
+    print(f"scan             {scan_seconds:.1f}s")
+    print(f"clusters         {len(clusters)}")
+    print(f"planted found    {found}/{len(planted)}")
+
+
+if __name__ == "__main__":
+    main()
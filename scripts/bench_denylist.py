@@ -0,0 +1,86 @@
+"""Token denylist check latency with and without the Bloom filter.
+
+Fills revoked_tokens in a throwaway database with --revoked rows, builds the
+shared filter, then times Denylist.is_revoked for live tokens (the common
+case: answered by the filter alone) and for revoked ones (confirmed in the
+table), next to a plain primary-key lookup per check:
+
+    python scripts/bench_denylist.py --revoked 100000
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+
+def _percentile(samples, pct):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * pct))]
+
+
+def _time(fn, jtis):
+    samples = []
+    for jti in jtis:
+        started = time.perf_counter()
+        fn(jti)
+        samples.append((time.perf_counter() - started) * 1e6)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--revoked", type=int, default=100000)
+    parser.add_argument("--checks", type=int, default=20000)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench-denylist-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+    os.environ["SIMILAR_VECTORS_PATH"] = os.path.join(tmp, "vectors.f32")
+    os.environ["SUGGEST_SNAPSHOT_PATH"] = os.path.join(tmp, "suggest.npz")
+    os.environ["RATE_LIMIT_PATH"] = os.path.join(tmp, "rate_limits.bin")
+    os.environ["DENYLIST_PATH"] = os.path.join(tmp, "revoked.bloom")
+    os.environ.setdefault("DENYLIST_CAPACITY", str(args.revoked))
+
+    from app import create_app
+    from app.extensions import db
+    from app.models import RevokedToken
+
+    app = create_app()
+    with app.app_context():
+        expires = datetime.utcnow() + timedelta(days=7)
+        revoked = [str(uuid.uuid4()) for _ in range(args.revoked)]
+        db.session.execute(
+            RevokedToken.__table__.insert(),
+            [{"jti": jti, "token_type": "refresh", "user_id": 1, "expires_at": expires} for jti in revoked],
+        )
+        db.session.commit()
+        denylist = app.extensions["denylist"]
+        started = time.perf_counter()
+        denylist.sweep()
+        rebuild_ms = (time.perf_counter() - started) * 1000
+
+        live = [str(uuid.uuid4()) for _ in range(args.checks)]
+        timings = {
+            "live, filter": _time(denylist.is_revoked, live),
+            "revoked, filter+table": _time(denylist.is_revoked, revoked[:args.checks]),
+            "live, table only": _time(lambda jti: db.session.get(RevokedToken, jti), live),
+        }
+        false_positives = sum(jti in denylist.bloom for jti in live)
+
+    bloom = denylist.bloom
+    print(f"revoked     {args.revoked}, filter {bloom.bits / 8 / 1024:.0f} KiB, {bloom.hashes} hashes, "
+          f"rebuilt in {rebuild_ms:.0f} ms")
+    print(f"false pos.  {false_positives}/{len(live)} live tokens needed a table lookup")
+    for label, samples in timings.items():
+        print(f"{label:<22} p50 {statistics.median(samples):6.1f} us  p99 {_percentile(samples, 0.99):6.1f} us")
+
+
+if __name__ == "__main__":
+    main()
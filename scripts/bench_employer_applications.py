@@ -0,0 +1,104 @@
+"""Employer application listing/authorization latency vs. postings per employer.
+
+Seeds one employer per size with N job postings and a fixed 20 applications,
+then times GET /applications/, GET /applications/<id> and PUT /applications/<id>
+as that employer. With the JOIN/EXISTS queries the numbers should stay flat
+as N grows; the "legacy" column times the old load-every-job-id approach.
+
+    python scripts/bench_employer_applications.py --sizes 10 100 1000 10000
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+APPLICATIONS_PER_EMPLOYER = 20
+
+
+def _median_ms(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="bench-apps-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}"
+
+    from flask_jwt_extended import create_access_token
+    from sqlalchemy import insert
+    from app import create_app
+    from app.extensions import db
+    from app.models import Application, Employer, Job, User
+
+    app = create_app()
+    client = app.test_client()
+
+    with app.app_context():
+        candidates = [
+            User(username=f"cand{i}", email=f"cand{i}@bench.local", password_hash="x", role="user")
+            for i in range(APPLICATIONS_PER_EMPLOYER)
+        ]
+        db.session.add_all(candidates)
+        db.session.commit()
+        candidate_ids = [c.id for c in candidates]
+
+    print(f"{'postings':>9} {'list ms':>9} {'get ms':>9} {'update ms':>10} {'legacy list ms':>15}")
+    for size in args.sizes:
+        with app.app_context():
+            owner = User(username=f"emp{size}", email=f"emp{size}@bench.local", password_hash="x", role="employer")
+            db.session.add(owner)
+            db.session.flush()
+            employer = Employer(
+                user_id=owner.id, name=f"Bench {size}", email=f"emp{size}@bench.local",
+                company_name=f"Bench {size}", phone="0", contact_person="bench", password_hash="x",
+            )
+            db.session.add(employer)
+            db.session.flush()
+            db.session.execute(insert(Job), [
+                {"title": f"Job {i}", "description": "benchmark posting", "location": "Remote",
+                 "salary": 1000 + i, "employer_id": employer.id}
+                for i in range(size)
+            ])
+            job_ids = [j.id for j in Job.query.filter_by(employer_id=employer.id).limit(APPLICATIONS_PER_EMPLOYER)]
+            db.session.execute(insert(Application), [
+                {"user_id": candidate_ids[i], "job_id": job_ids[i % len(job_ids)], "full_name": "Bench",
+                 "email": "c@bench.local", "phone": "0", "status": "pending"}
+                for i in range(APPLICATIONS_PER_EMPLOYER)
+            ])
+            db.session.commit()
+            application_id = Application.query.filter(Application.job_id.in_(job_ids)).first().id
+            headers = {"Authorization": f"Bearer {create_access_token(identity=str(owner.id))}"}
+            employer_id = employer.id
+
+            def legacy_list():
+                ids = [j.id for j in Job.query.filter_by(employer_id=employer_id).all()]
+                Application.query.filter(Application.job_id.in_(ids)).all()
+                db.session.remove()
+
+            legacy_ms = _median_ms(legacy_list, args.repeat)
+
+        list_ms = _median_ms(lambda: client.get("/applications/?limit=20", headers=headers), args.repeat)
+        get_ms = _median_ms(lambda: client.get(f"/applications/{application_id}", headers=headers), args.repeat)
+        update_ms = _median_ms(
+            lambda: client.put(f"/applications/{application_id}", json={"status": "reviewed"}, headers=headers),
+            args.repeat,
+        )
+        print(f"{size:>9} {list_ms:>9.2f} {get_ms:>9.2f} {update_ms:>10.2f} {legacy_ms:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
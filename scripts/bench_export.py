@@ -0,0 +1,99 @@
+"""Peak memory and throughput of GET /export/jobs vs the legacy GET /jobs/.
+
+Fills a throwaway database with --rows jobs, then fetches them once through
+the unpaginated list endpoint (every row built into one JSON body) and once
+per export format, consuming the stream chunk by chunk as a client would.
+Peak Python memory is measured with tracemalloc:
+
+    python scripts/bench_export.py --rows 100000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+
+def _measure(fetch):
+    tracemalloc.start()
+    started = time.perf_counter()
+    size = fetch()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, size, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench-export-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+    os.environ["SIMILAR_VECTORS_PATH"] = os.path.join(tmp, "vectors.f32")
+    os.environ["SUGGEST_SNAPSHOT_PATH"] = os.path.join(tmp, "suggest.npz")
+    os.environ["DENYLIST_PATH"] = os.path.join(tmp, "revoked.bloom")
+    os.environ["RATE_LIMIT_BACKEND"] = "off"
+    os.environ["RESPONSE_CACHE_BACKEND"] = "off"
+    os.environ["PASSWORD_HASH_WORKERS"] = "0"
+
+    from werkzeug.security import generate_password_hash
+
+    from app import create_app
+    from app.extensions import db
+    from app.models import Employer, Job, User
+
+    app = create_app()
+    with app.app_context():
+        admin = User(username="admin", email="admin@x.com", password_hash=generate_password_hash("password1"),
+                     role="admin")
+        db.session.add(admin)
+        db.session.flush()
+        db.session.add(Employer(user_id=admin.id, name="Bench", email="bench@x.com", company_name="Bench",
+                                phone="1", contact_person="-", password_hash="-"))
+        db.session.commit()
+        now = datetime.utcnow()
+        for start in range(0, args.rows, 10000):
+            db.session.execute(Job.__table__.insert(), [
+                {"title": f"Job {i}", "description": f"Description of posting {i} " * 8, "location": f"City {i % 50}",
+                 "salary": 40000 + i, "employer_id": 1, "source": "local", "created_at": now, "updated_at": now}
+                for i in range(start, min(start + 10000, args.rows))
+            ])
+        db.session.commit()
+
+    client = app.test_client()
+    token = client.post("/auth/login", json={"email": "admin@x.com", "password": "password1"}).get_json()["token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    def legacy():
+        return len(client.get("/jobs/", headers=headers).get_data())
+
+    def export(fmt, encoding="identity"):
+        def fetch():
+            response = client.get(f"/export/jobs?format={fmt}", headers={**headers, "Accept-Encoding": encoding},
+                                  buffered=False)
+            size = sum(len(chunk) for chunk in response.response)
+            response.close()
+            return size
+        return fetch
+
+    print(f"{args.rows} jobs")
+    for label, fetch in (
+        ("GET /jobs/ (legacy array)", legacy),
+        ("export csv", export("csv")),
+        ("export ndjson", export("ndjson")),
+        ("export csv, gzip", export("csv", "gzip")),
+    ):
+        elapsed, size, peak = _measure(fetch)
+        print(f"{label:<26} {elapsed:6.2f} s  {args.rows / elapsed:8.0f} rows/s  "
+              f"{size / 1e6:7.1f} MB sent  peak {peak / 1e6:7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
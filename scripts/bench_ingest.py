@@ -0,0 +1,58 @@
+"""Adzuna ingestion throughput against the local stub server.
+
+Imports --queries x --pages x --per-page postings into a fresh SQLite
+database, then repeats the run to time the incremental (nothing changed) path.
+
+    python scripts/bench_ingest.py --queries 4 --pages 10 --per-page 50
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", type=int, default=4)
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--per-page", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args()
+
+    from adzuna_stub import make_server
+    from config import Config
+
+    server = make_server()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ.setdefault("ADZUNA_APP_ID", "bench")
+    os.environ.setdefault("ADZUNA_APP_KEY", "bench")
+    Config.SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='bench-ingest-'), 'bench.db')}"
+    Config.ADZUNA_BASE_URL = f"http://127.0.0.1:{server.server_address[1]}"
+    Config.ADZUNA_CACHE_TTL = 0
+    Config.ADZUNA_STALE_TTL = 0
+    Config.INGEST_RESULTS_PER_PAGE = args.per_page
+    Config.INGEST_BATCH_SIZE = args.batch_size
+
+    from app import create_app
+    from app.ingest import run_ingestion
+
+    app = create_app()
+    queries = [f"bench query {i}" for i in range(args.queries)]
+    print(f"{'run':>12} {'pages':>6} {'fetched':>8} {'inserted':>9} {'unchanged':>10} {'seconds':>8} {'rows/sec':>9}")
+    with app.app_context():
+        for label in ("initial", "incremental"):
+            stats = run_ingestion(queries, args.pages)
+            print(
+                f"{label:>12} {stats['pages']:>6} {stats['fetched']:>8} {stats['inserted']:>9} "
+                f"{stats['unchanged']:>10} {stats['seconds']:>8} {stats['rows_per_sec']:>9}"
+            )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
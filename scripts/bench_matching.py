@@ -0,0 +1,86 @@
+"""Skill index build and nightly-digest matching on synthetic data.
+
+Creates --jobs postings that each mention a handful of skills from a
+--skills-sized vocabulary (popular skills much more often, as in real
+postings) and --profiles profiles listing 3-12 skills, rebuilds the index
+with `flask matching index`, then times `flask matching digest`.
+
+    python scripts/bench_matching.py --jobs 100000 --profiles 100000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+FILLER = [f"word{i}" for i in range(5000)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=20000)
+    parser.add_argument("--profiles", type=int, default=20000)
+    parser.add_argument("--skills", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench-matching-")
+    os.environ["SIMILAR_VECTORS_PATH"] = os.path.join(tmp, "vectors.f32")
+    from config import Config
+
+    path = os.path.join(tmp, "bench.db")
+    Config.SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+    from app import create_app
+
+    app = create_app()
+    rng = random.Random(args.seed)
+    skills = [f"skill{i}" for i in range(args.skills)]
+    popularity = [1 / (rank + 1) for rank in range(args.skills)]
+    now = datetime.utcnow().isoformat(" ")
+
+    conn = sqlite3.connect(path)
+    conn.execute("INSERT INTO users (id, username, email, password_hash, role) VALUES (1, 'b', 'b@b', 'x', 'employer')")
+    conn.execute(
+        "INSERT INTO employers (id, user_id, name, email, company_name, phone, contact_person, password_hash) "
+        "VALUES (1, 1, 'B', 'b@b', 'B', '0', 'b', 'x')"
+    )
+    jobs = []
+    for job_id in range(1, args.jobs + 1):
+        mentioned = rng.choices(skills, weights=popularity, k=rng.randint(2, 8))
+        words = rng.choices(FILLER, k=60) + mentioned
+        rng.shuffle(words)
+        jobs.append((job_id, f"{mentioned[0]} engineer", " ".join(words), now))
+    conn.executemany(
+        "INSERT INTO jobs (id, title, description, location, salary, employer_id, source, created_at) "
+        "VALUES (?, ?, ?, 'Remote', 1.0, 1, 'local', ?)",
+        jobs,
+    )
+    conn.executemany(
+        "INSERT INTO users (id, username, email, password_hash, role) VALUES (?, ?, ?, 'x', 'user')",
+        [(user_id, f"u{user_id}", f"u{user_id}@b") for user_id in range(2, args.profiles + 2)],
+    )
+    conn.executemany(
+        "INSERT INTO profiles (user_id, full_name, skills, created_at) VALUES (?, 'P', ?, ?)",
+        [
+            (user_id, ", ".join(rng.choices(skills, weights=popularity, k=rng.randint(3, 12))), now)
+            for user_id in range(2, args.profiles + 2)
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+    runner = app.test_cli_runner()
+    for command in (["matching", "index"], ["matching", "digest", "--output", os.devnull]):
+        started = time.perf_counter()
+        result = runner.invoke(args=command)
+        print(f"{' '.join(command):<16} {time.perf_counter() - started:6.1f}s  {result.output.strip()}")
+
+
+if __name__ == "__main__":
+    main()
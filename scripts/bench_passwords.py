@@ -0,0 +1,132 @@
+"""Password hashing cost and login throughput.
+
+First times one hash for each candidate PASSWORD_HASH_METHOD, then runs a
+burst of concurrent POST /auth/login calls against a throwaway database with
+hashing inline and in the process pool, while another thread polls /health
+to show what the burst does to unrelated requests:
+
+    python scripts/bench_passwords.py --logins 200 --threads 16 --workers 2
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+METHODS = [
+    "pbkdf2:sha256:260000",
+    "pbkdf2:sha256:600000",
+    "pbkdf2:sha256:1000000",
+    "scrypt:16384:8:1",
+    "scrypt:32768:8:1",
+    "scrypt:65536:8:1",
+]
+
+
+def _percentile(samples, pct):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * pct))]
+
+
+def _costs(rounds):
+    from werkzeug.security import check_password_hash, generate_password_hash
+
+    print("method                       hash ms  verify ms")
+    for method in METHODS:
+        hashed = generate_password_hash("correct horse", method)
+        timings = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            check_password_hash(hashed, "correct horse")
+            timings.append((time.perf_counter() - started) * 1000)
+        started = time.perf_counter()
+        generate_password_hash("correct horse", method)
+        print(f"{method:<28} {(time.perf_counter() - started) * 1000:7.1f}  {statistics.median(timings):9.1f}")
+
+
+def _burst(app, logins, threads, users):
+    clients = threading.local()
+    stop = threading.Event()
+    health = []
+
+    def login(i):
+        if not hasattr(clients, "client"):
+            clients.client = app.test_client()
+        response = clients.client.post("/auth/login", json={"email": f"u{i % users}@x.com", "password": "password1"})
+        return response.status_code
+
+    def poll():
+        client = app.test_client()
+        while not stop.is_set():
+            started = time.perf_counter()
+            client.get("/health")
+            health.append((time.perf_counter() - started) * 1000)
+            time.sleep(0.005)
+
+    poller = threading.Thread(target=poll)
+    poller.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(threads) as executor:
+        statuses = Counter(executor.map(login, range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    poller.join()
+    return statuses, elapsed, health
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--method", default="scrypt:32768:8:1")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--queue", type=int, default=64)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    _costs(args.rounds)
+
+    tmp = tempfile.mkdtemp(prefix="bench-passwords-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+    os.environ["SIMILAR_VECTORS_PATH"] = os.path.join(tmp, "vectors.f32")
+    os.environ["SUGGEST_SNAPSHOT_PATH"] = os.path.join(tmp, "suggest.npz")
+    os.environ["RATE_LIMIT_BACKEND"] = "off"
+    from werkzeug.security import generate_password_hash
+
+    from app import create_app
+    from app.extensions import db
+    from app.models import User
+    from app.passwords import PasswordHasher
+
+    app = create_app()
+    with app.app_context():
+        hashed = generate_password_hash("password1", args.method)
+        db.session.add_all(
+            User(username=f"u{i}", email=f"u{i}@x.com", password_hash=hashed, role="user") for i in range(args.users)
+        )
+        db.session.commit()
+
+    print(f"\n{args.logins} logins from {args.threads} threads, {args.method}, {os.cpu_count()} CPUs")
+    for workers in (0, args.workers):
+        app.extensions["passwords"] = PasswordHasher(args.method, workers=workers, queue_size=args.queue)
+        if workers:
+            _burst(app, workers, workers, args.users)  # start the pool's processes
+        statuses, elapsed, health = _burst(app, args.logins, args.threads, args.users)
+        label = f"pool of {workers}" if workers else "inline"
+        ok = statuses.get(200, 0)
+        print(
+            f"{label:<11} {ok / elapsed:6.1f} logins/s  statuses {dict(statuses)}  "
+            f"/health p50 {statistics.median(health):.1f} ms p99 {_percentile(health, 0.99):.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Rate limiter overhead and cross-process accuracy.
+
+Times one limit check against the per-process and shared backends, for a
+single hot key and for many distinct keys, then has --processes processes
+hammer one shared key for --seconds and compares the requests let through
+with what the rate allows (burst + rate x seconds):
+
+    python scripts/bench_rate_limit.py --checks 200000 --processes 4
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from app.rate_limit import MemoryBackend, SharedBackend, parse_rate  # noqa: E402
+
+
+def _time_checks(backend, keys, checks, interval, tolerance):
+    started = time.perf_counter()
+    for i in range(checks):
+        backend.hit(keys[i % len(keys)], interval, tolerance, time.time())
+    return (time.perf_counter() - started) / checks * 1e6
+
+
+def _hammer(path, slots, rate, seconds, ready, results):
+    backend = SharedBackend(path, slots=slots)
+    interval, tolerance = parse_rate(rate)
+    ready.wait()
+    until = time.time() + seconds
+    allowed = attempts = 0
+    while time.time() < until:
+        attempts += 1
+        if not backend.hit("login:ip:203.0.113.7", interval, tolerance, time.time()):
+            allowed += 1
+    results.put((allowed, attempts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--checks", type=int, default=200000)
+    parser.add_argument("--keys", type=int, default=10000)
+    parser.add_argument("--slots", type=int, default=65536)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--rate", default="100/second")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench-rate-limit-")
+    interval, tolerance = parse_rate("1000000/second")  # never limits, so every check writes
+    rng = random.Random(7)
+    many = [f"RATE_LIMIT_LOGIN:ip:10.{rng.randrange(256)}.{rng.randrange(256)}.{i % 256}" for i in range(args.keys)]
+    backends = {
+        "memory": MemoryBackend(max_keys=args.slots),
+        "shared": SharedBackend(os.path.join(tmp, "overhead.bin"), slots=args.slots),
+    }
+    for name, backend in backends.items():
+        hot = _time_checks(backend, ["RATE_LIMIT_LOGIN:ip:127.0.0.1"], args.checks, interval, tolerance)
+        spread = _time_checks(backend, many, args.checks, interval, tolerance)
+        print(f"{name:<7} one key {hot:5.2f} us/check   {args.keys} keys {spread:5.2f} us/check")
+
+    path = os.path.join(tmp, "shared.bin")
+    SharedBackend(path, slots=args.slots)
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    ready = context.Barrier(args.processes)
+    workers = [
+        context.Process(target=_hammer, args=(path, args.slots, args.rate, args.seconds, ready, results))
+        for _ in range(args.processes)
+    ]
+    for worker in workers:
+        worker.start()
+    counts = [results.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+    allowed = sum(a for a, _ in counts)
+    attempts = sum(n for _, n in counts)
+    interval, tolerance = parse_rate(args.rate)
+    expected = tolerance / interval + args.seconds / interval
+    print(
+        f"{args.processes} processes, {args.rate} for {args.seconds:.0f}s: {attempts} attempts, "
+        f"{allowed} allowed (limit allows {expected:.0f})"
+    )
+
+
+if __name__ == "__main__":
+    main()
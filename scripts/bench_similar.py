@@ -0,0 +1,68 @@
+"""Similar-jobs lookup latency on a synthetic vector file.
+
+Fills a VectorStore with --jobs random postings (written through the same
+incremental update path commits use), then times uncached and cached top-k
+lookups:
+
+    python scripts/bench_similar.py --jobs 100000 --dimensions 256
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from app.similar import VectorStore, vectorize  # noqa: E402
+
+VOCABULARY = [f"w{i}" for i in range(20000)]
+
+
+def _percentile(samples, pct):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * pct))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=100000)
+    parser.add_argument("--dimensions", type=int, default=256)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    path = os.path.join(tempfile.mkdtemp(prefix="bench-similar-"), "vectors.f32")
+    store = VectorStore(path, args.dimensions, cache_size=args.queries)
+
+    started = time.perf_counter()
+    batch = {}
+    for job_id in range(1, args.jobs + 1):
+        title = " ".join(rng.choices(VOCABULARY, k=3))
+        batch[job_id] = vectorize(title, " ".join(rng.choices(VOCABULARY, k=rng.randint(40, 120))), args.dimensions)
+        if len(batch) == 1000:
+            store.update(batch)
+            batch = {}
+    store.update(batch)
+    build_seconds = time.perf_counter() - started
+
+    ids = [rng.randint(1, args.jobs) for _ in range(args.queries)]
+    timings = {"uncached": [], "cached": []}
+    for label in ("uncached", "cached"):
+        for job_id in ids:
+            started = time.perf_counter()
+            store.similar_to(job_id, store.vector(job_id))
+            timings[label].append((time.perf_counter() - started) * 1000)
+
+    print(f"jobs        {args.jobs} x {args.dimensions} float32 ({os.path.getsize(path) / 2**20:.0f} MiB)")
+    print(f"fill        {build_seconds:.1f}s ({args.jobs / build_seconds:.0f} jobs/s)")
+    for label, samples in timings.items():
+        print(f"{label:<11} p50 {statistics.median(samples):.2f} ms  p99 {_percentile(samples, 0.99):.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
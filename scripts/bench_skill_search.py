@@ -0,0 +1,89 @@
+"""Boolean skill search latency over synthetic profile_skills posting lists.
+
+Fills --profiles profiles with 3-12 skills each from a --skills vocabulary
+(popular skills far more common than rare ones), then times a few queries
+mixing common and rare skills at two table sizes, to show cost follows the
+posting lists involved rather than the profile count.
+
+    python scripts/bench_skill_search.py --profiles 200000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+QUERIES = [
+    "skill0",
+    "skill0 AND skill1",
+    "skill0 AND skill1999",
+    "skill1999 OR skill1998",
+    "(skill0 OR skill1) AND skill500 AND NOT skill2",
+]
+
+
+def _fill(path, start, count, skills, rng):
+    now = datetime.utcnow().isoformat(" ")
+    popularity = [1 / (rank + 1) for rank in range(len(skills))]
+    conn = sqlite3.connect(path)
+    ids = range(start, start + count)
+    conn.executemany(
+        "INSERT INTO users (id, username, email, password_hash, role) VALUES (?, ?, ?, 'x', 'user')",
+        [(i, f"u{i}", f"u{i}@b") for i in ids],
+    )
+    conn.executemany("INSERT INTO profiles (id, user_id, full_name, created_at) VALUES (?, ?, 'P', ?)", [(i, i, now) for i in ids])
+    rows = []
+    for i in ids:
+        for skill in set(rng.choices(range(len(skills)), weights=popularity, k=rng.randint(3, 12))):
+            rows.append((skill + 1, i))
+    conn.executemany("INSERT INTO profile_skills (skill_id, profile_id) VALUES (?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", type=int, default=200000)
+    parser.add_argument("--skills", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench-skill-search-")
+    os.environ["SIMILAR_VECTORS_PATH"] = os.path.join(tmp, "vectors.f32")
+    from config import Config
+
+    path = os.path.join(tmp, "bench.db")
+    Config.SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+    from app import create_app
+    from app.skill_query import search_profiles
+
+    app = create_app()
+    rng = random.Random(args.seed)
+    skills = [f"skill{i}" for i in range(args.skills)]
+    conn = sqlite3.connect(path)
+    conn.executemany("INSERT INTO skills (id, name) VALUES (?, ?)", [(i + 1, name) for i, name in enumerate(skills)])
+    conn.commit()
+    conn.close()
+
+    half = args.profiles // 2
+    for label, start, count in (("half", 1, half), ("full", half + 1, args.profiles - half)):
+        _fill(path, start, count, skills, rng)
+        print(f"-- {start + count - 1} profiles")
+        with app.app_context():
+            for query in QUERIES:
+                started = time.perf_counter()
+                for _ in range(args.repeat):
+                    matches = search_profiles(query)
+                elapsed = (time.perf_counter() - started) / args.repeat * 1000
+                print(f"{query:<50} {elapsed:8.2f} ms  {matches.size} matches")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Concurrent read/write throughput: default SQLite settings vs. the SQLITE_PRAGMAS profile.
+
+Starts reader and writer processes (like gunicorn workers) against a fresh
+database per profile and reports operations per second and how many
+operations failed with "database is locked".
+
+    python scripts/bench_sqlite_concurrency.py --readers 4 --writers 2 --seconds 5
+"""
+import argparse
+import multiprocessing
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+SEED_JOBS = 5000
+READ_SQL = (
+    "SELECT id, title, description, location, salary, employer_id, created_at "
+    "FROM jobs ORDER BY created_at DESC, id DESC LIMIT 50"
+)
+WRITE_SQL = (
+    "INSERT INTO jobs (title, description, location, salary, employer_id, created_at) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+
+
+def _connect(path, pragmas):
+    from app.sqlite_profile import apply_pragmas
+
+    conn = sqlite3.connect(path)
+    apply_pragmas(conn, pragmas)
+    return conn
+
+
+def _worker(kind, path, pragmas, seconds, results):
+    conn = _connect(path, pragmas)
+    ops = errors = 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        try:
+            if kind == "read":
+                conn.execute(READ_SQL).fetchall()
+            else:
+                conn.execute(WRITE_SQL, ("Bench job", "written under load", "Remote", 1.0, 1,
+                                         datetime.utcnow().isoformat(" ")))
+                conn.commit()
+            ops += 1
+        except sqlite3.OperationalError:
+            conn.rollback()
+            errors += 1
+    conn.close()
+    results.put((kind, ops, errors))
+
+
+def _prepare(path):
+    from app import create_app
+    from config import Config
+
+    from app.extensions import db
+
+    Config.SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+    app = create_app()
+    with app.app_context():
+        db.engine.dispose()
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA foreign_keys=OFF")
+    conn.execute(
+        "INSERT INTO users (id, username, email, password_hash, role) "
+        "VALUES (1, 'bench', 'bench@bench.local', 'x', 'employer')"
+    )
+    conn.execute(
+        "INSERT INTO employers (id, user_id, name, email, company_name, phone, contact_person, password_hash) "
+        "VALUES (1, 1, 'Bench', 'bench@bench.local', 'Bench', '0', 'bench', 'x')"
+    )
+    now = datetime.utcnow().isoformat(" ")
+    conn.executemany(WRITE_SQL, [
+        (f"Seed job {i}", "seed posting for the benchmark", "Remote", float(i), 1, now)
+        for i in range(SEED_JOBS)
+    ])
+    conn.commit()
+    conn.close()
+
+
+def _run(label, pragmas, args):
+    path = os.path.join(tempfile.mkdtemp(prefix="bench-sqlite-"), "bench.db")
+    _prepare(path)
+    # journal_mode is stored in the database file, so set it once up front.
+    _connect(path, pragmas).close()
+
+    results = multiprocessing.Queue()
+    procs = [
+        multiprocessing.Process(target=_worker, args=(kind, path, pragmas, args.seconds, results))
+        for kind in ["read"] * args.readers + ["write"] * args.writers
+    ]
+    for proc in procs:
+        proc.start()
+    totals = {"read": [0, 0], "write": [0, 0]}
+    for _ in procs:
+        kind, ops, errors = results.get()
+        totals[kind][0] += ops
+        totals[kind][1] += errors
+    for proc in procs:
+        proc.join()
+
+    reads, read_errors = totals["read"]
+    writes, write_errors = totals["write"]
+    print(
+        f"{label:>9} {reads / args.seconds:>12.0f} {writes / args.seconds:>13.0f} "
+        f"{read_errors + write_errors:>14}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    from config import Config
+
+    # What the app ran with before: SQLite's own defaults plus foreign_keys.
+    baseline = {"journal_mode": "DELETE"}
+    tuned = Config.SQLITE_PRAGMAS
+    print(f"{'profile':>9} {'reads/sec':>12} {'writes/sec':>13} {'locked errors':>14}")
+    _run("default", baseline, args)
+    _run("tuned", tuned, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Typeahead lookup latency on a synthetic snapshot.
+
+Builds a SuggestIndex from --jobs random postings (titles drawn from
+seniority x technology x role words, locations and companies with skewed
+frequencies), round-trips it through the .npz snapshot, then times lookups for
+random 1-8 character prefixes of indexed words, with an empty overlay and with
+a full one:
+
+    python scripts/bench_suggest.py --jobs 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from app.suggest import KINDS, PrefixIndex, SuggestIndex, _suffixes, normalize  # noqa: E402
+
+SENIORITY = ["", "Junior", "Senior", "Lead", "Staff", "Principal", "Head of"]
+ROLES = ["Developer", "Engineer", "Analyst", "Manager", "Designer", "Consultant", "Architect", "Scientist"]
+
+
+def _percentile(samples, pct):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * pct))]
+
+
+def _word(rng, length):
+    return "".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=length)).title()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=5000)
+    parser.add_argument("--overlay", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    technologies = [_word(rng, rng.randint(3, 9)) for _ in range(3000)]
+    cities = [f"{_word(rng, rng.randint(4, 10))}, {_word(rng, 2).upper()}" for _ in range(5000)]
+    companies = [f"{_word(rng, rng.randint(4, 10))} {rng.choice(['Inc', 'Labs', 'Group', 'Ltd'])}" for _ in range(20000)]
+    counts = {kind: Counter() for kind in KINDS}
+    for _ in range(args.jobs):
+        title = " ".join(filter(None, [
+            rng.choice(SENIORITY), technologies[int(rng.paretovariate(0.3)) % len(technologies)], rng.choice(ROLES),
+        ]))
+        counts["title"][title] += 1
+        counts["location"][cities[int(rng.paretovariate(0.3)) % len(cities)]] += 1
+        counts["company"][companies[int(rng.paretovariate(0.3)) % len(companies)]] += 1
+
+    started = time.perf_counter()
+    index = SuggestIndex({kind: PrefixIndex.from_counts(counts[kind].items()) for kind in KINDS}, time.time())
+    build_seconds = time.perf_counter() - started
+    path = os.path.join(tempfile.mkdtemp(prefix="bench-suggest-"), "suggest.npz")
+    index.save(path)
+    started = time.perf_counter()
+    index = SuggestIndex.load(path)
+    load_seconds = time.perf_counter() - started
+
+    words = [w for kind in KINDS for key in index.kinds[kind].entry_keys[::50] for w in key.split(" ")]
+    prefixes = [w[:rng.randint(1, min(8, len(w)))] for w in rng.choices(words, k=args.queries)]
+    changed = {normalize(title): [title, rng.choice([-1, 1, 5])] for title in rng.sample(list(counts["title"]), args.overlay)}
+    pairs = sorted((suffix, key) for key in changed for suffix in _suffixes(key))
+    overlay = {"title": (changed, [suffix for suffix, _ in pairs], [key for _, key in pairs])}
+
+    timings = {}
+    for label, extra in (("cold", None), ("warm", None), ("overlay", overlay)):
+        samples = timings[label] = []
+        for prefix in prefixes:
+            started = time.perf_counter()
+            index.suggest(normalize(prefix), KINDS, 8, extra)
+            samples.append((time.perf_counter() - started) * 1000)
+
+    entries = sum(len(index.kinds[kind].entry_keys) for kind in KINDS)
+    suffixes = sum(len(index.kinds[kind].keys) for kind in KINDS)
+    print(f"jobs        {args.jobs}: {entries} values, {suffixes} suffixes")
+    print(f"snapshot    {os.path.getsize(path) / 2**20:.1f} MiB, built in {build_seconds:.2f}s, loaded in {load_seconds:.2f}s")
+    for label, samples in timings.items():
+        print(f"{label:<11} p50 {statistics.median(samples):.3f} ms  p99 {_percentile(samples, 0.99):.3f} ms"
+              f"  max {max(samples):.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Run EXPLAIN QUERY PLAN over the queries the API routes issue and flag full scans.
+
+Uses the configured DATABASE_URL (run `flask db upgrade` first), or a
+throwaway database built from the models with --fresh. Exits with status 1
+if any query plan contains a full table scan.
+
+    python scripts/check_query_plans.py [--fresh]
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+
+def route_queries():
+    """(label, statement[, rowid_walk]) tuples mirroring what each route sends to the database."""
+    from sqlalchemy import delete, exists, select
+    from app.models import Application, ApplicationForm, Counter, Employer, Job, Profile, SavedJob, User
+    from app.search import match_subquery
+
+    matches = match_subquery("python developer")
+    page = 51
+    return [
+        ("principal lookup", select(User.id, User.role, Employer.id)
+            .outerjoin(Employer, Employer.user_id == User.id).where(User.id == 1)),
+        ("list_jobs (recent)", select(Job).order_by(Job.created_at, Job.id).limit(page)),
+        ("list_jobs (alpha)", select(Job).order_by(Job.title, Job.id).limit(page)),
+        ("list_jobs (employer)", select(Job).where(Job.employer_id == 1)
+            .order_by(Job.created_at, Job.id).limit(page)),
+        ("list_jobs (salary range)", select(Job).where(Job.salary >= 50000, Job.salary <= 90000)
+            .order_by(Job.salary, Job.id).limit(page)),
+        ("list_jobs (query)", select(Job, matches.c.rank).join(matches, matches.c.job_id == Job.id)
+            .order_by(matches.c.rank, Job.id).limit(page)),
+        ("get_job", select(Job).where(Job.id == 1)),
+        ("list_applications (user)", select(Application).where(Application.user_id == 1)
+            .order_by(Application.created_at, Application.id).limit(page)),
+        ("list_applications (employer)", select(Application).join(Job, Job.id == Application.job_id)
+            .where(Job.employer_id == 1).order_by(Application.created_at, Application.id).limit(page)),
+        ("list_applications (admin)", select(Application)
+            .order_by(Application.created_at, Application.id).limit(page)),
+        ("application ownership", select(exists().where(Job.id == 1, Job.employer_id == 1))),
+        ("application form", select(ApplicationForm).where(ApplicationForm.job_id == 1)),
+        ("list_employers (employer)", select(Employer).where(Employer.user_id == 1)
+            .order_by(Employer.created_at, Employer.id).limit(page)),
+        ("list_employers (admin)", select(Employer).order_by(Employer.created_at, Employer.id).limit(page)),
+        ("get_my_profile", select(Profile).where(Profile.user_id == 1)),
+        ("list_profiles", select(Profile).order_by(Profile.created_at, Profile.id).limit(page)),
+        ("list_saved_jobs", select(SavedJob).where(SavedJob.user_id == 1)
+            .order_by(SavedJob.created_at, SavedJob.id).limit(page)),
+        ("unsave_job", select(SavedJob).where(SavedJob.user_id == 1, SavedJob.job_id == 1)),
+        # Walks the rowid b-tree in order and stops after a page, which SQLite
+        # reports as a plain "SCAN users".
+        ("list_users", select(User).order_by(User.id).limit(page), True),
+        ("login", select(User).where(User.email == "someone@example.com")),
+        ("list_jobs (counts)", select(Counter.name, Counter.value)
+            .where(Counter.name == "job:1:applications")),
+        ("ingest upsert lookup", select(Job.id, Job.external_id, Job.content_hash)
+            .where(Job.source == "adzuna", Job.external_id == "a")),
+        ("ingest expiry", select(Job.id, Job.employer_id).where(
+            Job.source == "adzuna", Job.last_seen_at < "2026-01-01",
+            ~exists().where(Application.job_id == Job.id))),
+        # ON DELETE CASCADE fan-out when a user/employer/job row is deleted.
+        ("cascade jobs -> applications", delete(Application).where(Application.job_id == 1)),
+        ("cascade jobs -> saved_jobs", delete(SavedJob).where(SavedJob.job_id == 1)),
+        ("cascade jobs -> application_forms", delete(ApplicationForm).where(ApplicationForm.job_id == 1)),
+        ("cascade employers -> jobs", delete(Job).where(Job.employer_id == 1)),
+        ("cascade users -> employers", delete(Employer).where(Employer.user_id == 1)),
+        ("cascade users -> profiles", delete(Profile).where(Profile.user_id == 1)),
+        ("cascade users -> applications", delete(Application).where(Application.user_id == 1)),
+        ("cascade users -> saved_jobs", delete(SavedJob).where(SavedJob.user_id == 1)),
+    ]
+
+
+def is_full_scan(detail):
+    # SQLite reports "SCAN <table>" for a full pass and "SCAN <table> USING
+    # [COVERING] INDEX" for an index-ordered walk. Virtual tables (FTS) report
+    # "SCAN <table> VIRTUAL TABLE INDEX", which is the index itself.
+    if not detail.startswith("SCAN ") or detail == "SCAN CONSTANT ROW":
+        return False
+    return "USING" not in detail and "VIRTUAL TABLE" not in detail
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fresh", action="store_true", help="check a throwaway database built from the models")
+    args = parser.parse_args()
+
+    if args.fresh:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'plans.db')}"
+
+    from app import create_app
+    from app.extensions import db
+
+    app = create_app()
+    failures = 0
+    with app.app_context():
+        if db.engine.dialect.name != "sqlite":
+            print("EXPLAIN QUERY PLAN checks only run against SQLite.")
+            return 0
+        with db.engine.connect() as conn:
+            for label, statement, *rowid_walk in route_queries():
+                compiled = statement.compile(dialect=db.engine.dialect)
+                params = tuple(compiled.params[name] for name in compiled.positiontup)
+                rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).fetchall()
+                details = [row[3] for row in rows]
+                scans = [] if rowid_walk else [d for d in details if is_full_scan(d)]
+                status = "FULL SCAN" if scans else "ok"
+                failures += bool(scans)
+                print(f"[{status:>9}] {label}")
+                for detail in details:
+                    print(f"              {detail}")
+    print(f"\n{failures} quer{'y' if failures == 1 else 'ies'} with full table scans")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())